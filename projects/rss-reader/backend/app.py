@@ -1,16 +1,53 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, make_response, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
-import feedparser
+from datetime import datetime, timedelta, timezone
 import requests
 from apscheduler.schedulers.background import BackgroundScheduler
 import os
 from dotenv import load_dotenv
-import openai
-from bs4 import BeautifulSoup
 import gc
+import uuid
+import threading
+import multiprocessing
+from functools import wraps
+from sqlalchemy import event, select, update, or_, and_
+from sqlalchemy.orm import contains_eager, defer
+from sqlalchemy.exc import IntegrityError
 from config import Config
+from refresh_engine import RefreshEngine, FeedJob
+from feed_fetcher import conditional_fetch, fetch_counters
+from http_client import http_session
+from feed_onboarding import onboard_feed, DiscoveryCache, FeedNotFound
+from feed_search import FeedsearchDev, SearchCache, normalize_query, search_feeds
+from opml import OpmlError, parse_opml, check_concurrently, opml_document
+from ingest import normalize_feed, NormalizedFeed, RecentLinkCache, ENTRY_FIELDS, EXCERPT_CHARS
+from db_utils import chunked, insert_ignore_duplicates
+from feed_schedule import estimate_interval, backoff_interval, next_fetch_time, should_log_failure
+from feed_leases import claim_due_feeds, mark_all_due, WORKER_ID
+from reading_time import count_words, estimate_word_count, minutes_for_words, format_reading_time
+from content_store import (
+    PrefetchQueue, ContentUnavailable, fetch_article_text, compress_text, decompress_text,
+    evict_article_content, FETCHING, OK, FAILED
+)
+from counters import (
+    CounterDeltas, collect_article_deltas, apply_counter_deltas, recompute_counters, counter_rollups,
+    flag_change_deltas
+)
+from pagination import keyset_page, through_cursor, InvalidCursor
+from migrations import run_migrations
+from search import apply_search, search_page
+from events import format_event, event_id, parse_event_id, ChangeSignal, HoldSlots
+from response_encoding import json_provider_class, compress_response
+from response_cache import (
+    VersionCache, ResponseCache, statement_changes_data, object_changes_data, read_data_version, bump_data_version,
+    make_etag
+)
+from sync import (
+    next_change_seq, read_sync_bounds, has_synced_changes, batch_end
+)
+from summaries import summary_input, content_hash, request_summary, SingleFlight, RateLimiter
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
@@ -29,6 +66,13 @@ allowed_origins = [
 
 CORS(app, origins=allowed_origins, supports_credentials=True)
 
+# orjson when installed (JSON_ENCODER=auto); datetimes are written as ISO 8601 either way
+app.json = json_provider_class(Config.JSON_ENCODER)(app)
+
+@app.after_request
+def compress(response):
+    return compress_response(response, request.accept_encodings, Config.COMPRESS_MIN_BYTES, Config.COMPRESS_LEVEL)
+
 # Database configuration
 app.config['SQLALCHEMY_DATABASE_URI'] = Config.DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = Config.SQLALCHEMY_TRACK_MODIFICATIONS
@@ -44,6 +88,24 @@ class Feed(db.Model):
     last_fetched = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # HTTP validators and body hash of the last parsed fetch (conditional GET)
+    etag = db.Column(db.String(200))
+    last_modified = db.Column(db.String(100))
+    content_hash = db.Column(db.String(64))
+    
+    # Adaptive scheduling: learned polling interval and failure backoff
+    next_fetch_at = db.Column(db.DateTime)
+    fetch_interval_minutes = db.Column(db.Integer)
+    consecutive_failures = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.String(500))
+    
+    # Refresh lease so only one worker in the cluster refreshes a feed at a time
+    lease_owner = db.Column(db.String(100))
+    lease_expires_at = db.Column(db.DateTime)
+    
+    # Sequence number of the last change clients see (see sync.py)
+    change_seq = db.Column(db.BigInteger)
 
 class Article(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -51,28 +113,280 @@ class Article(db.Model):
     title = db.Column(db.String(500), nullable=False)
     link = db.Column(db.String(1000), nullable=False)
     description = db.Column(db.Text)
+    excerpt = db.Column(db.String(EXCERPT_CHARS))  # plain text preview for list views
     published_date = db.Column(db.DateTime)
     author = db.Column(db.String(200))
     is_read = db.Column(db.Boolean, default=False)
     is_bookmarked = db.Column(db.Boolean, default=False)  # New bookmark field
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Reading time, computed once in the background after ingestion (NULL until then)
+    word_count = db.Column(db.Integer)
+    reading_time_minutes = db.Column(db.Integer)
+    reading_time_estimated = db.Column(db.Boolean, default=False)
+    
+    # Sequence number of the last change clients see (see sync.py)
+    change_seq = db.Column(db.BigInteger)
+    
+    __table_args__ = (
+        db.UniqueConstraint('feed_id', 'link', name='uq_article_feed_link'),
+    )
+    
     # Relationship to Feed
     feed = db.relationship('Feed', backref=db.backref('articles', lazy=True))
 
-# Scheduler for background tasks
+class ArticleContent(db.Model):
+    """Compressed main text of an article page, fetched once and shared by summaries and reading times"""
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default=FETCHING)  # fetching, ok, failed
+    text_compressed = db.Column(db.LargeBinary)
+    size_bytes = db.Column(db.Integer, default=0)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class ArticleSummary(db.Model):
+    """AI summary of an article, keyed by a hash of the model input and the model"""
+    id = db.Column(db.Integer, primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    model = db.Column(db.String(50), nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('article_id', 'content_hash', 'model', name='uq_summary_article_hash_model'),
+    )
+
+class SummaryClaim(db.Model):
+    """Article a worker is summarizing in the background; other workers skip it until the claim expires"""
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), primary_key=True)
+    model = db.Column(db.String(50), primary_key=True)
+    claimed_by = db.Column(db.String(100), nullable=False)
+    claimed_at = db.Column(db.DateTime, nullable=False)
+
+class FeedCounter(db.Model):
+    """Denormalized article counts per feed, updated with every article write (see counters.py)"""
+    feed_id = db.Column(db.Integer, db.ForeignKey('feed.id', ondelete='CASCADE'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    unread = db.Column(db.Integer, nullable=False, default=0)
+    bookmarked = db.Column(db.Integer, nullable=False, default=0)
+
+@event.listens_for(db.session, 'after_flush')
+def update_feed_counters(session, flush_context):
+    """Keep feed counters in step with ORM article changes, inside the same transaction"""
+    apply_counter_deltas(session, FeedCounter.__table__, collect_article_deltas(session, Article))
+
+class DataVersion(db.Model):
+    """Single row bumped after every commit that changes feeds or articles (see response_cache.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
+
+@event.listens_for(db.session, 'after_flush')
+def note_orm_data_change(session, flush_context):
+    # Lease and schedule bookkeeping on feeds does not count (see VERSIONED_COLUMNS)
+    if (any(object_changes_data(obj, True) for obj in list(session.new) + list(session.deleted))
+            or any(object_changes_data(obj, False) for obj in session.dirty)):
+        session.info['data_changed'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def note_statement_data_change(orm_execute_state):
+    """Bulk INSERT/UPDATE/DELETE statements bypass the flush, so look at the statement itself"""
+    if statement_changes_data(orm_execute_state.statement, orm_execute_state.parameters):
+        orm_execute_state.session.info['data_changed'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def bump_version_after_commit(session):
+    # Bumped after the data is committed, so a response built in between is
+    # at worst cached under the old version, never the other way round
+    if session.info.pop('data_changed', False):
+        with db.engine.begin() as conn:
+            data_versions.set(database_key(), bump_data_version(conn))
+        change_signal.notify()
+
+@event.listens_for(db.session, 'after_rollback')
+def forget_data_change(session):
+    session.info.pop('data_changed', None)
+
+class SyncSequence(db.Model):
+    """Single row holding the last change sequence number handed out (see sync.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    seq = db.Column(db.BigInteger, nullable=False)
+    min_seq = db.Column(db.BigInteger, nullable=False, default=0)  # oldest `since` the tombstones cover
+
+class ArticleTombstone(db.Model):
+    """A deleted article, kept so sync clients can drop it too"""
+    id = db.Column(db.Integer, primary_key=True)
+    article_id = db.Column(db.Integer, nullable=False)
+    change_seq = db.Column(db.BigInteger, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def session_change_seq(session):
+    """The change sequence number of the session's transaction, taken on first use"""
+    if 'change_seq' not in session.info:
+        session.info['change_seq'] = next_change_seq(session.connection())
+    return session.info['change_seq']
+
+@event.listens_for(db.session, 'before_flush')
+def stamp_synced_changes(session, flush_context, instances):
+    """Stamp ORM changes to feeds and articles with the transaction's sequence number"""
+    changed = [obj for obj in session.new if has_synced_changes(obj, is_new=True)]
+    changed += [obj for obj in session.dirty if has_synced_changes(obj, is_new=False)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Article)]
+    if not changed and not deleted:
+        return
+    seq = session_change_seq(session)
+    for obj in changed:
+        obj.change_seq = seq
+    for article in deleted:
+        session.add(ArticleTombstone(article_id=article.id, change_seq=seq))
+
+@event.listens_for(db.session, 'after_transaction_end')
+def forget_change_seq(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('change_seq', None)
+
+class RefreshJob(db.Model):
+    """A manual refresh running in the background; polled by the frontend for progress"""
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    # 'refresh' while the job is queued or running, NULL afterwards. The unique index
+    # lets at most one job be active across all workers; later requests merge into it.
+    active_key = db.Column(db.String(20), unique=True, default='refresh')
+    worker_id = db.Column(db.String(100))
+    feeds_total = db.Column(db.Integer, default=0)
+    feeds_done = db.Column(db.Integer, default=0)
+    feeds_failed = db.Column(db.Integer, default=0)
+    new_articles = db.Column(db.Integer, default=0)
+    error = db.Column(db.String(500))
+    requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'feeds_total': self.feeds_total,
+            'feeds_done': self.feeds_done,
+            'feeds_failed': self.feeds_failed,
+            'new_articles': self.new_articles,
+            'error': self.error,
+            'requested_at': self.requested_at.isoformat() if self.requested_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class ImportJob(db.Model):
+    """A validated OPML import running in the background; polled by the frontend for its report"""
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    worker_id = db.Column(db.String(100))
+    feeds_total = db.Column(db.Integer, default=0)
+    feeds_checked = db.Column(db.Integer, default=0)
+    report = db.Column(db.JSON)  # One item per OPML entry once completed (see import_opml_feeds)
+    error = db.Column(db.String(500))
+    requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'feeds_total': self.feeds_total,
+            'feeds_checked': self.feeds_checked,
+            'error': self.error,
+            'requested_at': self.requested_at.isoformat() if self.requested_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if self.report is not None:
+            data.update(import_report_summary(self.report))
+        return data
+
+# Links recently stored per feed, used to skip dedup queries for hot feeds
+recent_links = RecentLinkCache(
+    max_feeds=Config.RECENT_LINKS_CACHE_FEEDS,
+    max_links_per_feed=Config.RECENT_LINKS_PER_FEED
+)
+
+# Newly ingested articles waiting for the background content prefetch
+prefetch_queue = PrefetchQueue()
+
+# Newly bookmarked articles waiting for the background summary pass
+summary_queue = PrefetchQueue()
+
+# Concurrent requests for the same summary share one completion call
+summary_flights = SingleFlight()
+summary_rate_limiter = RateLimiter(Config.SUMMARY_RATE_PER_MINUTE)
+
+# Feed URLs found at each domain's common paths while adding feeds
+discovery_cache = DiscoveryCache(Config.DISCOVERY_CACHE_SECONDS)
+
+# /api/feed-search answers, empty ones included
+feed_search_cache = SearchCache(Config.FEEDSEARCH_CACHE_SECONDS, Config.FEEDSEARCH_NEGATIVE_CACHE_SECONDS)
+feed_search_flights = SingleFlight()
+
+# Data version and built responses for the read endpoints
+data_versions = VersionCache(Config.DATA_VERSION_TTL_SECONDS)
+response_cache = ResponseCache(Config.RESPONSE_CACHE_ENTRIES)
+
+# Wakes /api/events requests waiting for the next change
+change_signal = ChangeSignal()
+event_hold_slots = HoldSlots(Config.EVENTS_MAX_HELD)
+
+def database_key():
+    return str(db.engine.url)
+
+def current_data_version():
+    def load():
+        with db.engine.begin() as conn:
+            return read_data_version(conn)
+    return data_versions.get(database_key(), load)
+
+def versioned_response(view):
+    """
+    ETag/304 handling and response caching for GET endpoints whose output only
+    depends on the data version and the query parameters.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = current_data_version()
+        params = tuple(sorted(request.args.items(multi=True)))
+        etag = make_etag(version, request.path, params)
+        
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            key = (database_key(), version, request.path, params)
+            cached = response_cache.get(key)
+            if cached is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response_cache.put(key, (response.get_data(), response.mimetype))
+            else:
+                body, mimetype = cached
+                response = app.response_class(body, mimetype=mimetype)
+        
+        response.set_etag(etag, weak=True)
+        # Clients must revalidate, which is cheap; the ETag does the rest
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+# Scheduler for background tasks. Feed parse workers (feed_parsing.py) import the
+# main module again when it is this file; only the app process itself runs jobs.
 scheduler = BackgroundScheduler()
-scheduler.start()
+if multiprocessing.current_process().name == 'MainProcess':
+    scheduler.start()
 
 def extract_feed_logo(parsed_feed, feed_url):
-    """Extract logo URL from RSS feed"""
-    logo_url = None
-    
+    """Logo URL of a normalized feed, falling back to the site's favicon"""
     # Try to get logo from feed metadata
-    if hasattr(parsed_feed.feed, 'image'):
-        logo_url = parsed_feed.feed.image.get('href')
-    elif hasattr(parsed_feed.feed, 'logo'):
-        logo_url = parsed_feed.feed.logo
+    logo_url = parsed_feed.logo_url
     
     # If no logo found, try to extract from the website's favicon
     if not logo_url:
@@ -86,6 +400,137 @@ def extract_feed_logo(parsed_feed, feed_url):
     
     return logo_url
 
+def download_feed(feed):
+    """Conditionally download and parse a feed (network only, no database access)"""
+    return conditional_fetch(
+        feed.url,
+        etag=feed.etag,
+        last_modified=feed.last_modified,
+        content_hash=feed.content_hash
+    )
+
+def store_feed_articles(feed, parsed_feed):
+    """
+    Store new entries of an already parsed feed (a NormalizedFeed, or a
+    feedparser result) with one dedup query and one bulk insert
+    """
+    if not isinstance(parsed_feed, NormalizedFeed):
+        parsed_feed = normalize_feed(parsed_feed)
+    for error in parsed_feed.errors:
+        print(f"Error processing {error} in feed {feed.name}")
+    
+    # Deduplicate links within the document itself
+    rows = {}
+    for entry in parsed_feed.entries:
+        row = dict(zip(ENTRY_FIELDS, entry), feed_id=feed.id)
+        rows.setdefault(row['link'], row)
+    
+    # Hot feeds: skip the existence query when every link is known to be stored
+    candidate_links = recent_links.unseen(feed.id, rows.keys())
+    
+    existing_links = set()
+    for links in chunked(candidate_links):
+        existing_links.update(
+            link for (link,) in db.session.query(Article.link).filter(
+                Article.feed_id == feed.id,
+                Article.link.in_(links)
+            )
+        )
+    
+    new_rows = [rows[link] for link in candidate_links if link not in existing_links]
+    if new_rows:
+        seq = session_change_seq(db.session)
+        for row in new_rows:
+            row['change_seq'] = seq
+    
+    # The unique (feed_id, link) index makes racing inserts from other workers harmless
+    inserted_ids = []
+    for batch in chunked(new_rows):
+        inserted_ids.extend(insert_ignore_duplicates(db.session, Article.__table__, batch, returning=Article.id))
+    new_articles_count = len(inserted_ids)
+    
+    # Bulk inserts bypass the ORM flush, so count them here (new articles are unread)
+    new_counts = CounterDeltas()
+    new_counts.add(feed.id, total=new_articles_count, unread=new_articles_count)
+    apply_counter_deltas(db.session, FeedCounter.__table__, new_counts)
+    
+    # Extract and store logo if not already set
+    if not feed.logo_url:
+        logo_url = extract_feed_logo(parsed_feed, feed.url)
+        if logo_url:
+            feed.logo_url = logo_url
+    
+    db.session.commit()
+    recent_links.remember(feed.id, rows.keys())
+    prefetch_queue.push(inserted_ids)
+    
+    if new_articles_count > 0:
+        print(f"📰 Added {new_articles_count} new articles from {feed.name}")
+    
+    return new_articles_count
+
+def apply_feed_download(feed, download):
+    """Store a conditional download. Unchanged feeds skip all per-entry work."""
+    new_articles_count = 0
+    if not download.skipped:
+        new_articles_count = store_feed_articles(feed, download.parsed_feed)
+    
+    # Only remember validators once the body has been stored successfully
+    feed.etag = download.etag
+    feed.last_modified = download.last_modified
+    feed.content_hash = download.content_hash
+    feed.last_fetched = datetime.utcnow()
+    schedule_next_fetch(feed, feed.last_fetched)
+    db.session.commit()
+    
+    return new_articles_count
+
+def schedule_next_fetch(feed, now):
+    """Learn the feed's publishing cadence from its recent articles and schedule the next poll"""
+    recent_dates = [
+        published_date for (published_date,) in db.session.query(Article.published_date).filter(
+            Article.feed_id == feed.id,
+            Article.published_date.isnot(None)
+        ).order_by(Article.published_date.desc()).limit(Config.FEED_SCHEDULE_HISTORY)
+    ]
+    
+    feed.fetch_interval_minutes = estimate_interval(
+        recent_dates, now,
+        default_minutes=Config.FEED_REFRESH_INTERVAL_MINUTES,
+        min_minutes=Config.FEED_MIN_INTERVAL_MINUTES,
+        max_minutes=Config.FEED_MAX_INTERVAL_MINUTES
+    )
+    feed.next_fetch_at = next_fetch_time(now, feed.fetch_interval_minutes)
+    feed.consecutive_failures = 0
+    feed.last_error = None
+    release_lease(feed)
+
+def release_lease(feed):
+    feed.lease_owner = None
+    feed.lease_expires_at = None
+
+def record_feed_failure(feed_id, error):
+    """Back off exponentially on a feed that keeps failing"""
+    feed = Feed.query.get(feed_id)
+    if not feed:
+        return
+    
+    now = datetime.utcnow()
+    feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+    feed.last_error = str(error)[:500]
+    backoff = backoff_interval(
+        feed.consecutive_failures,
+        base_minutes=feed.fetch_interval_minutes or Config.FEED_REFRESH_INTERVAL_MINUTES,
+        max_minutes=Config.FEED_MAX_BACKOFF_MINUTES
+    )
+    feed.next_fetch_at = next_fetch_time(now, backoff)
+    release_lease(feed)
+    db.session.commit()
+    
+    if should_log_failure(feed.consecutive_failures):
+        print(f"❌ Error refreshing feed {feed.name} ({feed.consecutive_failures} failures in a row, "
+              f"next try in {backoff} min): {error}")
+
 def fetch_feed_articles(feed_id):
     """Fetch articles from a specific feed with memory optimization"""
     feed = Feed.query.get(feed_id)
@@ -93,188 +538,125 @@ def fetch_feed_articles(feed_id):
         return
     
     try:
-        parsed_feed = feedparser.parse(feed.url)
-        new_articles_count = 0
-        
-        # Process entries in smaller batches to reduce memory usage
-        for i, entry in enumerate(parsed_feed.entries):
-            try:
-                # Check if article already exists
-                existing = Article.query.filter_by(
-                    feed_id=feed.id,
-                    link=entry.get('link', '')
-                ).first()
-                
-                if not existing:
-                    # Parse published date
-                    published_date = None
-                    if 'published_parsed' in entry:
-                        published_date = datetime(*entry.published_parsed[:6])
-                    elif 'updated_parsed' in entry:
-                        published_date = datetime(*entry.updated_parsed[:6])
-                    
-                    # Truncate article title if it's too long (database limit is 500 characters)
-                    title = entry.get('title', 'No Title')
-                    if len(title) > 500:
-                        title = title[:497] + "..."
-                    
-                    # Create new article
-                    article = Article(
-                        feed_id=feed.id,
-                        title=title,
-                        link=entry.get('link', ''),
-                        description=entry.get('summary', ''),
-                        published_date=published_date,
-                        author=entry.get('author', '')
-                    )
-                    db.session.add(article)
-                    new_articles_count += 1
-                
-                # Commit every N articles to prevent memory buildup
-                if new_articles_count > 0 and new_articles_count % Config.COMMIT_EVERY_N_ARTICLES == 0:
-                    db.session.commit()
-                    
-            except Exception as e:
-                print(f"Error processing entry {i} in feed {feed.name}: {str(e)}")
-                continue
-        
-        # Extract and store logo if not already set
-        if not feed.logo_url:
-            logo_url = extract_feed_logo(parsed_feed, feed.url)
-            if logo_url:
-                feed.logo_url = logo_url
-        
-        feed.last_fetched = datetime.utcnow()
-        db.session.commit()
-        
-        if new_articles_count > 0:
-            print(f"📰 Added {new_articles_count} new articles from {feed.name}")
-        
+        return apply_feed_download(feed, download_feed(feed))
     except Exception as e:
         print(f"Error fetching feed {feed.name}: {str(e)}")
         db.session.rollback()
+        record_feed_failure(feed_id, e)
 
-def refresh_all_feeds():
-    """Refresh all active feeds with memory optimization"""
+def write_refreshed_feed(job, download):
+    """Single-writer step of the refresh engine: runs on the thread that owns the session"""
+    try:
+        # Re-fetch the feed to ensure fresh session state
+        feed = Feed.query.get(job.feed_id)
+        if not feed or not feed.is_active:
+            if feed:
+                release_lease(feed)
+                db.session.commit()
+            return 0
+        return apply_feed_download(feed, download)
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Expire all objects to free memory without breaking concurrent sessions
+        db.session.expire_all()
+
+# Report of the most recent refresh cycle, exposed via /api/refresh-stats
+last_refresh_report = None
+
+def record_refresh_outcome(timing):
+    """Called by the refresh engine on the writer thread after each feed"""
+    if timing.error:
+        try:
+            record_feed_failure(timing.feed_id, timing.error)
+        except Exception as e:
+            print(f"⚠️ Could not record failure for feed {timing.name}: {e}")
+            db.session.rollback()
+
+def claimed_feed_jobs(due_before, on_feeds_claimed=None):
+    """Lease due feeds in small batches, coming back for more as the cycle progresses.
+    
+    Workers that finish their batch first claim the next one, so a cycle is
+    spread across every worker in the cluster and no feed is fetched twice.
+    on_feeds_claimed(count) is called for each batch this worker leases.
+    """
+    while True:
+        rows = claim_due_feeds(
+            db.session,
+            now=datetime.utcnow(),
+            due_before=due_before,
+            lease_seconds=Config.FEED_LEASE_SECONDS,
+            limit=Config.FEED_LEASE_BATCH_SIZE
+        )
+        if not rows:
+            return
+        if on_feeds_claimed:
+            on_feeds_claimed(len(rows))
+        for row in rows:
+            yield FeedJob(*row)
+
+def refresh_all_feeds(due_only=False, on_feed_done=None, on_feeds_claimed=None):
+    """Refresh active feeds concurrently with a single database writer.
+    
+    With due_only, only feeds whose next_fetch_at has passed are polled.
+    Otherwise every active feed is made due first. on_feed_done(timing) and
+    on_feeds_claimed(count) are called on the writer thread after each feed
+    and each leased batch, e.g. to report job progress.
+    """
+    global last_refresh_report
+    
     with app.app_context():
-        print(f"🔄 Starting scheduled feed refresh at {datetime.utcnow()}")
+        now = datetime.utcnow()
+        print(f"🔄 Starting {'scheduled' if due_only else 'full'} feed refresh at {now} on {WORKER_ID}")
         
-        # Get all feed IDs first to avoid session issues during iteration
-        # This prevents race conditions with concurrent API requests
-        feed_ids = [f.id for f in Feed.query.filter_by(is_active=True).all()]
-        feed_count = 0
+        if not due_only:
+            mark_all_due(db.session, now)
         
-        for feed_id in feed_ids:
-            try:
-                # Re-fetch the feed in each iteration to ensure fresh session state
-                feed = Feed.query.get(feed_id)
-                if not feed or not feed.is_active:
-                    continue
-                    
-                print(f"🔄 Refreshing feed: {feed.name}")
-                fetch_feed_articles(feed.id)
-                feed_count += 1
-                
-                # Commit after each feed to prevent memory buildup
-                db.session.commit()
-                
-                # Expire all objects to free memory without breaking concurrent sessions
-                db.session.expire_all()
-                
-            except Exception as e:
-                print(f"❌ Error refreshing feed {feed.name if feed else feed_id}: {str(e)}")
-                db.session.rollback()
-                continue
+        # Feed rows are snapshotted as they are claimed so fetch threads never touch the session
+        jobs = claimed_feed_jobs(due_before=now, on_feeds_claimed=on_feeds_claimed)
+        
+        engine = RefreshEngine(
+            fetch_func=download_feed,
+            write_func=write_refreshed_feed,
+            max_workers=Config.FEED_REFRESH_MAX_WORKERS
+        )
+        def feed_done(timing):
+            record_refresh_outcome(timing)
+            if on_feed_done:
+                on_feed_done(timing)
         
-        print(f"✅ Feed refresh completed at {datetime.utcnow()}. Processed {feed_count} feeds.")
+        report = engine.run(jobs, on_feed_done=feed_done)
+        last_refresh_report = report
+        
+        slowest = ', '.join(f"{t.name} ({t.fetch_seconds:.1f}s)" for t in report.slowest(3))
+        print(f"✅ Feed refresh completed at {datetime.utcnow()}. Processed {report.feeds_processed} feeds "
+              f"({report.feeds_failed} failed) in {report.wall_seconds:.1f}s "
+              f"with {report.max_workers} workers, {report.speedup:.1f}x vs serial. Slowest: {slowest or 'n/a'}")
         
         # Force garbage collection to free memory
         gc.collect()
+        
+        return report
 
 # Routes
 @app.route('/api/feeds', methods=['GET'])
+@versioned_response
 def get_feeds():
-    feeds = Feed.query.filter_by(is_active=True).all()
+    # Article counts come from the per-feed counters, not a COUNT per feed
+    rows = db.session.query(Feed, FeedCounter).outerjoin(
+        FeedCounter, FeedCounter.feed_id == Feed.id
+    ).filter(Feed.is_active == True).all()
     return jsonify([{
         'id': feed.id,
         'name': feed.name,
         'url': feed.url,
         'category': feed.category,
         'logo_url': feed.logo_url,
-        'last_fetched': feed.last_fetched.isoformat() if feed.last_fetched else None,
-        'article_count': Article.query.filter_by(feed_id=feed.id).count()
-    } for feed in feeds])
-
-def discover_feed_url(url):
-    """
-    Attempt to discover RSS/Atom feed URL from a webpage.
-    If the URL is already a valid feed, returns it unchanged.
-    If it's an HTML page, looks for <link rel="alternate"> tags pointing to feeds.
-    
-    Returns: (feed_url, discovered) tuple where discovered is True if URL was auto-discovered
-    """
-    try:
-        # First, try to parse as RSS directly
-        parsed = feedparser.parse(url)
-        if parsed.entries and len(parsed.entries) > 0:
-            # It's already a valid feed
-            return url, False
-        
-        # If no entries, it might be HTML - try to fetch and parse
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; r33der/1.0; +https://r33der.dev)'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        content_type = response.headers.get('Content-Type', '').lower()
-        
-        # Check if it's HTML
-        if 'text/html' in content_type or 'application/xhtml' in content_type:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for RSS/Atom feed links in <head>
-            feed_links = soup.find_all('link', rel='alternate')
-            
-            for link in feed_links:
-                link_type = link.get('type', '').lower()
-                href = link.get('href', '')
-                
-                if href and ('rss' in link_type or 'atom' in link_type or 'xml' in link_type):
-                    # Handle relative URLs
-                    if href.startswith('/'):
-                        from urllib.parse import urljoin
-                        href = urljoin(url, href)
-                    elif not href.startswith('http'):
-                        from urllib.parse import urljoin
-                        href = urljoin(url, href)
-                    
-                    print(f"🔍 Auto-discovered feed URL: {href}")
-                    return href, True
-            
-            # Common feed URL patterns to try as fallback
-            from urllib.parse import urljoin, urlparse
-            base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
-            common_paths = [
-                '/feed', '/feed.xml', '/rss', '/rss.xml', '/atom.xml',
-                '/feeds/posts/default', '/feed/atom'
-            ]
-            
-            for path in common_paths:
-                test_url = urljoin(base_url, path)
-                try:
-                    test_parsed = feedparser.parse(test_url)
-                    if test_parsed.entries and len(test_parsed.entries) > 0:
-                        print(f"🔍 Found feed at common path: {test_url}")
-                        return test_url, True
-                except:
-                    continue
-        
-        # Return original URL if no feed discovered
-        return url, False
-        
-    except Exception as e:
-        print(f"⚠️ Feed discovery error: {e}")
-        return url, False
-
+        'last_fetched': feed.last_fetched,
+        'article_count': counter.total if counter else 0,
+        'unread_count': counter.unread if counter else 0
+    } for feed, counter in rows])
 
 @app.route('/api/feeds', methods=['POST'])
 def add_feed():
@@ -291,40 +673,211 @@ def add_feed():
         name = name[:97] + "..."
         print(f"📝 Truncated feed name to: {name}")
     
-    # Try to auto-discover feed URL if the provided URL is an HTML page
-    discovered_url, was_discovered = discover_feed_url(url)
-    if was_discovered:
-        print(f"🔗 Using discovered feed URL: {discovered_url} (original: {url})")
-        url = discovered_url
-    
-    # Check if feed already exists
-    existing = Feed.query.filter_by(url=url).first()
-    if existing:
+    if Feed.query.filter_by(url=url).first():
         return jsonify({'error': 'Feed already exists'}), 400
     
-    # Validate RSS feed
+    # One download proves the URL is a feed and provides its first articles;
+    # HTML pages are searched for a feed (see feed_onboarding.py)
     try:
-        parsed = feedparser.parse(url)
-        if not parsed.entries:
-            return jsonify({'error': 'Invalid RSS feed or no entries found. Could not auto-discover feed URL.'}), 400
-    except:
-        return jsonify({'error': 'Could not parse RSS feed'}), 400
+        onboarded = onboard_feed(url, cache=discovery_cache, timeout=Config.DISCOVERY_TIMEOUT,
+                                 max_workers=Config.DISCOVERY_MAX_WORKERS)
+    except FeedNotFound:
+        return jsonify({'error': 'Invalid RSS feed or no entries found. Could not auto-discover feed URL.'}), 400
+    except Exception as e:
+        print(f"⚠️ Could not fetch {url}: {e}")
+        return jsonify({'error': 'Could not fetch RSS feed'}), 400
+    
+    if onboarded.discovered:
+        print(f"🔗 Using discovered feed URL: {onboarded.url} (original: {url})")
+        url = onboarded.url
+        if Feed.query.filter_by(url=url).first():
+            return jsonify({'error': 'Feed already exists'}), 400
     
     feed = Feed(name=name, url=url, category=category)
     db.session.add(feed)
     db.session.commit()
     
-    # Fetch initial articles
-    fetch_feed_articles(feed.id)
+    # Store the initial articles from the document we already have
+    try:
+        apply_feed_download(feed, onboarded.download)
+    except Exception as e:
+        print(f"Error storing articles of {feed.name}: {str(e)}")
+        db.session.rollback()
+        record_feed_failure(feed.id, e)
     
     return jsonify({
         'id': feed.id,
         'name': feed.name,
         'url': feed.url,
         'category': feed.category,
-        'last_fetched': feed.last_fetched.isoformat() if feed.last_fetched else None
+        'last_fetched': feed.last_fetched
     }), 201
 
+def check_opml_entry(entry):
+    """(feed URL, error) for one OPML entry; network only, no database access"""
+    try:
+        # Entries are already checked concurrently, so each one probes its candidates one at a time
+        onboarded = onboard_feed(entry.url, cache=discovery_cache, timeout=Config.DISCOVERY_TIMEOUT, max_workers=1)
+    except FeedNotFound:
+        return None, 'No feed found at this URL'
+    except Exception as e:
+        return None, f'Could not fetch: {e}'[:200]
+    return onboarded.url, None
+
+def import_opml_feeds(entries, validate=True, on_checked=None):
+    """
+    Subscribe to the feeds of an OPML document with one bulk insert (see opml.py).
+    Returns a report item per entry with a status of added, exists or failed.
+    on_checked(count) is called on this thread as validation progresses.
+    """
+    existing = {url for (url,) in db.session.query(Feed.url)}
+    report = []
+    to_check = []
+    for entry in entries:
+        if entry.url in existing:
+            report.append({'title': entry.title, 'url': entry.url, 'status': 'exists'})
+        else:
+            to_check.append(entry)
+    
+    if validate:
+        # Entries already subscribed count as checked
+        skipped = len(report)
+        results = check_concurrently(check_opml_entry, to_check, Config.OPML_IMPORT_MAX_WORKERS,
+                                     on_checked and (lambda count: on_checked(skipped + count)))
+    else:
+        results = [(entry.url, None) for entry in to_check]
+    
+    rows = {}
+    for entry, (feed_url, error) in zip(to_check, results):
+        item = {'title': entry.title, 'url': entry.url}
+        if error:
+            report.append(dict(item, status='failed', error=error))
+        elif len(feed_url) > Feed.url.type.length:
+            # One over-long URL would fail the whole bulk insert on PostgreSQL
+            report.append(dict(item, status='failed', error='URL too long'))
+        elif feed_url in existing or feed_url in rows:
+            report.append(dict(item, feed_url=feed_url, status='exists'))
+        else:
+            name = entry.title if len(entry.title) <= 100 else entry.title[:97] + "..."
+            rows[feed_url] = {
+                'name': name,
+                'url': feed_url,
+                'category': (entry.category or 'General')[:50],
+            }
+            report.append(dict(item, feed_url=feed_url, status='added'))
+    
+    # No validators and no next_fetch_at, so the next scheduled refresh fetches the new feeds in full
+    inserted = set()
+    if rows:
+        seq = session_change_seq(db.session)
+        for row in rows.values():
+            row['change_seq'] = seq
+        for batch in chunked(rows.values()):
+            inserted.update(insert_ignore_duplicates(db.session, Feed.__table__, batch, returning=Feed.url))
+        db.session.commit()
+    
+    # Feeds added by someone else in the meantime were skipped by the insert
+    for item in report:
+        if item['status'] == 'added' and item['feed_url'] not in inserted:
+            item['status'] = 'exists'
+    
+    print(f"📥 OPML import: {len(inserted)} feeds added, {len(report) - len(inserted)} skipped")
+    return report
+
+def import_report_summary(report):
+    return {
+        'added': sum(1 for item in report if item['status'] == 'added'),
+        'existing': sum(1 for item in report if item['status'] == 'exists'),
+        'failed': sum(1 for item in report if item['status'] == 'failed'),
+        'feeds': report
+    }
+
+def run_import_job(job_id, entries):
+    """Check and subscribe to the feeds of a queued import job, recording progress as entries are checked"""
+    with app.app_context():
+        job = ImportJob.query.get(job_id)
+        if not job or job.status != 'queued':
+            return
+        
+        job.status = 'running'
+        job.worker_id = WORKER_ID
+        job.started_at = job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        
+        progress = {'saved_at': 0.0}
+        
+        def on_checked(count):
+            # Throttle progress writes to one per second
+            now = datetime.utcnow()
+            if now.timestamp() - progress['saved_at'] < 1:
+                return
+            ImportJob.query.filter_by(id=job_id).update({'feeds_checked': count, 'heartbeat_at': now})
+            db.session.commit()
+            progress['saved_at'] = now.timestamp()
+        
+        try:
+            report = import_opml_feeds(entries, on_checked=on_checked)
+            values = {'status': 'completed', 'report': report, 'feeds_checked': job.feeds_total}
+        except Exception as e:
+            print(f"❌ Import job {job_id} failed: {e}")
+            db.session.rollback()
+            values = {'status': 'failed', 'error': str(e)[:500]}
+        ImportJob.query.filter_by(id=job_id).update(dict(values, finished_at=datetime.utcnow()))
+        db.session.commit()
+
+def start_import_job_thread(job_id, entries):
+    threading.Thread(target=run_import_job, args=(job_id, entries), name=f'import-job-{job_id[:8]}', daemon=True).start()
+
+@app.route('/api/feeds/import', methods=['POST'])
+def import_feeds():
+    """Subscribe to every feed of an uploaded OPML document.
+    
+    Checking the feeds can take minutes, so a validated import runs in the
+    background and returns a job to poll for the per-feed report. With
+    ?validate=false nothing is fetched and the report is returned at once.
+    """
+    upload = request.files.get('file')
+    data = upload.read() if upload else request.get_data()
+    if not data:
+        return jsonify({'error': 'Upload an OPML document'}), 400
+    
+    try:
+        entries = parse_opml(data)
+    except OpmlError as e:
+        return jsonify({'error': str(e)}), 400
+    if len(entries) > Config.OPML_IMPORT_MAX_FEEDS:
+        return jsonify({
+            'error': f'At most {Config.OPML_IMPORT_MAX_FEEDS} feeds per upload; use `python opml.py import` for more'
+        }), 400
+    
+    if request.args.get('validate', 'true').lower() == 'false':
+        return jsonify(import_report_summary(import_opml_feeds(entries, validate=False)))
+    
+    job = ImportJob(feeds_total=len(entries))
+    db.session.add(job)
+    db.session.commit()
+    start_import_job_thread(job.id, entries)
+    
+    data = job.to_dict()
+    data['status_url'] = f'/api/feeds/import/{job.id}'
+    return jsonify(data), 202
+
+@app.route('/api/feeds/import/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    job = ImportJob.query.get_or_404(job_id)
+    expire_stale_job(job)
+    return jsonify(job.to_dict())
+
+@app.route('/api/feeds/export', methods=['GET'])
+def export_feeds():
+    """Active feeds as an OPML download, streamed"""
+    rows = db.session.query(Feed.name, Feed.url, Feed.category).filter(
+        Feed.is_active == True
+    ).order_by(Feed.category, Feed.name).yield_per(200)
+    response = app.response_class(stream_with_context(opml_document(rows)), mimetype='text/x-opml')
+    response.headers['Content-Disposition'] = 'attachment; filename="subscriptions.opml"'
+    return response
+
 @app.route('/api/feeds/<int:feed_id>', methods=['DELETE'])
 def delete_feed(feed_id):
     feed = Feed.query.get_or_404(feed_id)
@@ -332,48 +885,258 @@ def delete_feed(feed_id):
     db.session.commit()
     return jsonify({'message': 'Feed deleted successfully'})
 
+def listed_article_total(category=None, feed_id=None, unread_only=False):
+    """Number of articles in a listing, summed from the per-feed counters"""
+    column = FeedCounter.unread if unread_only else FeedCounter.total
+    query = db.session.query(db.func.coalesce(db.func.sum(column), 0)).join(
+        Feed, Feed.id == FeedCounter.feed_id
+    ).filter(Feed.is_active == True)
+    if category:
+        query = query.filter(Feed.category == category)
+    if feed_id:
+        query = query.filter(Feed.id == feed_id)
+    return query.scalar()
+
+# Everything an article payload can contain. List endpoints return
+# LIST_FIELDS unless ?fields= asks for others; the raw feed HTML in
+# `description` is only sent when asked for, or by /api/articles/<id>.
+ARTICLE_FIELDS = {
+    'title': lambda article: article.title,
+    'link': lambda article: article.link,
+    'excerpt': lambda article: article.excerpt,
+    'description': lambda article: article.description,
+    'published_date': lambda article: article.published_date,
+    'author': lambda article: article.author,
+    'is_read': lambda article: article.is_read,
+    'is_bookmarked': lambda article: article.is_bookmarked,
+    'feed_id': lambda article: article.feed_id,
+    'feed_name': lambda article: article.feed.name,
+    'feed_category': lambda article: article.feed.category,
+    'feed_logo_url': lambda article: article.feed.logo_url,
+    'reading_time': lambda article: format_reading_time(
+        article.reading_time_minutes, article.reading_time_estimated
+    ) if article.reading_time_minutes else None,
+    'created_at': lambda article: article.created_at,
+}
+
+LIST_FIELDS = (
+    'title', 'link', 'excerpt', 'published_date', 'author', 'is_read', 'is_bookmarked',
+    'feed_name', 'feed_category', 'feed_logo_url', 'reading_time', 'created_at'
+)
+
+def requested_fields():
+    """Fields named in ?fields=a,b (id is always included), or LIST_FIELDS"""
+    value = request.args.get('fields')
+    if not value:
+        return LIST_FIELDS
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def article_list_query(fields):
+    """Articles joined to their feed in one query, without the description column unless requested"""
+    query = Article.query.join(Feed).options(contains_eager(Article.feed))
+    if 'description' not in fields:
+        query = query.options(defer(Article.description))
+    return query
+
+def filtered_article_query(fields, category=None, feed_id=None, unread_only=False, since_id=None):
+    """Articles of active feeds, narrowed by the /api/articles filters"""
+    query = article_list_query(fields).filter(Feed.is_active == True)
+    if since_id:
+        # Only articles stored after the given one (see /api/events)
+        query = query.filter(Article.id > since_id)
+    if category:
+        query = query.filter(Feed.category == category)
+    if unread_only:
+        query = query.filter(Article.is_read == False)
+    if feed_id:
+        query = query.filter(Article.feed_id == feed_id)
+    return query
+
+def article_payload(article, fields):
+    payload = {'id': article.id}
+    for name in fields:
+        payload[name] = ARTICLE_FIELDS[name](article)
+    return payload
+
 @app.route('/api/articles', methods=['GET'])
+@versioned_response
 def get_articles():
+    """Articles newest first. Follow next_cursor for further pages; `page` is kept for old clients."""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    cursor = request.args.get('cursor')
     category = request.args.get('category')
     unread_only = request.args.get('unread_only', 'false').lower() == 'true'
     feed_id = request.args.get('feed_id', type=int)
+    sort_column = Article.created_at if request.args.get('sort') == 'created' else Article.published_date
     
-    query = Article.query.join(Feed).filter(Feed.is_active == True)
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if category:
-        query = query.filter(Feed.category == category)
+    query = filtered_article_query(fields, category, feed_id, unread_only, request.args.get('since_id', type=int))
     
-    if unread_only:
-        query = query.filter(Article.is_read == False)
+    # Old clients send page numbers; deep pages then still cost an OFFSET
+    offset = (page - 1) * per_page if page > 1 and not cursor else 0
     
-    if feed_id:
-        query = query.filter(Article.feed_id == feed_id)
+    try:
+        articles, next_cursor = keyset_page(query, sort_column, Article.id, cursor, per_page, offset)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     
-    articles = query.order_by(Article.published_date.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    total = listed_article_total(category, feed_id, unread_only)
     
     return jsonify({
-        'articles': [{
-            'id': article.id,
-            'title': article.title,
-            'link': article.link,
-            'description': article.description,
-            'published_date': article.published_date.isoformat() if article.published_date else None,
-            'author': article.author,
-            'is_read': article.is_read,
-            'is_bookmarked': article.is_bookmarked,
-            'feed_name': article.feed.name,
-            'feed_category': article.feed.category,
-            'feed_logo_url': article.feed.logo_url
-        } for article in articles.items],
-        'total': articles.total,
-        'pages': articles.pages,
+        'articles': [article_payload(article, fields) for article in articles],
+        'next_cursor': next_cursor,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
         'current_page': page
     })
 
+@app.route('/api/articles/search', methods=['GET'])
+@versioned_response
+def search_articles():
+    """Full-text search over titles and descriptions, best match first. Takes the /api/articles filters."""
+    search_text = request.args.get('q', '').strip()
+    if not search_text:
+        return jsonify({'error': 'q is required'}), 400
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = filtered_article_query(
+        fields,
+        category=request.args.get('category'),
+        feed_id=request.args.get('feed_id', type=int),
+        unread_only=request.args.get('unread_only', 'false').lower() == 'true'
+    )
+    query, rank = apply_search(query, Article.id, db.engine.dialect.name, search_text)
+    
+    try:
+        articles, next_cursor = search_page(query, rank, Article.id, request.args.get('cursor'), per_page)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'articles': [article_payload(article, fields) for article in articles],
+        'next_cursor': next_cursor,
+        'query': search_text
+    })
+
+def new_articles_by_feed(since_id):
+    """({feed_id: count}, newest id) for articles stored after since_id"""
+    rows = db.session.query(Article.feed_id, db.func.count(Article.id), db.func.max(Article.id)).filter(
+        Article.id > since_id
+    ).group_by(Article.feed_id).all()
+    return {feed_id: count for feed_id, count, _ in rows}, max((row[2] for row in rows), default=since_id)
+
+@app.route('/api/events', methods=['GET'])
+def article_events():
+    """EventSource endpoint announcing new articles and counter changes (see events.py)"""
+    retry_ms = Config.EVENTS_RETRY_SECONDS * 1000
+    last_seen = parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    version = current_data_version()
+    
+    if last_seen is None:
+        # First connection: just tell the client where it stands
+        newest = db.session.query(db.func.max(Article.id)).scalar() or 0
+        body = format_event('ready', event_id=event_id(version, newest), retry_ms=retry_ms)
+    else:
+        seen_version, seen_article_id = last_seen
+        if version == seen_version and Config.EVENTS_HOLD_SECONDS > 0 and event_hold_slots.try_acquire():
+            try:
+                version = change_signal.wait_for_change(current_data_version, seen_version, Config.EVENTS_HOLD_SECONDS)
+            finally:
+                event_hold_slots.release()
+        
+        if version == seen_version:
+            body = f'retry: {retry_ms}\n\n'
+        else:
+            feeds, newest = new_articles_by_feed(seen_article_id)
+            body = ''
+            if feeds:
+                body += format_event('articles', {'count': sum(feeds.values()), 'feeds': feeds, 'max_id': newest})
+            body += format_event('counters', {'version': version}, event_id=event_id(version, newest), retry_ms=retry_ms)
+    
+    response = app.response_class(body, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# Article fields in /api/sync; clients already have the feeds, so no feed_* fields
+SYNC_ARTICLE_FIELDS = (
+    'feed_id', 'title', 'link', 'excerpt', 'published_date', 'author', 'is_read', 'is_bookmarked', 'created_at'
+)
+
+def feed_sync_payload(feed):
+    return {
+        'id': feed.id,
+        'name': feed.name,
+        'url': feed.url,
+        'category': feed.category,
+        'logo_url': feed.logo_url,
+        'is_active': feed.is_active
+    }
+
+@app.route('/api/sync', methods=['GET'])
+@versioned_response
+def sync_changes():
+    """
+    Feeds, articles and deleted article ids changed after `since`, oldest
+    change first (see sync.py). Send the returned `seq` as the next `since`;
+    while `has_more` is true there are further batches. `reset` means the
+    client's copy is too old to update and this batch starts from scratch.
+    """
+    since = request.args.get('since', 0, type=int)
+    limit = max(1, min(request.args.get('limit', Config.SYNC_BATCH_SIZE, type=int), Config.SYNC_BATCH_SIZE))
+    with db.engine.begin() as conn:
+        current, min_seq = read_sync_bounds(conn)
+    
+    reset = since > current or 0 < since < min_seq
+    if reset:
+        since = 0
+    
+    query = Article.query.options(defer(Article.description))
+    rows = query.filter(Article.change_seq > since, Article.change_seq <= current).order_by(
+        Article.change_seq, Article.id
+    ).limit(limit + 1).all()
+    end, keep = batch_end([article.change_seq for article in rows], limit, current)
+    if keep is None:
+        rows = query.filter(Article.change_seq == end).order_by(Article.id).all()
+    else:
+        rows = rows[:keep]
+    
+    feeds = Feed.query.filter(Feed.change_seq > since, Feed.change_seq <= end).order_by(Feed.id).all()
+    deleted = []
+    if since:
+        deleted = [article_id for (article_id,) in db.session.query(ArticleTombstone.article_id).filter(
+            ArticleTombstone.change_seq > since, ArticleTombstone.change_seq <= end
+        ).order_by(ArticleTombstone.change_seq, ArticleTombstone.id)]
+    
+    return jsonify({
+        'seq': end,
+        'has_more': end < current,
+        'reset': reset,
+        'feeds': [feed_sync_payload(feed) for feed in feeds],
+        'articles': [article_payload(article, SYNC_ARTICLE_FIELDS) for article in rows],
+        'deleted_articles': deleted
+    })
+
+@app.route('/api/articles/<int:article_id>', methods=['GET'])
+@versioned_response
+def get_article(article_id):
+    """One article with every field, including the full description"""
+    article = Article.query.get_or_404(article_id)
+    return jsonify(article_payload(article, ARTICLE_FIELDS))
+
 @app.route('/api/articles/<int:article_id>/read', methods=['PUT'])
 def mark_as_read(article_id):
     article = Article.query.get_or_404(article_id)
@@ -393,48 +1156,191 @@ def toggle_bookmark(article_id):
     article = Article.query.get_or_404(article_id)
     article.is_bookmarked = not article.is_bookmarked
     db.session.commit()
+    if article.is_bookmarked and Config.SUMMARY_PREFETCH != 'off':
+        summary_queue.push([article.id])
     return jsonify({
         'message': 'Article bookmarked' if article.is_bookmarked else 'Article unbookmarked',
         'is_bookmarked': article.is_bookmarked
     })
 
+# Bulk action -> (article flag, new value)
+BULK_ACTIONS = {
+    'read': ('is_read', True),
+    'unread': ('is_read', False),
+    'bookmark': ('is_bookmarked', True),
+    'unbookmark': ('is_bookmarked', False),
+}
+
+def bulk_article_conditions(data):
+    """
+    WHERE conditions for a bulk request: explicit `ids`, or the article list
+    filters (`feed_id`, `category`, `before`, `cursor`), or `all`.
+    Returns None when nothing selects any articles.
+    """
+    table = Article.__table__
+    if data.get('ids') is not None:
+        ids = [int(article_id) for article_id in data['ids']]
+        return [table.c.id.in_(ids)] if ids else None
+    
+    conditions = []
+    feeds = select(Feed.id).where(Feed.is_active == True)
+    if data.get('feed_id'):
+        feeds = feeds.where(Feed.id == int(data['feed_id']))
+    if data.get('category'):
+        feeds = feeds.where(Feed.category == data['category'])
+    conditions.append(table.c.feed_id.in_(feeds))
+    
+    if data.get('before'):
+        before = datetime.fromisoformat(data['before'])
+        if before.tzinfo:
+            # Dates are stored as naive UTC
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        conditions.append(or_(
+            table.c.published_date < before,
+            and_(table.c.published_date.is_(None), table.c.created_at < before)
+        ))
+    if data.get('cursor'):
+        # A next_cursor from /api/articles: everything on the pages up to it
+        sort_column = table.c.created_at if data.get('sort') == 'created' else table.c.published_date
+        conditions.append(through_cursor(sort_column, table.c.id, data['cursor']))
+    
+    if len(conditions) == 1 and not (data.get('feed_id') or data.get('category') or data.get('all')):
+        return None
+    return conditions
+
+def set_article_flag(conditions, flag, value):
+    """
+    Set a flag on every matching article with one UPDATE and adjust the feed
+    counters in the same transaction. Returns the (id, feed_id) rows that changed.
+    """
+    table = Article.__table__
+    column = table.c[flag]
+    # IS NOT also picks up rows where the flag was never set
+    conditions = conditions + [column.is_not(value)]
+    stmt = update(table).where(*conditions).values({flag: value, 'change_seq': session_change_seq(db.session)})
+    
+    if db.engine.dialect.update_returning:
+        changed = db.session.execute(stmt.returning(table.c.id, table.c.feed_id)).all()
+    else:
+        changed = db.session.execute(
+            select(table.c.id, table.c.feed_id).where(*conditions).with_for_update()
+        ).all()
+        db.session.execute(stmt)
+    
+    apply_counter_deltas(db.session, FeedCounter.__table__, flag_change_deltas(
+        [feed_id for _, feed_id in changed], flag, value
+    ))
+    db.session.commit()
+    return changed
+
+@app.route('/api/articles/bulk', methods=['POST'])
+def bulk_update_articles():
+    """Mark read/unread or (un)bookmark many articles at once. See bulk_article_conditions for the filters."""
+    data = request.get_json() or {}
+    if data.get('action') not in BULK_ACTIONS:
+        return jsonify({'error': f"action must be one of: {', '.join(BULK_ACTIONS)}"}), 400
+    
+    try:
+        conditions = bulk_article_conditions(data)
+    except (TypeError, ValueError) as e:
+        # InvalidCursor is a ValueError too
+        return jsonify({'error': f'Invalid filter: {e}'}), 400
+    if conditions is None:
+        return jsonify({'error': 'Give ids, feed_id, category, before, cursor or all'}), 400
+    
+    flag, value = BULK_ACTIONS[data['action']]
+    changed = set_article_flag(conditions, flag, value)
+    
+    if flag == 'is_bookmarked' and value and Config.SUMMARY_PREFETCH != 'off':
+        summary_queue.push([article_id for article_id, _ in changed])
+    
+    feeds = {}
+    for _, feed_id in changed:
+        feeds[feed_id] = feeds.get(feed_id, 0) + 1
+    
+    return jsonify({
+        'message': f"{len(changed)} articles updated",
+        'updated': len(changed),
+        'feeds': feeds
+    })
+
 @app.route('/api/articles/bookmarked', methods=['GET'])
 def get_bookmarked_articles():
+    """Bookmarked articles, most recently added first, paged by cursor like /api/articles"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    cursor = request.args.get('cursor')
     
-    query = Article.query.filter_by(is_bookmarked=True).order_by(Article.created_at.desc())
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Add feed information
-    articles = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Add feed information in the same query
+    query = article_list_query(fields).filter(Article.is_bookmarked == True)
     
-    # Get total count for pagination
-    total = query.count()
-    pages = (total + per_page - 1) // per_page
+    offset = (page - 1) * per_page if page > 1 and not cursor else 0
     
-    articles_data = []
-    for article in articles:
-        articles_data.append({
-            'id': article.id,
-            'title': article.title,
-            'link': article.link,
-            'description': article.description,
-            'published_date': article.published_date.isoformat() if article.published_date else None,
-            'author': article.author,
-            'is_read': article.is_read,
-            'is_bookmarked': article.is_bookmarked,
-            'feed_name': article.feed.name,
-            'feed_logo_url': article.feed.logo_url,
-            'created_at': article.created_at.isoformat()
-        })
+    try:
+        articles, next_cursor = keyset_page(query, Article.created_at, Article.id, cursor, per_page, offset)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Total count for pagination comes from the feed counters
+    total = db.session.query(db.func.coalesce(db.func.sum(FeedCounter.bookmarked), 0)).scalar()
+    pages = (total + per_page - 1) // per_page
     
     return jsonify({
-        'articles': articles_data,
+        'articles': [article_payload(article, fields) for article in articles],
+        'next_cursor': next_cursor,
         'pages': pages,
         'total': total,
         'current_page': page
     })
 
+def summary_source_text(article):
+    """Text sent to the model: the stored page text, or the description when the page is unavailable"""
+    try:
+        return summary_input(get_article_text(article))
+    except requests.RequestException:
+        # If we can't fetch the full article, use the description as fallback
+        return article.description[:500] if article.description else None  # Reduced from 1000 to 500
+
+def get_or_create_summary(article_id, title, text, api_key):
+    """Stored summary for this exact input and model, generating it once if missing.
+    
+    Returns (summary, cached).
+    """
+    model = Config.OPENAI_SUMMARY_MODEL
+    key = content_hash(title, text)
+    
+    def stored():
+        return db.session.query(ArticleSummary.summary).filter_by(
+            article_id=article_id, content_hash=key, model=model
+        ).scalar()
+    
+    summary = stored()
+    if summary is not None:
+        return summary, True
+    
+    def generate():
+        # Another request may have stored it while we were checking
+        existing = stored()
+        if existing is not None:
+            return existing
+        result = request_summary(title, text, api_key, model, api_base=Config.OPENAI_API_BASE)
+        insert_ignore_duplicates(db.session, ArticleSummary.__table__, [{
+            'article_id': article_id,
+            'content_hash': key,
+            'model': model,
+            'summary': result,
+            'created_at': datetime.utcnow()
+        }])
+        db.session.commit()
+        return result
+    
+    return summary_flights.do((article_id, key, model), generate), False
+
 @app.route('/api/articles/<int:article_id>/summarize', methods=['POST'])
 def summarize_article(article_id):
     article = Article.query.get_or_404(article_id)
@@ -445,53 +1351,10 @@ def summarize_article(article_id):
         return jsonify({'error': 'OpenAI API key not configured'}), 500
     
     try:
-        # Try to fetch the article content with headers to avoid blocking
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
         try:
-            # Reduced timeout for Railway and egress optimization
-            response = requests.get(article.link, timeout=3, headers=headers)  # Reduced from 5 to 3 seconds
-            response.raise_for_status()
-            
-            # Check content size to prevent memory issues and reduce egress
-            content_length = len(response.content)
-            if content_length > 512 * 1024:  # Reduced from 1MB to 512KB for egress optimization
-                raise Exception("Article content too large for processing")
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements to reduce memory usage
-            for script in soup(["script", "style", "nav", "header", "footer", "aside", "iframe", "embed"]):
-                script.decompose()
-            
-            # Extract text content with size limits
-            text = soup.get_text()
-            
-            # Clean up the text efficiently
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit text length to avoid token limits and memory issues, and reduce egress
-            if len(text) > 2000:  # Reduced from 3000 to 2000 for egress optimization
-                text = text[:2000] + "..."
-            
-            # Clear memory
-            del soup, response
-                
-        except requests.RequestException as e:
-            # If we can't fetch the full article, use the description as fallback
-            if article.description:
-                text = article.description[:500]  # Reduced from 1000 to 500 for egress optimization
-            else:
+            # Served from the content store; the page is only downloaded on a miss
+            text = summary_source_text(article)
+            if text is None:
                 return jsonify({
                     'error': f'Unable to fetch article content. The website may be blocking requests. You can try reading the article directly: {article.link}'
                 }), 500
@@ -503,36 +1366,12 @@ def summarize_article(article_id):
             else:
                 raise e
         
-        # Create the prompt for summarization
-        prompt = f"""
-        Please provide a brief, engaging summary of this article's introduction and main points. 
-        Focus on what the article is about without giving away all the details.
-        Keep it under 150 words and make it compelling enough to decide if it's worth reading.
-        
-        Article title: {article.title}
-        Article content: {text}
-        """
-        
-        # Get summary from OpenAI with reduced tokens for egress optimization
-        openai.api_key = openai_api_key
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates engaging, concise summaries of articles."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=100,  # Reduced from 150 to 100 for egress optimization
-            temperature=0.7
-        )
-        
-        summary = response.choices[0].message.content.strip()
-        
-        # Clear memory
-        del text, prompt, response
+        summary, cached = get_or_create_summary(article.id, article.title, text, openai_api_key)
         
         return jsonify({
             'summary': summary,
-            'article_title': article.title
+            'article_title': article.title,
+            'cached': cached
         })
         
     except Exception as e:
@@ -560,134 +1399,328 @@ def summarize_article(article_id):
         else:
             return jsonify({'error': f'Failed to generate summary: {error_msg}'}), 500
 
-@app.route('/api/articles/<int:article_id>/reading-time', methods=['GET'])
-def get_article_reading_time(article_id):
-    """Get accurate reading time by scraping article content with memory and egress optimization"""
-    article = Article.query.get_or_404(article_id)
+def articles_to_summarize(limit, exclude):
+    """Bookmarked (or recent unread) articles with prefetched text, no summary for the current model and no live claim"""
+    scope = Article.is_bookmarked == True
+    if Config.SUMMARY_PREFETCH == 'unread':
+        scope = db.or_(scope, db.and_(
+            Article.is_read == False,
+            Article.created_at >= datetime.utcnow() - timedelta(days=Config.CONTENT_PREFETCH_MAX_AGE_DAYS)
+        ))
+    return [article_id for (article_id,) in db.session.query(Article.id).join(
+        ArticleContent, db.and_(ArticleContent.article_id == Article.id, ArticleContent.status == OK)
+    ).outerjoin(
+        ArticleSummary, db.and_(
+            ArticleSummary.article_id == Article.id,
+            ArticleSummary.model == Config.OPENAI_SUMMARY_MODEL
+        )
+    ).filter(
+        ArticleSummary.id.is_(None),
+        scope,
+        ~Article.id.in_(exclude),
+        ~Article.id.in_(db.select(SummaryClaim.article_id).filter(
+            SummaryClaim.model == Config.OPENAI_SUMMARY_MODEL,
+            SummaryClaim.claimed_at >= summary_claim_cutoff(datetime.utcnow())
+        ))
+    ).order_by(Article.created_at.desc()).limit(limit)]
+
+def summary_claim_cutoff(now):
+    """Claims older than this were left by a worker that died mid-pass"""
+    return now - timedelta(seconds=Config.SUMMARY_CLAIM_SECONDS)
+
+def claim_summaries(article_ids, now):
+    """Insert claim rows so workers never pay for the same summary; only ids whose row we created are ours"""
+    model = Config.OPENAI_SUMMARY_MODEL
+    SummaryClaim.query.filter(SummaryClaim.claimed_at < summary_claim_cutoff(now)).delete(synchronize_session=False)
+    rows = [{'article_id': article_id, 'model': model, 'claimed_by': WORKER_ID, 'claimed_at': now}
+            for article_id in article_ids]
+    claimed = insert_ignore_duplicates(db.session, SummaryClaim.__table__, rows, returning=SummaryClaim.article_id)
+    db.session.commit()
+    return claimed
+
+def release_summary_claims(article_ids):
+    SummaryClaim.query.filter(
+        SummaryClaim.article_id.in_(article_ids),
+        SummaryClaim.model == Config.OPENAI_SUMMARY_MODEL,
+        SummaryClaim.claimed_by == WORKER_ID
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+def presummarize_articles():
+    """Background pass: summarize new bookmarked (or unread) articles ahead of time, rate limited"""
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if Config.SUMMARY_PREFETCH == 'off' or not openai_api_key:
+        return
     
-    # Check if we have a cached reading time in the database
-    # (You could add a reading_time field to the Article model for permanent caching)
+    with app.app_context():
+        batch_size = Config.SUMMARY_PREFETCH_BATCH_SIZE
+        article_ids = summary_queue.pop_batch(batch_size)
+        if len(article_ids) < batch_size:
+            article_ids += articles_to_summarize(batch_size - len(article_ids), article_ids)
+        # Every worker runs this pass; the queue and summary_flights are per process
+        article_ids = claim_summaries(article_ids, datetime.utcnow())
+        if not article_ids:
+            return
+        
+        generated = 0
+        try:
+            for article in Article.query.filter(Article.id.in_(article_ids)).all():
+                text = summary_source_text(article)
+                if text is None:
+                    continue
+                summary_rate_limiter.wait()
+                try:
+                    _, cached = get_or_create_summary(article.id, article.title, text, openai_api_key)
+                except Exception as e:
+                    # Quota or API errors: stop this pass instead of hammering the API
+                    db.session.rollback()
+                    print(f"⚠️ Background summaries paused: {e}")
+                    break
+                if not cached:
+                    generated += 1
+        finally:
+            release_summary_claims(article_ids)
+        
+        if generated:
+            print(f"🤖 Pre-summarized {generated} articles")
+
+def content_row(article_id, text_value, now):
+    """Content store row for a fetched page, or a failed marker when text_value is None"""
+    compressed = compress_text(text_value) if text_value is not None else None
+    return {
+        'article_id': article_id,
+        'status': OK if compressed is not None else FAILED,
+        'text_compressed': compressed,
+        'size_bytes': len(compressed) if compressed is not None else 0,
+        'fetched_at': now,
+        'last_accessed_at': now
+    }
+
+def claim_content_fetches(article_ids, now):
+    """Insert placeholder rows; only ids whose row we created are ours to fetch"""
+    rows = [{'article_id': article_id, 'status': FETCHING, 'fetched_at': now, 'last_accessed_at': now}
+            for article_id in article_ids]
+    return insert_ignore_duplicates(db.session, ArticleContent.__table__, rows, returning=ArticleContent.article_id)
+
+def save_article_texts(rows):
+    claim_content_fetches([row['article_id'] for row in rows], rows[0]['fetched_at'])
+    db.session.execute(db.update(ArticleContent), rows)
+
+def load_article_text(article_id):
+    """Main text from the content store, or None on a miss.
+    
+    Raises ContentUnavailable for pages that recently failed to fetch.
+    """
+    content = db.session.get(ArticleContent, article_id)
+    if content is None or content.status == FETCHING:
+        return None
+    
+    now = datetime.utcnow()
+    if content.status == FAILED:
+        if now - content.fetched_at < timedelta(hours=Config.CONTENT_RETRY_FAILED_HOURS):
+            raise ContentUnavailable('Article page could not be fetched')
+        return None
+    
+    # Only refresh the LRU timestamp occasionally so reads rarely write
+    if now - content.last_accessed_at > timedelta(minutes=Config.CONTENT_TOUCH_MINUTES):
+        content.last_accessed_at = now
+        db.session.commit()
+    return decompress_text(content.text_compressed)
+
+def get_article_text(article):
+    """Main text of an article page, downloading and parsing it only on a content store miss.
+    
+    Raises requests.RequestException when the page cannot be fetched.
+    """
+    text_value = load_article_text(article.id)
+    if text_value is not None:
+        return text_value
     
     try:
-        # Use the same headers as the summarize endpoint
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
         # Reduced timeout for Railway and egress optimization
-        response = requests.get(article.link, timeout=3, headers=headers)  # Reduced from 5 to 3 seconds
-        response.raise_for_status()
-        
-        # Check content size to prevent memory issues and reduce egress
-        content_length = len(response.content)
-        if content_length > 512 * 1024:  # Reduced from 1MB to 512KB for egress optimization
-            raise Exception("Article content too large for processing")
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements to reduce memory usage
-        for script in soup(["script", "style", "nav", "header", "footer", "aside", "iframe", "embed"]):
-            script.decompose()
-        
-        # Try to find the main article content with memory-efficient approach
-        content_selectors = [
-            'article',
-            '[class*="article"]',
-            '[class*="content"]',
-            '[class*="post"]',
-            '[class*="story"]',
-            'main',
-            '.entry-content',
-            '.post-content',
-            '.article-content',
-            '.story-content'
-        ]
-        
-        content_text = ""
-        
-        # Try each selector with size limits
-        for selector in content_selectors:
-            elements = soup.select(selector)
-            if elements:
-                # Get text from the largest element (likely the main content)
-                largest_element = max(elements, key=lambda x: len(x.get_text()))
-                content_text = largest_element.get_text()
-                
-                # Limit content size to prevent memory issues and reduce egress
-                if len(content_text) > 25000:  # Reduced from 50KB to 25KB for egress optimization
-                    content_text = content_text[:25000]
+        text_value = fetch_article_text(article.link, timeout=3)
+    except requests.RequestException:
+        save_article_texts([content_row(article.id, None, datetime.utcnow())])
+        db.session.commit()
+        raise
+    
+    save_article_texts([content_row(article.id, text_value, datetime.utcnow())])
+    db.session.commit()
+    return text_value
+
+def store_reading_time(article, word_count, estimated):
+    article.word_count = word_count
+    article.reading_time_minutes = minutes_for_words(word_count)
+    article.reading_time_estimated = estimated
+
+def reading_time_values(article_id, text_value, description, title):
+    """Reading time columns from an article's main text, estimated from the description when missing"""
+    if text_value is None:
+        word_count, estimated = estimate_word_count(description, title), True
+    else:
+        word_count, estimated = count_words(text_value), False
+    return {
+        'id': article_id,
+        'word_count': word_count,
+        'reading_time_minutes': minutes_for_words(word_count),
+        'reading_time_estimated': estimated
+    }
+
+def reading_time_payload(article):
+    """Serialized reading time of an article, or None if it has not been computed yet"""
+    if article.reading_time_minutes is None:
+        return None
+    return {
+        'reading_time': format_reading_time(article.reading_time_minutes, article.reading_time_estimated),
+        'word_count': article.word_count,
+        'minutes': article.reading_time_minutes,
+        'estimated': bool(article.reading_time_estimated)
+    }
+
+def articles_to_prefetch(limit, exclude, now):
+    """Recent unread articles that are not in the content store yet"""
+    return [article_id for (article_id,) in db.session.query(Article.id).outerjoin(
+        ArticleContent, ArticleContent.article_id == Article.id
+    ).filter(
+        ArticleContent.article_id.is_(None),
+        Article.is_read == False,
+        Article.created_at >= now - timedelta(days=Config.CONTENT_PREFETCH_MAX_AGE_DAYS),
+        ~Article.id.in_(exclude)
+    ).order_by(Article.created_at.desc()).limit(limit)]
+
+def prefetch_article_content():
+    """Background pass: fill the content store for new and unread articles and compute their reading times"""
+    with app.app_context():
+        batch_size = Config.CONTENT_PREFETCH_BATCH_SIZE
+        for _ in range(Config.CONTENT_PREFETCH_MAX_BATCHES):
+            now = datetime.utcnow()
+            article_ids = prefetch_queue.pop_batch(batch_size)
+            if len(article_ids) < batch_size:
+                article_ids += articles_to_prefetch(batch_size - len(article_ids), article_ids, now)
+            if not article_ids:
                 break
+            
+            claimed = claim_content_fetches(article_ids, now)
+            db.session.commit()
+            
+            # Queued articles already in the store only need their reading time filled in
+            stored = db.session.query(Article.id, ArticleContent.text_compressed).join(
+                ArticleContent, ArticleContent.article_id == Article.id
+            ).filter(
+                Article.id.in_(set(article_ids) - set(claimed)),
+                ArticleContent.status == OK,
+                Article.reading_time_minutes.is_(None)
+            ).all()
+            reading_times = [reading_time_values(article_id, decompress_text(compressed), None, None)
+                             for article_id, compressed in stored]
+            
+            rows = db.session.query(
+                Article.id, Article.link, Article.description, Article.title, Article.reading_time_minutes
+            ).filter(Article.id.in_(claimed)).all() if claimed else []
+            
+            def fetch(row):
+                try:
+                    return row, fetch_article_text(row.link, timeout=3)
+                except Exception:
+                    return row, None
+            
+            # Fetch pages concurrently; this thread alone writes the results
+            with ThreadPoolExecutor(max_workers=Config.CONTENT_PREFETCH_MAX_WORKERS) as executor:
+                results = list(executor.map(fetch, rows))
+            
+            fetched_at = datetime.utcnow()
+            if results:
+                db.session.execute(db.update(ArticleContent), [
+                    content_row(row.id, text_value, fetched_at) for row, text_value in results
+                ])
+            reading_times += [
+                reading_time_values(row.id, text_value, row.description, row.title)
+                for row, text_value in results if row.reading_time_minutes is None
+            ]
+            if reading_times:
+                db.session.execute(db.update(Article), reading_times)
+            db.session.commit()
+            
+            if results:
+                print(f"📥 Prefetched content for {len(results)} articles")
         
-        # If no specific content found, use body text with limits
-        if not content_text:
-            content_text = soup.get_text()
-            if len(content_text) > 25000:  # Reduced from 50KB to 25KB for egress optimization
-                content_text = content_text[:25000]
-        
-        # Clean the text efficiently
-        lines = (line.strip() for line in content_text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # Count words with limit
-        words = text.split()
-        word_count = min(len(words), 5000)  # Reduced from 10,000 to 5,000 for egress optimization
-        
-        # Calculate reading time (200 words per minute)
-        reading_speed = 200
-        minutes = max(1, round(word_count / reading_speed))
-        
-        # Format the result
-        if minutes < 60:
-            reading_time = f"{minutes} min read"
-        else:
-            hours = minutes // 60
-            remaining_minutes = minutes % 60
-            if remaining_minutes == 0:
-                reading_time = f"{hours}h read"
-            else:
-                reading_time = f"{hours}h {remaining_minutes}m read"
-        
-        # Clear memory
-        del soup, response, content_text, text, words
-        
-        return jsonify({
-            'reading_time': reading_time,
-            'word_count': word_count,
-            'minutes': minutes,
-            'url': article.link
-        })
-        
-    except requests.RequestException as e:
-        # Fallback to description-based estimation
-        fallback_words = len((article.description or article.title or "").split())
-        fallback_minutes = max(1, round(fallback_words * 2 / 200))  # Assume description is ~1/2 of article
-        
-        return jsonify({
-            'reading_time': f"{fallback_minutes} min read (estimated)",
-            'word_count': fallback_words,
-            'minutes': fallback_minutes,
-            'url': article.link,
-            'note': 'Using fallback estimation - could not fetch article content'
-        })
-    except Exception as e:
-        # Enhanced error handling for memory issues
-        error_msg = str(e)
-        if "memory" in error_msg.lower() or "out of memory" in error_msg.lower():
-            return jsonify({
-                'reading_time': '5 min read (estimated)',
-                'word_count': 1000,
-                'minutes': 5,
-                'url': article.link,
-                'note': 'Memory limit reached - using conservative estimate'
-            }), 200  # Return 200 instead of 500 to prevent frontend errors
-        
-        return jsonify({'error': f'Failed to calculate reading time: {error_msg}'}), 500
+        evicted = evict_article_content(
+            db.session,
+            datetime.utcnow(),
+            max_bytes=Config.CONTENT_STORE_MAX_MB * 1024 * 1024,
+            max_age_days=Config.CONTENT_STORE_MAX_AGE_DAYS
+        )
+        if evicted:
+            print(f"🧹 Evicted {evicted} entries from the article content store")
+
+@app.route('/api/articles/reading-times', methods=['GET'])
+def get_reading_times():
+    """Stored reading times for many articles in one call: ?ids=1,2,3
+    
+    Articles still waiting for the background pass get a description-based
+    estimate marked as pending and are queued for computation.
+    """
+    try:
+        article_ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'error': 'ids must be a comma separated list of integers'}), 400
+    
+    if len(article_ids) > Config.READING_TIME_BATCH_LIMIT:
+        return jsonify({'error': f'At most {Config.READING_TIME_BATCH_LIMIT} ids per request'}), 400
+    
+    articles = Article.query.filter(Article.id.in_(article_ids)).all() if article_ids else []
+    
+    reading_times = {}
+    pending = []
+    for article in articles:
+        payload = reading_time_payload(article)
+        if payload is None:
+            pending.append(article.id)
+            word_count = estimate_word_count(article.description, article.title)
+            payload = {
+                'reading_time': format_reading_time(minutes_for_words(word_count), estimated=True),
+                'word_count': word_count,
+                'minutes': minutes_for_words(word_count),
+                'estimated': True,
+                'pending': True
+            }
+        reading_times[str(article.id)] = payload
+    
+    prefetch_queue.push(pending)
+    
+    return jsonify({'reading_times': reading_times})
+
+@app.route('/api/articles/<int:article_id>/reading-time', methods=['GET'])
+def get_article_reading_time(article_id):
+    """Get accurate reading time, scraping the article page only if it was never computed"""
+    article = Article.query.get_or_404(article_id)
+    
+    if article.reading_time_minutes is None:
+        try:
+            try:
+                store_reading_time(article, count_words(get_article_text(article)), False)
+            except requests.RequestException:
+                store_reading_time(article, estimate_word_count(article.description, article.title), True)
+            db.session.commit()
+        except Exception as e:
+            # Enhanced error handling for memory issues
+            error_msg = str(e)
+            if "memory" in error_msg.lower() or "out of memory" in error_msg.lower():
+                return jsonify({
+                    'reading_time': '5 min read (estimated)',
+                    'word_count': 1000,
+                    'minutes': 5,
+                    'url': article.link,
+                    'note': 'Memory limit reached - using conservative estimate'
+                }), 200  # Return 200 instead of 500 to prevent frontend errors
+            
+            return jsonify({'error': f'Failed to calculate reading time: {error_msg}'}), 500
+    
+    data = reading_time_payload(article)
+    data['url'] = article.link
+    if article.reading_time_estimated:
+        data['note'] = 'Using fallback estimation - could not fetch article content'
+    return jsonify(data)
 
 # Health check endpoint - simple and fast for Railway health checks
 @app.route('/health', methods=['GET'])
@@ -698,93 +1731,211 @@ def health_check():
     })
 
 @app.route('/api/categories', methods=['GET'])
+@versioned_response
 def get_categories():
     categories = db.session.query(Feed.category).distinct().all()
     return jsonify([category[0] for category in categories])
 
 @app.route('/api/stats', methods=['GET'])
+@versioned_response
 def get_stats():
-    total_feeds = Feed.query.filter_by(is_active=True).count()
-    total_articles = Article.query.join(Feed).filter(Feed.is_active == True).count()
-    unread_articles = Article.query.join(Feed).filter(
-        Feed.is_active == True,
-        Article.is_read == False
-    ).count()
-    bookmarked_articles = Article.query.filter_by(is_bookmarked=True).count()
+    # Summed from the per-feed counters: one row per feed, however many articles there are
+    totals, categories = counter_rollups(db.session)
     
     return jsonify({
-        'total_feeds': total_feeds,
-        'total_articles': total_articles,
-        'unread_articles': unread_articles,
-        'read_articles': total_articles - unread_articles,
-        'bookmarked_articles': bookmarked_articles
+        'total_feeds': totals['feeds'],
+        'total_articles': totals['total'],
+        'unread_articles': totals['unread'],
+        'read_articles': totals['total'] - totals['unread'],
+        'bookmarked_articles': totals['bookmarked'],
+        'categories': categories
     })
 
+def repair_feed_counters():
+    """Background pass: recount every feed and fix counters that drifted"""
+    with app.app_context():
+        feed_ids = [feed_id for (feed_id,) in db.session.query(Feed.id)]
+        fixed = recompute_counters(db.session, FeedCounter.__table__, feed_ids)
+        if fixed:
+            print(f"🔧 Repaired article counters for {fixed} feeds")
+
+def run_feed_search(query, key):
+    feeds, complete = search_feeds(query, FeedsearchDev(Config.FEEDSEARCH_API_BASE), Config.FEEDSEARCH_TIMEOUT,
+                                   Config.FEEDSEARCH_MAX_WORKERS)
+    # An empty answer caused by a failed lookup is worth retrying
+    if feeds or complete:
+        feed_search_cache.put(key, feeds)
+    return feeds
+
 @app.route('/api/feed-search')
 def feed_search():
-    query = request.args.get('q')
+    """Feeds for a site name or URL, looked up concurrently and cached (see feed_search.py)"""
+    query = (request.args.get('q') or '').strip()
     if not query:
         return jsonify({'error': 'Missing query'}), 400
-
-    feeds = []
-    query = query.strip()
     
-    # Use feedsearch.dev API - the most reliable RSS discovery service
-    try:
-        # Build list of URLs to try
-        urls_to_try = []
+    key = normalize_query(query)
+    hit, feeds = feed_search_cache.get(key)
+    if not hit:
+        # Identical searches arriving together share one set of lookups
+        feeds = feed_search_flights.do(key, lambda: run_feed_search(query, key))
+    
+    return jsonify({'feeds': feeds})
+
+def run_refresh_job(job_id):
+    """Run a full refresh for a queued job, recording progress as feeds complete"""
+    with app.app_context():
+        job = RefreshJob.query.get(job_id)
+        if not job or job.status != 'queued':
+            return
         
-        if query.startswith('http'):
-            # Already a full URL
-            urls_to_try.append(query)
-        elif '.' in query:
-            # Has a domain extension (e.g., engadget.com)
-            urls_to_try.append(f"https://{query}")
-            urls_to_try.append(query)
-        else:
-            # Just a name (e.g., engadget) - try common extensions
-            urls_to_try.append(f"{query}.com")
-            urls_to_try.append(f"https://{query}.com")
-            urls_to_try.append(f"{query}.org")
-            urls_to_try.append(f"{query}.io")
+        job.status = 'running'
+        job.worker_id = WORKER_ID
+        job.started_at = job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
         
-        # Try each URL until we get results
-        for search_query in urls_to_try:
-            search_url = f"https://feedsearch.dev/api/v1/search?url={search_query}"
-            resp = requests.get(search_url, timeout=Config.FEEDSEARCH_TIMEOUT)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                if isinstance(data, list) and len(data) > 0:
-                    # Process feedsearch.dev results
-                    for feed in data:
-                        if feed.get('url'):  # Only include feeds with valid URLs
-                            feeds.append({
-                                'title': feed.get('title', 'Unknown Feed'),
-                                'url': feed['url'],
-                                'website': feed.get('site_url', ''),
-                                'description': feed.get('description', ''),
-                                'favicon': feed.get('favicon', '')
-                            })
-                    break  # Found results, stop trying
-                            
-    except Exception as e:
-        print(f"Feedsearch.dev error: {str(e)}")
+        # The total grows as feeds are leased; feeds leased by other workers are not ours to report
+        progress = {'total': 0, 'done': 0, 'failed': 0, 'new_articles': 0, 'saved_at': 0.0}
+        
+        def save_progress(force=False):
+            # Throttle progress writes to one per second
+            now = datetime.utcnow()
+            if not force and now.timestamp() - progress['saved_at'] < 1:
+                return
+            RefreshJob.query.filter_by(id=job_id).update({
+                'feeds_total': progress['total'],
+                'feeds_done': progress['done'],
+                'feeds_failed': progress['failed'],
+                'new_articles': progress['new_articles'],
+                'heartbeat_at': now
+            })
+            db.session.commit()
+            progress['saved_at'] = now.timestamp()
+        
+        def on_feed_done(timing):
+            progress['done'] += 1
+            progress['failed'] += 1 if timing.error else 0
+            progress['new_articles'] += timing.new_articles
+            save_progress()
+        
+        def on_feeds_claimed(count):
+            progress['total'] += count
+            save_progress()
+        
+        try:
+            refresh_all_feeds(on_feed_done=on_feed_done, on_feeds_claimed=on_feeds_claimed)
+            save_progress(force=True)
+            finish_refresh_job(job_id, 'completed')
+        except Exception as e:
+            print(f"❌ Refresh job {job_id} failed: {e}")
+            db.session.rollback()
+            finish_refresh_job(job_id, 'failed', error=str(e)[:500])
 
-    return jsonify({'feeds': feeds})
+def finish_refresh_job(job_id, status, error=None):
+    RefreshJob.query.filter_by(id=job_id).update({
+        'status': status,
+        'error': error,
+        'active_key': None,
+        'finished_at': datetime.utcnow()
+    })
+    db.session.commit()
+
+def expire_stale_job(job, **finished):
+    """Mark a queued or running RefreshJob or ImportJob failed once its worker stopped sending heartbeats.
+    
+    Daemon threads die with their worker process (e.g. when gunicorn recycles
+    it), leaving nothing to finish the job. Returns True if the job expired.
+    """
+    if job.status not in ('queued', 'running'):
+        return False
+    stale_before = datetime.utcnow() - timedelta(seconds=Config.REFRESH_JOB_STALE_SECONDS)
+    if job.heartbeat_at and job.heartbeat_at >= stale_before:
+        return False
+    model = type(job)
+    # Conditional, so a job its worker finishes (or heartbeats) meanwhile is left alone
+    expired = model.query.filter(
+        model.id == job.id,
+        model.status.in_(('queued', 'running')),
+        or_(model.heartbeat_at.is_(None), model.heartbeat_at < stale_before)
+    ).update(dict(finished, status='failed', error='Worker stopped responding', finished_at=datetime.utcnow()),
+             synchronize_session=False)
+    db.session.commit()
+    db.session.refresh(job)
+    return bool(expired)
+
+def start_refresh_job_thread(job_id):
+    threading.Thread(target=run_refresh_job, args=(job_id,), name=f'refresh-job-{job_id[:8]}', daemon=True).start()
+
+def enqueue_refresh_job():
+    """Return the active refresh job, creating one if none is queued or running.
+    
+    Returns (job, created). A job whose worker stopped sending heartbeats is
+    marked failed so it cannot block new refreshes forever.
+    """
+    active = RefreshJob.query.filter_by(active_key='refresh').first()
+    if active and not expire_stale_job(active, active_key=None) and active.active_key:
+        return active, False
+    
+    job = RefreshJob()
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker enqueued a job at the same moment: merge into it
+        db.session.rollback()
+        return RefreshJob.query.filter_by(active_key='refresh').first(), False
+    
+    return job, True
 
 @app.route('/api/refresh-feeds', methods=['POST'])
 def manual_refresh_feeds():
-    refresh_all_feeds()
-    return jsonify({'message': 'Feeds refreshed successfully'})
+    """Enqueue a background refresh and return its job id immediately"""
+    job, created = enqueue_refresh_job()
+    if created:
+        start_refresh_job_thread(job.id)
+    
+    data = job.to_dict()
+    data['merged'] = not created
+    data['status_url'] = f'/api/refresh-feeds/{job.id}'
+    return jsonify(data), 202
+
+@app.route('/api/refresh-feeds/<job_id>', methods=['GET'])
+def get_refresh_job(job_id):
+    job = RefreshJob.query.get_or_404(job_id)
+    expire_stale_job(job, active_key=None)
+    return jsonify(job.to_dict())
+
+@app.route('/api/refresh-stats', methods=['GET'])
+def get_refresh_stats():
+    """Wall time and per-feed timings of the most recent refresh cycle, and outbound HTTP stats per host"""
+    intervals = [
+        interval or Config.FEED_REFRESH_INTERVAL_MINUTES
+        for (interval,) in db.session.query(Feed.fetch_interval_minutes).filter_by(is_active=True)
+    ]
+    return jsonify({
+        'last_refresh': last_refresh_report.to_dict() if last_refresh_report else None,
+        'fetches': fetch_counters.to_dict(),
+        'hosts': http_session.host_stats(),
+        'scheduled_fetches_per_day': round(sum(24 * 60 / interval for interval in intervals), 1)
+    })
+
+# Check for due feeds every few minutes; each feed is only polled at its own learned interval
+scheduler.add_job(func=refresh_all_feeds, kwargs={'due_only': True}, trigger="interval", minutes=Config.FEED_SCHEDULER_TICK_MINUTES)
+
+# Recount feed counters daily in case anything drifted
+scheduler.add_job(func=repair_feed_counters, trigger="interval", hours=Config.COUNTER_REPAIR_INTERVAL_HOURS)
+
+# Summarize bookmarked (or unread) articles ahead of time when SUMMARY_PREFETCH is enabled
+scheduler.add_job(func=presummarize_articles, trigger="interval", minutes=Config.SUMMARY_PREFETCH_INTERVAL_MINUTES)
 
-# Schedule feed refresh using configuration (default 30 minutes for egress optimization)
-scheduler.add_job(func=refresh_all_feeds, trigger="interval", minutes=Config.FEED_REFRESH_INTERVAL_MINUTES)
+# Prefetch article text for new and unread articles (and compute their reading times) in the background
+scheduler.add_job(func=prefetch_article_content, trigger="interval", minutes=Config.CONTENT_PREFETCH_INTERVAL_MINUTES)
 
 if __name__ == '__main__':
     try:
         with app.app_context():
             db.create_all()
+            run_migrations(db.engine)
             print("✅ Database tables created successfully")
         
         port = int(os.environ.get('PORT', 5001))
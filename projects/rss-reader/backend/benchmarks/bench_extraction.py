@@ -0,0 +1,160 @@
+"""
+Benchmark main-content extraction: lxml scoring engine vs the old BeautifulSoup path.
+
+Usage (from backend/):
+    python benchmarks/bench_extraction.py --pages /path/to/saved/html
+    python benchmarks/bench_extraction.py --synthetic 200
+
+Save a corpus with e.g. `curl -sL -o pages/example.html https://...`. Each
+extractor runs in a fresh process so peak RSS (which includes lxml's C
+allocations) is measured independently.
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BS4_MAX_CONTENT_CHARS = 25000
+
+BS4_CONTENT_SELECTORS = [
+    'article',
+    '[class*="article"]',
+    '[class*="content"]',
+    '[class*="post"]',
+    '[class*="story"]',
+    'main',
+    '.entry-content',
+    '.post-content',
+    '.article-content',
+    '.story-content'
+]
+
+
+def extract_bs4(content):
+    """The previous selector-based extraction, kept here as the baseline"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup(["script", "style", "nav", "header", "footer", "aside", "iframe", "embed"]):
+        script.decompose()
+
+    content_text = ""
+    for selector in BS4_CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            largest_element = max(elements, key=lambda x: len(x.get_text()))
+            content_text = largest_element.get_text()[:BS4_MAX_CONTENT_CHARS]
+            break
+
+    if not content_text:
+        content_text = soup.get_text()[:BS4_MAX_CONTENT_CHARS]
+
+    lines = (line.strip() for line in content_text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+def extract_lxml(content):
+    from extraction import extract_main_text
+    return extract_main_text(content)
+
+
+EXTRACTORS = {'bs4': extract_bs4, 'lxml': extract_lxml}
+
+
+def synthetic_page(rng):
+    """A news-like page: navigation, nested layout divs, sidebars, an article and comments"""
+    words = ['feed', 'reader', 'article', 'content', 'server', 'python', 'market', 'update', 'city', 'report']
+
+    def sentence(n):
+        return ' '.join(rng.choice(words) for _ in range(n)) + ', ' + ' '.join(rng.choice(words) for _ in range(n)) + '.'
+
+    nav = ''.join(f'<li><a href="/s/{i}">Section {i}</a></li>' for i in range(rng.randint(20, 80)))
+    sidebar = ''.join(
+        f'<div class="card post-teaser"><a href="/t/{i}">{sentence(6)}</a><p>{sentence(10)}</p></div>'
+        for i in range(rng.randint(10, 60))
+    )
+    body = ''.join(f'<p>{sentence(rng.randint(15, 40))}</p>' for _ in range(rng.randint(15, 80)))
+    comments = ''.join(
+        f'<div class="comment-content"><p>{sentence(12)}</p></div>' for _ in range(rng.randint(0, 100))
+    )
+    wrappers = rng.randint(3, 12)
+    return (
+        f'<html><head><script>{"var x = 1;" * 200}</script><style>{".a{{}}" * 200}</style></head><body>'
+        f'<header><nav><ul>{nav}</ul></nav></header>'
+        + '<div class="content-wrapper">' * wrappers
+        + f'<aside class="sidebar">{sidebar}</aside>'
+        f'<div class="story-body article-content">{body}</div>'
+        f'<section class="comments">{comments}</section>'
+        + '</div>' * wrappers
+        + '<footer>Footer links</footer></body></html>'
+    ).encode('utf-8')
+
+
+def load_pages(args):
+    if args.pages:
+        paths = sorted(glob.glob(os.path.join(args.pages, '*.htm*')))
+        pages = []
+        for path in paths:
+            with open(path, 'rb') as handle:
+                pages.append(handle.read())
+        return pages
+    rng = random.Random(42)
+    return [synthetic_page(rng) for _ in range(args.synthetic)]
+
+
+def run_extractor(name, pages, repeat):
+    """Child process: time the extractor and report peak RSS growth"""
+    extract = EXTRACTORS[name]
+    extract(pages[0])  # import and warm up before measuring
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    words = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            words += len(extract(page).split())
+    elapsed = time.perf_counter() - started
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, peak_kb - baseline_kb, peak_kb, words // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', help='directory of saved .html pages')
+    parser.add_argument('--synthetic', type=int, default=100, help='generated pages when --pages is not given')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        sys.exit('No pages found')
+    total_mb = sum(len(page) for page in pages) / 1024 / 1024
+    print(f"📄 {len(pages)} pages, {total_mb:.1f} MB, {args.repeat} rounds")
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for name in EXTRACTORS:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_extractor, (name, pages, args.repeat))
+
+    print(f"{'engine':<8}{'pages/s':>10}{'MB/s':>8}{'peak RSS +MB':>14}{'peak RSS MB':>13}{'words':>10}")
+    for name, (elapsed, growth_kb, peak_kb, words) in results.items():
+        processed = len(pages) * args.repeat
+        print(f"{name:<8}{processed / elapsed:>10.1f}{total_mb * args.repeat / elapsed:>8.1f}"
+              f"{growth_kb / 1024:>14.1f}{peak_kb / 1024:>13.1f}{words:>10}")
+
+    speedup = results['bs4'][0] / results['lxml'][0]
+    print(f"⚡ lxml is {speedup:.1f}x the throughput of the BeautifulSoup path")
+
+
+if __name__ == '__main__':
+    main()
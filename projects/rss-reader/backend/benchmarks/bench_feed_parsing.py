@@ -0,0 +1,90 @@
+"""
+Benchmark feed parsing throughput as parse worker processes are added.
+
+Usage (from backend/):
+    python benchmarks/bench_feed_parsing.py
+    python benchmarks/bench_feed_parsing.py --feeds 400 --entries 50 --max-workers 8
+
+Parses the same synthetic feeds (HTML descriptions with markup to sanitize)
+on the calling threads (FEED_PARSE_WORKERS=0), then with 1, 2, 4, ... worker
+processes. Feeds are submitted from several threads, like the refresh
+engine's download threads. Worker start-up is excluded. Also shows how much
+data a worker sends back per feed.
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DESCRIPTION = (
+    '<div class="post"><p>Paragraph {i} with <a href="https://example.com/{i}">a link</a>, '
+    '<strong>bold</strong> and <em>emphasis</em>.</p><script>track({i})</script>'
+    '<img src="https://example.com/{i}.png" onerror="alert(1)"><ul><li>One</li><li>Two</li></ul>'
+    '<p style="color: red">' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 6 + '</p></div>'
+)
+
+
+def make_feed(n, entries):
+    items = ''.join(
+        f'<item><title>Feed {n} article {i}</title><link>https://example.com/{n}/{i}</link>'
+        f'<pubDate>Mon, 02 Oct 2023 {i % 24:02d}:00:00 GMT</pubDate><author>a@example.com (Author)</author>'
+        f'<description><![CDATA[{DESCRIPTION.format(i=i)}]]></description></item>'
+        for i in range(entries)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {n}</title>'
+            f'<link>https://example.com/{n}</link><description>Feed</description>{items}</channel></rss>').encode()
+
+
+def run(pool, feeds, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda body: pool.parse('https://example.com/rss', body, 'application/rss+xml'), feeds))
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=200)
+    parser.add_argument('--entries', type=int, default=30)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    from feed_parsing import ParsePool
+
+    feeds = [make_feed(n, args.entries) for n in range(args.feeds)]
+    counts = [0]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(max(1, counts[-1] * 2))
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    print(f"{args.feeds} feeds x {args.entries} entries, {os.cpu_count()} CPUs\n")
+    print(f"{'parse workers':<16}{'feeds / s':>12}{'entries / s':>14}{'speedup':>10}")
+
+    baseline = None
+    for workers in counts:
+        pool = ParsePool(workers)
+        threads = max(8, workers * 2)
+        if workers:
+            # Start every worker process before timing
+            run(pool, feeds[:workers * 2], threads)
+        elapsed, results = run(pool, feeds, threads)
+        pool.shutdown()
+
+        assert all(len(result.entries) == args.entries for result in results)
+        baseline = baseline or elapsed
+        label = 'inline' if workers == 0 else str(workers)
+        print(f"{label:<16}{args.feeds / elapsed:>12.1f}{args.feeds * args.entries / elapsed:>14.0f}"
+              f"{baseline / elapsed:>9.2f}x")
+
+    print(f"\nSent back per feed: {len(pickle.dumps(results[0])) / 1024:.1f} KB "
+          f"(raw document: {len(feeds[0]) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
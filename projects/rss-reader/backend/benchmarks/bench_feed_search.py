@@ -0,0 +1,94 @@
+"""
+Benchmark /api/feed-search lookups against a local stub of the feedsearch.dev API.
+
+Usage (from backend/):
+    python benchmarks/bench_feed_search.py
+    python benchmarks/bench_feed_search.py --latency 0.4 --queries 20
+
+The stub answers every lookup after --latency seconds and only knows feeds
+for the .io candidate, the worst case for a bare name. Times the old
+one-candidate-after-another loop, the concurrent lookups, and repeat
+searches answered from the cache.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.3
+
+    def do_GET(self):
+        url = parse_qs(urlparse(self.path).query)['url'][0]
+        time.sleep(StubHandler.latency)
+        feeds = [{'url': f'https://{url}/feed', 'title': url}] if url.endswith('.io') else []
+        payload = json.dumps(feeds).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def sequential_search(query, backend, timeout):
+    """The old loop: one candidate after another until one has feeds"""
+    from feed_search import candidate_urls
+
+    for url in candidate_urls(query):
+        feeds = backend.search(url, timeout)
+        if feeds:
+            return feeds
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds per stub lookup')
+    parser.add_argument('--queries', type=int, default=10)
+    args = parser.parse_args()
+
+    from feed_search import FeedsearchDev, SearchCache, normalize_query, search_feeds
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    backend = FeedsearchDev(f'http://127.0.0.1:{server.server_address[1]}/api/v1')
+    queries = [f'site{i}' for i in range(args.queries)]
+
+    print(f"{args.queries} bare-name searches, {args.latency * 1000:.0f}ms per upstream lookup\n")
+    print(f"{'mode':<28}{'ms / search':>12}")
+
+    started = time.perf_counter()
+    for query in queries:
+        assert sequential_search(query, backend, timeout=10)
+    print(f"{'sequential (old)':<28}{(time.perf_counter() - started) / len(queries) * 1000:>12.1f}")
+
+    cache = SearchCache(ttl=3600, negative_ttl=300)
+    started = time.perf_counter()
+    for query in queries:
+        feeds, _ = search_feeds(query, backend, timeout=10)
+        assert feeds
+        cache.put(normalize_query(query), feeds)
+    print(f"{'concurrent':<28}{(time.perf_counter() - started) / len(queries) * 1000:>12.1f}")
+
+    started = time.perf_counter()
+    for query in queries:
+        assert cache.get(normalize_query(query))[0]
+    print(f"{'repeat (cached)':<28}{(time.perf_counter() - started) / len(queries) * 1000:>12.3f}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
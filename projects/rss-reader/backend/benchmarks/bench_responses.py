@@ -0,0 +1,139 @@
+"""
+Benchmark article list responses: bytes on the wire and serialization time.
+
+Usage (from backend/):
+    python benchmarks/bench_responses.py
+    python benchmarks/bench_responses.py --articles 100 --repeat 200
+
+Builds a synthetic page shaped like /api/articles, then times the old
+payload (full description HTML, .isoformat() per field, stdlib json) against
+the current one (excerpt, datetimes left to the encoder) with each available
+JSON encoder, and reports the size after gzip and brotli at several levels.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = ('feed reader article python release security update performance database cloud '
+         'open source browser network server model design team product market').split()
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def description_html(rng):
+    paragraphs = ''.join(f'<p>{sentence(rng, 40)} <a href="https://example.com/{rng.randint(1, 9999)}">'
+                         f'{sentence(rng, 4)}</a></p>' for _ in range(rng.randint(3, 8)))
+    return f'<div class="entry"><img src="https://cdn.example.com/{rng.randint(1, 9999)}.jpg">{paragraphs}</div>'
+
+
+def build_articles(count, seed=1):
+    from ingest import make_excerpt
+
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, 8, 0)
+    articles = []
+    for i in range(count):
+        description = description_html(rng)
+        articles.append({
+            'id': 100000 + i,
+            'title': sentence(rng, 8),
+            'link': f'https://example.com/posts/{rng.randint(1, 10 ** 6)}',
+            'description': description,
+            'excerpt': make_excerpt(description),
+            'published_date': start - timedelta(minutes=17 * i),
+            'created_at': start - timedelta(minutes=17 * i, seconds=rng.randint(0, 59)),
+            'author': 'Jane Doe',
+            'is_read': rng.random() < 0.3,
+            'is_bookmarked': rng.random() < 0.05,
+            'feed_name': 'Example Feed',
+            'feed_category': 'Technology',
+            'feed_logo_url': 'https://example.com/favicon.ico',
+            'reading_time': f'{rng.randint(1, 15)} min read',
+        })
+    return articles
+
+
+def old_page(articles):
+    """The payload as the list endpoint used to build it"""
+    rows = []
+    for article in articles:
+        row = {key: value for key, value in article.items() if key != 'excerpt'}
+        row['published_date'] = article['published_date'].isoformat()
+        row['created_at'] = article['created_at'].isoformat()
+        rows.append(row)
+    return {'articles': rows, 'total': 5000, 'pages': 50, 'current_page': 1}
+
+
+def new_page(articles):
+    rows = [{key: value for key, value in article.items() if key != 'description'} for article in articles]
+    return {'articles': rows, 'next_cursor': 'WyIyMDI0LTA1LTAxVDA4OjAwOjAwIiwxMDAwOTld', 'total': 5000, 'pages': 50,
+            'current_page': 1}
+
+
+def time_per_call(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    from flask import Flask
+    from response_encoding import IsoJSONProvider, OrjsonProvider, orjson, brotli, compress_body
+
+    app = Flask('bench')
+    articles = build_articles(args.articles)
+    old = old_page(articles)
+    new = new_page(articles)
+
+    print(f"Page of {args.articles} articles, {args.repeat} repeats\n")
+    print(f"{'payload / encoder':<34}{'ms':>9}{'bytes':>11}")
+
+    stdlib_old = lambda: json.dumps(old, sort_keys=True, separators=(',', ':')).encode()
+    seconds, old_body = time_per_call(stdlib_old, args.repeat)
+    print(f"{'old (description, stdlib)':<34}{seconds * 1000:>9.2f}{len(old_body):>11,}")
+
+    encoders = [('stdlib', IsoJSONProvider(app))]
+    if orjson is not None:
+        encoders.append(('orjson', OrjsonProvider(app)))
+    else:
+        print("  (orjson not installed, skipping)")
+
+    new_body = None
+    for name, provider in encoders:
+        seconds, body = time_per_call(lambda: provider.dumps(new).encode(), args.repeat)
+        new_body = body
+        print(f"{f'new (excerpt, {name})':<34}{seconds * 1000:>9.2f}{len(body):>11,}")
+
+    print(f"\n{'compression':<34}{'ms':>9}{'old bytes':>11}{'new bytes':>11}")
+    encodings = [('gzip', level) for level in (1, 5, 9)]
+    if brotli is not None:
+        encodings += [('br', level) for level in (1, 5, 9)]
+    else:
+        print("  (brotli not installed, skipping)")
+    for encoding, level in encodings:
+        seconds, compressed = time_per_call(lambda: compress_body(new_body, encoding, level), args.repeat)
+        old_compressed = compress_body(old_body, encoding, level)
+        print(f"{f'{encoding} level {level}':<34}{seconds * 1000:>9.2f}{len(old_compressed):>11,}{len(compressed):>11,}")
+
+    # The timed bodies must round trip
+    assert gzip.decompress(compress_body(new_body, 'gzip', 5)) == new_body
+
+
+if __name__ == '__main__':
+    main()
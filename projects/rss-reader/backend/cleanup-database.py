@@ -10,6 +10,9 @@ from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from counters import uncount_articles
+from response_cache import bump_data_version
+from sync import next_change_seq, record_deleted_articles, prune_tombstones
 
 # Load environment variables
 load_dotenv()
@@ -32,14 +35,14 @@ def cleanup_old_articles(session, days_to_keep=30):
     # Count articles before deletion
     count_before = session.execute(text("SELECT COUNT(*) FROM article")).scalar()
     
-    # Delete old articles that are not bookmarked
-    result = session.execute(text("""
-        DELETE FROM article 
-        WHERE created_at < :cutoff_date 
-        AND is_bookmarked = false
-    """), {'cutoff_date': cutoff_date})
+    # Delete old articles that are not bookmarked, keeping the feed counters in step
+    where = "created_at < :cutoff_date AND is_bookmarked = false"
+    record_deleted_articles(session, where, {'cutoff_date': cutoff_date}, next_change_seq(session))
+    uncount_articles(session, where, {'cutoff_date': cutoff_date})
+    result = session.execute(text(f"DELETE FROM article WHERE {where}"), {'cutoff_date': cutoff_date})
     
     deleted_count = result.rowcount
+    bump_data_version(session)
     session.commit()
     
     # Count articles after deletion
@@ -57,15 +60,14 @@ def cleanup_read_articles(session, days_to_keep=7):
     # Count read articles before deletion
     count_before = session.execute(text("SELECT COUNT(*) FROM article WHERE is_read = true")).scalar()
     
-    # Delete old read articles that are not bookmarked
-    result = session.execute(text("""
-        DELETE FROM article 
-        WHERE is_read = true 
-        AND created_at < :cutoff_date 
-        AND is_bookmarked = false
-    """), {'cutoff_date': cutoff_date})
+    # Delete old read articles that are not bookmarked, keeping the feed counters in step
+    where = "is_read = true AND created_at < :cutoff_date AND is_bookmarked = false"
+    record_deleted_articles(session, where, {'cutoff_date': cutoff_date}, next_change_seq(session))
+    uncount_articles(session, where, {'cutoff_date': cutoff_date})
+    result = session.execute(text(f"DELETE FROM article WHERE {where}"), {'cutoff_date': cutoff_date})
     
     deleted_count = result.rowcount
+    bump_data_version(session)
     session.commit()
     
     # Count read articles after deletion
@@ -136,6 +138,12 @@ def main():
         # Clean old read articles (older than 7 days, not bookmarked)
         deleted_read = cleanup_read_articles(session, days_to_keep=7)
         
+        # Forget deleted articles that sync clients have had a month to pick up
+        pruned = prune_tombstones(session, keep_days=30)
+        bump_data_version(session)
+        session.commit()
+        print(f"🪦 Pruned {pruned} sync tombstones")
+        
         # Show final stats
         print("\n📊 Final Database Statistics:")
         final_stats = get_database_stats(session)
@@ -8,14 +8,101 @@ class Config:
     DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://localhost/rss_reader')
     
     # Feed refresh settings (30 minutes default for egress optimization)
+    # Used as the starting interval for feeds without enough history to learn from
     FEED_REFRESH_INTERVAL_MINUTES = int(os.getenv('FEED_REFRESH_INTERVAL_MINUTES', '30'))
     
+    # Adaptive per-feed scheduling
+    FEED_SCHEDULER_TICK_MINUTES = int(os.getenv('FEED_SCHEDULER_TICK_MINUTES', '5'))
+    FEED_MIN_INTERVAL_MINUTES = int(os.getenv('FEED_MIN_INTERVAL_MINUTES', '10'))
+    FEED_MAX_INTERVAL_MINUTES = int(os.getenv('FEED_MAX_INTERVAL_MINUTES', '720'))
+    FEED_MAX_BACKOFF_MINUTES = int(os.getenv('FEED_MAX_BACKOFF_MINUTES', '1440'))
+    FEED_SCHEDULE_HISTORY = int(os.getenv('FEED_SCHEDULE_HISTORY', '20'))
+    
+    # Cluster coordination: feeds are leased to one worker while being refreshed
+    FEED_LEASE_SECONDS = int(os.getenv('FEED_LEASE_SECONDS', '300'))
+    FEED_LEASE_BATCH_SIZE = int(os.getenv('FEED_LEASE_BATCH_SIZE', '8'))
+    
+    # Manual refresh and OPML import jobs without a heartbeat for this long are considered dead
+    REFRESH_JOB_STALE_SECONDS = int(os.getenv('REFRESH_JOB_STALE_SECONDS', '120'))
+    
+    # Adding feeds: candidate URLs of an HTML page are probed concurrently
+    DISCOVERY_TIMEOUT = int(os.getenv('DISCOVERY_TIMEOUT', '10'))
+    DISCOVERY_MAX_WORKERS = int(os.getenv('DISCOVERY_MAX_WORKERS', '8'))
+    DISCOVERY_CACHE_SECONDS = int(os.getenv('DISCOVERY_CACHE_SECONDS', '3600'))  # per-domain results
+    
+    # OPML import: feeds checked at once, and the most feeds accepted per upload
+    OPML_IMPORT_MAX_WORKERS = int(os.getenv('OPML_IMPORT_MAX_WORKERS', '16'))
+    OPML_IMPORT_MAX_FEEDS = int(os.getenv('OPML_IMPORT_MAX_FEEDS', '1000'))
+    
+    # Outbound HTTP (http_client.py): requests at once per host, how long to wait for a slot,
+    # the longest Retry-After waited out in place, and the longest cool-down honoured
+    HTTP_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', '4'))
+    HTTP_HOST_WAIT_SECONDS = int(os.getenv('HTTP_HOST_WAIT_SECONDS', '30'))
+    HTTP_RETRY_AFTER_MAX_WAIT = int(os.getenv('HTTP_RETRY_AFTER_MAX_WAIT', '5'))
+    HTTP_MAX_COOLDOWN_SECONDS = int(os.getenv('HTTP_MAX_COOLDOWN_SECONDS', '3600'))
+    
+    # Global limit on concurrent feed downloads during a refresh cycle
+    FEED_REFRESH_MAX_WORKERS = int(os.getenv('FEED_REFRESH_MAX_WORKERS', '8'))
+    FEED_FETCH_TIMEOUT = int(os.getenv('FEED_FETCH_TIMEOUT', '20'))
+    # Processes that parse and normalize downloaded feeds (0 parses on the downloading thread)
+    FEED_PARSE_WORKERS = int(os.getenv('FEED_PARSE_WORKERS', '0'))
+    
     # Memory optimization settings
     BATCH_SIZE_FOR_FEED_PROCESSING = int(os.getenv('BATCH_SIZE_FOR_FEED_PROCESSING', '10'))
-    COMMIT_EVERY_N_ARTICLES = int(os.getenv('COMMIT_EVERY_N_ARTICLES', '10'))
+    
+    # In-process LRU of recently stored links (skips dedup queries for hot feeds)
+    RECENT_LINKS_CACHE_FEEDS = int(os.getenv('RECENT_LINKS_CACHE_FEEDS', '500'))
+    RECENT_LINKS_PER_FEED = int(os.getenv('RECENT_LINKS_PER_FEED', '200'))
+    
+    # Full recount of the denormalized feed counters
+    COUNTER_REPAIR_INTERVAL_HOURS = int(os.getenv('COUNTER_REPAIR_INTERVAL_HOURS', '24'))
+    
+    # Article content store (extracted main text shared by summaries and reading times)
+    CONTENT_STORE_MAX_MB = int(os.getenv('CONTENT_STORE_MAX_MB', '200'))  # compressed size cap
+    CONTENT_STORE_MAX_AGE_DAYS = int(os.getenv('CONTENT_STORE_MAX_AGE_DAYS', '30'))
+    CONTENT_RETRY_FAILED_HOURS = int(os.getenv('CONTENT_RETRY_FAILED_HOURS', '24'))
+    CONTENT_TOUCH_MINUTES = int(os.getenv('CONTENT_TOUCH_MINUTES', '60'))  # LRU timestamp resolution
+    
+    # Background content prefetch (also computes reading times)
+    CONTENT_PREFETCH_INTERVAL_MINUTES = int(os.getenv('CONTENT_PREFETCH_INTERVAL_MINUTES', '1'))
+    CONTENT_PREFETCH_BATCH_SIZE = int(os.getenv('CONTENT_PREFETCH_BATCH_SIZE', '40'))
+    CONTENT_PREFETCH_MAX_BATCHES = int(os.getenv('CONTENT_PREFETCH_MAX_BATCHES', '5'))  # per run
+    CONTENT_PREFETCH_MAX_WORKERS = int(os.getenv('CONTENT_PREFETCH_MAX_WORKERS', '4'))
+    CONTENT_PREFETCH_MAX_AGE_DAYS = int(os.getenv('CONTENT_PREFETCH_MAX_AGE_DAYS', '3'))  # unread articles this recent
+    READING_TIME_BATCH_LIMIT = int(os.getenv('READING_TIME_BATCH_LIMIT', '100'))  # ids per batch request
+    
+    # AI summaries (OPENAI_API_BASE points the client at a compatible or stub endpoint)
+    OPENAI_API_BASE = os.getenv('OPENAI_API_BASE') or None
+    OPENAI_SUMMARY_MODEL = os.getenv('OPENAI_SUMMARY_MODEL', 'gpt-3.5-turbo')
+    SUMMARY_PREFETCH = os.getenv('SUMMARY_PREFETCH', 'off')  # off, bookmarked or unread
+    SUMMARY_PREFETCH_INTERVAL_MINUTES = int(os.getenv('SUMMARY_PREFETCH_INTERVAL_MINUTES', '5'))
+    SUMMARY_PREFETCH_BATCH_SIZE = int(os.getenv('SUMMARY_PREFETCH_BATCH_SIZE', '10'))
+    SUMMARY_RATE_PER_MINUTE = int(os.getenv('SUMMARY_RATE_PER_MINUTE', '20'))
+    SUMMARY_CLAIM_SECONDS = int(os.getenv('SUMMARY_CLAIM_SECONDS', '600'))  # after this another worker may take over
+    
+    # Read endpoint caching (ETag/304 and an in-process LRU of built responses)
+    DATA_VERSION_TTL_SECONDS = int(os.getenv('DATA_VERSION_TTL_SECONDS', '2'))  # how stale other workers may be
+    RESPONSE_CACHE_ENTRIES = int(os.getenv('RESPONSE_CACHE_ENTRIES', '256'))  # 0 disables the LRU
+    
+    # /api/events (server-sent events); see events.py for why requests are not held by default
+    EVENTS_RETRY_SECONDS = int(os.getenv('EVENTS_RETRY_SECONDS', '15'))  # how often clients reconnect
+    EVENTS_HOLD_SECONDS = int(os.getenv('EVENTS_HOLD_SECONDS', '0'))  # wait for a change before answering
+    EVENTS_MAX_HELD = int(os.getenv('EVENTS_MAX_HELD', '1'))  # requests per worker that may wait at once
+    
+    # /api/sync: most changed articles per batch (one transaction's changes are never split)
+    SYNC_BATCH_SIZE = int(os.getenv('SYNC_BATCH_SIZE', '500'))
+    
+    # Response encoding: JSON_ENCODER is auto (orjson when installed), orjson or stdlib
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))  # smaller bodies are sent as is
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '5'))  # gzip level / brotli quality
     
     # API settings
+    FEEDSEARCH_API_BASE = os.getenv('FEEDSEARCH_API_BASE', 'https://feedsearch.dev/api/v1')  # or a local stub
     FEEDSEARCH_TIMEOUT = int(os.getenv('FEEDSEARCH_TIMEOUT', '15'))
+    FEEDSEARCH_MAX_WORKERS = int(os.getenv('FEEDSEARCH_MAX_WORKERS', '4'))  # candidate lookups at once
+    FEEDSEARCH_CACHE_SECONDS = int(os.getenv('FEEDSEARCH_CACHE_SECONDS', '86400'))
+    FEEDSEARCH_NEGATIVE_CACHE_SECONDS = int(os.getenv('FEEDSEARCH_NEGATIVE_CACHE_SECONDS', '3600'))  # no feeds found
     
     # Flask settings
     SQLALCHEMY_TRACK_MODIFICATIONS = False
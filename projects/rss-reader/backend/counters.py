@@ -0,0 +1,190 @@
+"""
+Denormalized article counters for RSS Reader.
+
+Total, unread and bookmarked article counts are kept per feed in the
+feed_counter table and updated incrementally in the same transaction as the
+change that caused them, so /api/feeds and /api/stats never count the
+article table. Category and global rollups are summed from the per-feed
+rows (one row per feed, independent of the number of articles), which also
+means moving or deactivating a feed needs no counter writes at all.
+"""
+
+from collections import defaultdict
+from sqlalchemy import bindparam, inspect, select, text
+from db_utils import insert_ignore_duplicates
+
+COUNTER_FIELDS = ('total', 'unread', 'bookmarked')
+
+# Article flag -> (counter, change when the flag is set)
+FLAG_COUNTERS = {'is_read': ('unread', -1), 'is_bookmarked': ('bookmarked', 1)}
+
+_INCREMENT = text("""
+    UPDATE feed_counter
+    SET total = total + :total, unread = unread + :unread, bookmarked = bookmarked + :bookmarked
+    WHERE feed_id = :feed_id
+""")
+
+_ACTUAL = {
+    'total': "SELECT COUNT(*) FROM article a WHERE a.feed_id = feed_counter.feed_id",
+    'unread': "SELECT COUNT(*) FROM article a WHERE a.feed_id = feed_counter.feed_id AND a.is_read = :false",
+    'bookmarked': "SELECT COUNT(*) FROM article a WHERE a.feed_id = feed_counter.feed_id AND a.is_bookmarked = :true",
+}
+
+# Recounted inside the UPDATE itself, so no increment can land between reading and writing a counter
+_RECOUNT = text(f"""
+    UPDATE feed_counter
+    SET {', '.join(f'{field} = ({query})' for field, query in _ACTUAL.items())}
+    WHERE feed_id IN :feed_ids
+      AND ({' OR '.join(f'{field} <> ({query})' for field, query in _ACTUAL.items())})
+""").bindparams(bindparam('feed_ids', expanding=True))
+
+_ROLLUPS = text("""
+    SELECT f.category, f.is_active, COUNT(f.id),
+           COALESCE(SUM(c.total), 0), COALESCE(SUM(c.unread), 0), COALESCE(SUM(c.bookmarked), 0)
+    FROM feed f LEFT JOIN feed_counter c ON c.feed_id = f.id
+    GROUP BY f.category, f.is_active
+""")
+
+
+class CounterDeltas:
+    """Pending counter changes per feed: feed_id -> [total, unread, bookmarked]"""
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: [0, 0, 0])
+
+    def add(self, feed_id, total=0, unread=0, bookmarked=0):
+        delta = self._deltas[feed_id]
+        delta[0] += total
+        delta[1] += unread
+        delta[2] += bookmarked
+
+    def add_article(self, feed_id, is_read, is_bookmarked, sign=1):
+        """Count (sign=1) or uncount (sign=-1) one article"""
+        self.add(feed_id, total=sign, unread=0 if is_read else sign, bookmarked=sign if is_bookmarked else 0)
+
+    def rows(self):
+        return [
+            dict(zip(COUNTER_FIELDS, delta), feed_id=feed_id)
+            for feed_id, delta in self._deltas.items() if any(delta)
+        ]
+
+
+def _old_value(state, name):
+    """Value of an attribute before the pending flush"""
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return state.attrs[name].value
+
+
+def collect_article_deltas(session, article_cls):
+    """Counter changes implied by the Article objects in a flush (call from after_flush)"""
+    deltas = CounterDeltas()
+
+    for obj in session.new:
+        if isinstance(obj, article_cls):
+            deltas.add_article(obj.feed_id, obj.is_read, obj.is_bookmarked)
+
+    for obj in session.deleted:
+        if isinstance(obj, article_cls):
+            state = inspect(obj)
+            deltas.add_article(
+                _old_value(state, 'feed_id'), _old_value(state, 'is_read'), _old_value(state, 'is_bookmarked'), sign=-1
+            )
+
+    for obj in session.dirty:
+        if not isinstance(obj, article_cls):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in ('feed_id', 'is_read', 'is_bookmarked')):
+            continue
+        deltas.add_article(
+            _old_value(state, 'feed_id'), _old_value(state, 'is_read'), _old_value(state, 'is_bookmarked'), sign=-1
+        )
+        deltas.add_article(obj.feed_id, obj.is_read, obj.is_bookmarked)
+
+    return deltas
+
+
+def flag_change_deltas(feed_ids, flag, value):
+    """Counter changes for articles whose flag was just changed to value (one feed_id per article)"""
+    counter, change = FLAG_COUNTERS[flag]
+    deltas = CounterDeltas()
+    for feed_id in feed_ids:
+        deltas.add(feed_id, **{counter: change if value else -change})
+    return deltas
+
+
+def apply_counter_deltas(session, counter_table, deltas):
+    """Apply relative counter changes; concurrent writers cannot lose each other's updates"""
+    rows = deltas.rows()
+    if not rows:
+        return
+    insert_ignore_duplicates(session, counter_table, [
+        {'feed_id': row['feed_id'], 'total': 0, 'unread': 0, 'bookmarked': 0} for row in rows
+    ])
+    session.execute(_INCREMENT, rows)
+
+
+def uncount_articles(session, where, params):
+    """Subtract the articles matching `where` from their feed counters (call right before deleting them)"""
+    deltas = CounterDeltas()
+    for feed_id, total, unread, bookmarked in session.execute(text(f"""
+        SELECT feed_id,
+               COUNT(*),
+               SUM(CASE WHEN is_read = :false THEN 1 ELSE 0 END),
+               SUM(CASE WHEN is_bookmarked = :true THEN 1 ELSE 0 END)
+        FROM article
+        WHERE {where}
+        GROUP BY feed_id
+    """), dict(params, false=False, true=True)):
+        deltas.add(feed_id, total=-total, unread=-(unread or 0), bookmarked=-(bookmarked or 0))
+
+    # Feeds being cleaned up always have a counter row, so no insert is needed
+    rows = deltas.rows()
+    if rows:
+        session.execute(_INCREMENT, rows)
+
+
+def recompute_counters(session, counter_table, feed_ids):
+    """Repair job: recount every feed from the article table. Returns the number of feeds corrected."""
+    feed_ids = sorted(feed_ids)
+    if not feed_ids:
+        return 0
+    insert_ignore_duplicates(session, counter_table, [
+        {'feed_id': feed_id, 'total': 0, 'unread': 0, 'bookmarked': 0} for feed_id in feed_ids
+    ])
+    # Writers that insert articles now wait for these rows, and the recount below
+    # (a new snapshot under READ COMMITTED) sees every article committed before them
+    session.execute(
+        select(counter_table.c.feed_id).where(counter_table.c.feed_id.in_(feed_ids))
+        .order_by(counter_table.c.feed_id).with_for_update()
+    )
+    fixed = session.execute(_RECOUNT, {'feed_ids': feed_ids, 'false': False, 'true': True}).rowcount
+    session.commit()
+    return fixed
+
+
+def counter_rollups(session):
+    """Global and per-category counts summed from the per-feed counters.
+
+    Totals and unread counts cover active feeds; bookmarks are kept for
+    every feed, like the bookmarks view.
+    """
+    totals = {'feeds': 0, 'total': 0, 'unread': 0, 'bookmarked': 0}
+    categories = {}
+
+    for category, is_active, feeds, total, unread, bookmarked in session.execute(_ROLLUPS):
+        totals['bookmarked'] += bookmarked
+        if not is_active:
+            continue
+        totals['feeds'] += feeds
+        totals['total'] += total
+        totals['unread'] += unread
+        rollup = categories.setdefault(category, {'feeds': 0, 'total': 0, 'unread': 0, 'bookmarked': 0})
+        rollup['feeds'] += feeds
+        rollup['total'] += total
+        rollup['unread'] += unread
+        rollup['bookmarked'] += bookmarked
+
+    return totals, categories
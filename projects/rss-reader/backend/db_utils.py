@@ -0,0 +1,48 @@
+"""
+Dialect helpers for RSS Reader.
+
+PostgreSQL runs in production and SQLite in tests, so statements that need
+dialect-specific syntax (ON CONFLICT, RETURNING, ...) are built here.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Keep IN (...) lists and multi-row inserts well below SQLite's variable limit
+CHUNK_SIZE = 500
+
+
+def dialect_name(session):
+    return session.get_bind().dialect.name
+
+
+def chunked(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def insert_ignore_duplicates(session, table, rows, returning=None):
+    """
+    Bulk insert rows, silently skipping rows that violate a unique constraint.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and SQLite
+    (the equivalent of INSERT OR IGNORE). Returns the values of the
+    `returning` column for inserted rows, or None if no column was given.
+    """
+    if not rows:
+        return [] if returning is not None else None
+
+    name = dialect_name(session)
+    if name == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing()
+    elif name == 'sqlite':
+        stmt = sqlite.insert(table).on_conflict_do_nothing()
+    else:
+        stmt = insert(table)
+
+    if returning is None:
+        session.execute(stmt, rows)
+        return None
+
+    return [row[0] for row in session.execute(stmt.returning(returning), rows)]
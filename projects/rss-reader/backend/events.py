@@ -0,0 +1,91 @@
+"""
+Server-sent events for newly ingested articles.
+
+/api/events speaks the EventSource protocol, but answers each connection
+right away and closes it. The `retry:` field tells the browser when to
+reconnect, and it sends back the last event id, which carries the data
+version and the newest article id the client has seen. So a connected
+client costs one short request every EVENTS_RETRY_SECONDS, not a gunicorn
+thread for as long as the tab is open.
+
+Deployments with threads to spare (or an async worker) can set
+EVENTS_HOLD_SECONDS so a request waits for the next change before it
+answers. At most EVENTS_MAX_HELD requests per worker wait at once; any
+others are answered immediately, so held streams can never take every
+thread.
+
+Events are computed from the database rather than an in-process buffer,
+so articles stored by any worker are reported:
+    articles  {"count": 3, "feeds": {"12": 3}, "max_id": 4711}
+    counters  {"version": 1718000000123}
+"""
+
+import json
+import threading
+import time
+
+
+def format_event(event, data=None, event_id=None, retry_ms=None):
+    """One SSE message"""
+    lines = []
+    if retry_ms is not None:
+        lines.append(f'retry: {retry_ms}')
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f"data: {json.dumps(data if data is not None else {}, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_id(version, max_article_id):
+    return f'{version}-{max_article_id}'
+
+
+def parse_event_id(value):
+    """(version, max_article_id) from a Last-Event-ID, or None if missing or malformed"""
+    try:
+        version, max_article_id = value.split('-')
+        return int(version), int(max_article_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+class ChangeSignal:
+    """Wakes waiting event requests when this worker commits a data change"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._generation = 0
+
+    def notify(self):
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def wait_for_change(self, current_version, since_version, timeout, poll_seconds=1.0, clock=time.monotonic):
+        """
+        Wait until current_version() differs from since_version or timeout passes.
+        Local commits wake the wait at once; other workers' changes are seen by polling.
+        """
+        deadline = clock() + timeout
+        while True:
+            version = current_version()
+            remaining = deadline - clock()
+            if version != since_version or remaining <= 0:
+                return version
+            with self._condition:
+                generation = self._generation
+                self._condition.wait_for(lambda: self._generation != generation, min(poll_seconds, remaining))
+
+
+class HoldSlots:
+    """Bounded number of requests allowed to wait for changes at the same time"""
+
+    def __init__(self, limit):
+        self._semaphore = threading.BoundedSemaphore(limit) if limit > 0 else None
+
+    def try_acquire(self):
+        return self._semaphore is not None and self._semaphore.acquire(blocking=False)
+
+    def release(self):
+        self._semaphore.release()
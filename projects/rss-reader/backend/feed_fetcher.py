@@ -0,0 +1,113 @@
+"""
+Conditional feed downloads for RSS Reader.
+
+Feeds are fetched with If-None-Match / If-Modified-Since using the validators
+stored on the Feed. A 304, or a body whose hash matches the last parsed body,
+short-circuits before feedparser and before any per-entry database work.
+Changed bodies are parsed and normalized by feed_parsing.feed_parser.
+"""
+
+import hashlib
+import threading
+from config import Config
+from feed_parsing import feed_parser
+from http_client import http_session
+
+# User-Agent, compression and keep-alive come from the shared session
+FEED_REQUEST_HEADERS = {
+    'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.8',
+}
+
+MAX_FEED_BYTES = 10 * 1024 * 1024  # Larger documents are dropped while downloading
+
+# Download outcomes
+PARSED = 'parsed'
+NOT_MODIFIED = 'not_modified'
+UNCHANGED = 'unchanged'
+
+
+class FetchCounters:
+    """Thread-safe counters of skipped vs parsed feed fetches since process start"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.parsed = 0
+            self.not_modified = 0
+            self.unchanged = 0
+            self.errors = 0
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def to_dict(self):
+        with self._lock:
+            skipped = self.not_modified + self.unchanged
+            return {
+                'parsed': self.parsed,
+                'skipped': skipped,
+                'not_modified': self.not_modified,
+                'unchanged': self.unchanged,
+                'errors': self.errors
+            }
+
+
+fetch_counters = FetchCounters()
+
+
+class FeedDownload:
+    """Result of a conditional feed download; parsed_feed is an ingest.NormalizedFeed"""
+
+    __slots__ = ('status', 'parsed_feed', 'etag', 'last_modified', 'content_hash')
+
+    def __init__(self, status, parsed_feed=None, etag=None, last_modified=None, content_hash=None):
+        self.status = status
+        self.parsed_feed = parsed_feed
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+
+    @property
+    def skipped(self):
+        return self.status != PARSED
+
+
+def conditional_fetch(url, etag=None, last_modified=None, content_hash=None, timeout=None):
+    """Download a feed, skipping parsing when the server or the body hash says nothing changed"""
+    headers = dict(FEED_REQUEST_HEADERS)
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = http_session.get(url, headers=headers, timeout=timeout or Config.FEED_FETCH_TIMEOUT,
+                                    max_bytes=MAX_FEED_BYTES)
+
+        if response.status_code == 304:
+            fetch_counters.record(NOT_MODIFIED)
+            return FeedDownload(NOT_MODIFIED, etag=etag, last_modified=last_modified, content_hash=content_hash)
+
+        response.raise_for_status()
+    except Exception:
+        fetch_counters.record('errors')
+        raise
+
+    body = response.content
+    new_etag = response.headers.get('ETag')
+    new_last_modified = response.headers.get('Last-Modified')
+    new_hash = hashlib.sha256(body).hexdigest()
+
+    if content_hash and new_hash == content_hash:
+        fetch_counters.record(UNCHANGED)
+        return FeedDownload(UNCHANGED, etag=new_etag, last_modified=new_last_modified, content_hash=new_hash)
+
+    parsed_feed = feed_parser.parse(url, body, response.headers.get('Content-Type', ''))
+    del body, response
+
+    fetch_counters.record(PARSED)
+    return FeedDownload(PARSED, parsed_feed, new_etag, new_last_modified, new_hash)
@@ -0,0 +1,107 @@
+"""
+Cluster-safe feed refresh coordination for RSS Reader.
+
+Every gunicorn worker (on every node) runs the scheduler, so feeds are
+claimed with short-lived leases stored on the feed row. Workers claim small
+batches and come back for more, which spreads a cycle across all of them
+while each due feed is refreshed by exactly one worker.
+
+PostgreSQL claims with SELECT ... FOR UPDATE SKIP LOCKED. Other databases
+(SQLite in tests) fall back to a conditional UPDATE per feed, which is
+safe because only one writer can win the row.
+"""
+
+import os
+import socket
+from datetime import timedelta
+from sqlalchemy import text, bindparam, DateTime
+from db_utils import dialect_name
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+FEED_COLUMNS = 'id, name, url, etag, last_modified, content_hash'
+
+_CLAIM_POSTGRES = text(f"""
+    UPDATE feed SET lease_owner = :owner, lease_expires_at = :expires
+    WHERE id IN (
+        SELECT id FROM feed
+        WHERE is_active = :active
+          AND (next_fetch_at IS NULL OR next_fetch_at <= :due_before)
+          AND (lease_expires_at IS NULL OR lease_expires_at < :now)
+        ORDER BY next_fetch_at NULLS FIRST
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING {FEED_COLUMNS}
+""").bindparams(
+    bindparam('expires', type_=DateTime),
+    bindparam('due_before', type_=DateTime),
+    bindparam('now', type_=DateTime)
+)
+
+_CANDIDATES = text("""
+    SELECT id FROM feed
+    WHERE is_active = :active
+      AND (next_fetch_at IS NULL OR next_fetch_at <= :due_before)
+      AND (lease_expires_at IS NULL OR lease_expires_at < :now)
+    ORDER BY next_fetch_at
+    LIMIT :limit
+""").bindparams(
+    bindparam('due_before', type_=DateTime),
+    bindparam('now', type_=DateTime)
+)
+
+_CLAIM_ONE = text("""
+    UPDATE feed SET lease_owner = :owner, lease_expires_at = :expires
+    WHERE id = :id AND (lease_expires_at IS NULL OR lease_expires_at < :now)
+""").bindparams(
+    bindparam('expires', type_=DateTime),
+    bindparam('now', type_=DateTime)
+)
+
+_CLAIMED_ROWS = text(f"""
+    SELECT {FEED_COLUMNS} FROM feed WHERE id IN :ids ORDER BY next_fetch_at
+""").bindparams(bindparam('ids', expanding=True))
+
+
+def claim_due_feeds(session, now, due_before, lease_seconds, limit, worker_id=WORKER_ID):
+    """
+    Lease up to `limit` active feeds that were due at `due_before` and are not
+    leased by anyone else. Commits the claim and returns the claimed feed rows.
+    """
+    params = {
+        'owner': worker_id,
+        'expires': now + timedelta(seconds=lease_seconds),
+        'due_before': due_before,
+        'now': now,
+        'active': True,
+        'limit': limit
+    }
+
+    if dialect_name(session) == 'postgresql':
+        rows = session.execute(_CLAIM_POSTGRES, params).fetchall()
+        session.commit()
+        return rows
+
+    candidate_ids = [row[0] for row in session.execute(_CANDIDATES, params)]
+    claimed_ids = []
+    for feed_id in candidate_ids:
+        result = session.execute(_CLAIM_ONE, dict(params, id=feed_id))
+        if result.rowcount == 1:
+            claimed_ids.append(feed_id)
+    session.commit()
+
+    if not claimed_ids:
+        return []
+    return session.execute(_CLAIMED_ROWS, {'ids': claimed_ids}).fetchall()
+
+
+def mark_all_due(session, now):
+    """Make every active feed due now (used by full manual refreshes)"""
+    session.execute(
+        text("UPDATE feed SET next_fetch_at = :now WHERE is_active = :active").bindparams(
+            bindparam('now', type_=DateTime)
+        ),
+        {'now': now, 'active': True}
+    )
+    session.commit()
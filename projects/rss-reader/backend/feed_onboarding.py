@@ -0,0 +1,224 @@
+"""
+Feed onboarding for RSS Reader.
+
+Turns the URL a user typed into a feed that is ready to store, fetching
+every URL at most once. The downloaded document that proves a URL is a
+feed is also the one whose articles are stored first, and its validators
+seed the conditional GET of the next refresh.
+
+When the URL is an HTML page, the feeds it advertises with
+<link rel="alternate"> are tried first, then the common feed paths of the
+site; the candidates of each step are fetched concurrently and the
+earliest one in order that turns out to be a feed wins. Common path
+results (including "no feed here") are cached per domain, so adding
+several pages of the same site probes it only once. "No feed here" is
+only cached when every path answered; a timeout or connection error
+says nothing about the site.
+"""
+
+import hashlib
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlparse
+from extraction import parse_document
+from feed_fetcher import FEED_REQUEST_HEADERS, MAX_FEED_BYTES, FeedDownload, PARSED
+from feed_parsing import feed_parser
+from http_client import http_session, ResponseTooLarge
+
+COMMON_FEED_PATHS = (
+    '/feed', '/feed.xml', '/rss', '/rss.xml', '/atom.xml', '/feeds/posts/default', '/feed/atom'
+)
+
+FEED_LINK_TYPES = ('rss', 'atom', 'xml')
+
+_PENDING = object()
+_FAILED = object()
+
+
+class FeedNotFound(Exception):
+    pass
+
+
+class Page:
+    """A downloaded URL"""
+
+    __slots__ = ('url', 'body', 'content_type', 'etag', 'last_modified')
+
+    def __init__(self, url, body, content_type='', etag=None, last_modified=None):
+        self.url = url
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def is_html(self):
+        content_type = self.content_type.lower()
+        return 'text/html' in content_type or 'application/xhtml' in content_type
+
+
+class OnboardedFeed:
+    """A URL proven to be a feed, with the download that proved it"""
+
+    __slots__ = ('url', 'download', 'discovered')
+
+    def __init__(self, url, download, discovered):
+        self.url = url
+        self.download = download
+        self.discovered = discovered
+
+
+def fetch_page(url, timeout):
+    response = http_session.get(url, headers=FEED_REQUEST_HEADERS, timeout=timeout, max_bytes=MAX_FEED_BYTES)
+    response.raise_for_status()
+    return Page(url, response.content, response.headers.get('Content-Type', ''),
+                response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+def as_feed(page):
+    """A FeedDownload when the page is a feed with entries, else None"""
+    parsed_feed = feed_parser.parse(page.url, page.body, page.content_type)
+    if not parsed_feed.entries:
+        return None
+    return FeedDownload(PARSED, parsed_feed, page.etag, page.last_modified, hashlib.sha256(page.body).hexdigest())
+
+
+def feed_links(page):
+    """Absolute URLs of the feeds an HTML page advertises, in document order"""
+    document = parse_document(page.body)
+    if document is None:
+        return []
+    urls = []
+    for link in document.iter('link'):
+        rels = (link.get('rel') or '').lower().split()
+        link_type = (link.get('type') or '').lower()
+        href = (link.get('href') or '').strip()
+        if 'alternate' in rels and href and any(kind in link_type for kind in FEED_LINK_TYPES):
+            url = urljoin(page.url, href)
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def common_feed_urls(url):
+    parts = urlparse(url)
+    base_url = f"{parts.scheme}://{parts.netloc}"
+    return [urljoin(base_url, path) for path in COMMON_FEED_PATHS]
+
+
+class DiscoveryCache:
+    """Feed URL found at a domain's common paths (None when there is none), remembered for ttl seconds"""
+
+    def __init__(self, ttl, max_entries=1000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        """(hit, feed_url)"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is None or self._clock() - entry[1] >= self.ttl:
+                return False, None
+            return True, entry[0]
+
+    def put(self, domain, feed_url):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Expired entries go first, then the oldest
+                now = self._clock()
+                for key in [key for key, (_, stored) in self._entries.items() if now - stored >= self.ttl]:
+                    del self._entries[key]
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[min(self._entries, key=lambda key: self._entries[key][1])]
+            self._entries[domain] = (feed_url, self._clock())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def is_answer(error):
+    """Whether a failed fetch still shows the URL is not a feed (e.g. a 404), as opposed to not getting through"""
+    if isinstance(error, ResponseTooLarge):
+        return True
+    response = getattr(error, 'response', None)
+    return (isinstance(error, requests.HTTPError) and response is not None
+            and response.status_code < 500 and response.status_code != 429)
+
+
+def _try_candidate(url, fetch, timeout):
+    try:
+        page = fetch(url, timeout)
+    except Exception as e:
+        return None if is_answer(e) else _FAILED
+    try:
+        download = as_feed(page)
+    except Exception:
+        return None
+    return OnboardedFeed(url, download, discovered=True) if download else None
+
+
+def probe_candidates(urls, fetch, timeout, max_workers):
+    """
+    Fetch candidate URLs concurrently. Returns (found, complete): the
+    OnboardedFeed of the first one in order that is a feed, or None, and
+    whether a None is final, i.e. no fetch failed. Answers as soon as every
+    earlier candidate is ruled out, without waiting for later ones.
+    """
+    if not urls:
+        return None, True
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))), thread_name_prefix='feed-probe')
+    try:
+        futures = {executor.submit(_try_candidate, url, fetch, timeout): i for i, url in enumerate(urls)}
+        results = [_PENDING] * len(urls)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            for result in results:
+                if result is _PENDING:
+                    break
+                if result is not None and result is not _FAILED:
+                    return result, True
+        return None, _FAILED not in results
+    finally:
+        # Requests already in flight finish in the background and are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def onboard_feed(url, cache=None, fetch=None, timeout=10, max_workers=8):
+    """
+    Resolve a feed or web page URL to an OnboardedFeed. Raises FeedNotFound,
+    or the fetch error when the URL itself cannot be downloaded.
+    """
+    fetch = fetch or fetch_page
+    page = fetch(url, timeout)
+    download = as_feed(page)
+    if download:
+        return OnboardedFeed(url, download, discovered=False)
+    if not page.is_html:
+        raise FeedNotFound(url)
+
+    found, _ = probe_candidates(feed_links(page), fetch, timeout, max_workers)
+    if found:
+        return found
+
+    domain = urlparse(url).netloc.lower()
+    hit, cached_url = cache.get(domain) if cache else (False, None)
+    if hit and cached_url is None:
+        raise FeedNotFound(url)
+
+    found, complete = probe_candidates([cached_url] if hit else common_feed_urls(url), fetch, timeout, max_workers)
+    if cache and not (hit and found) and (found or complete):
+        cache.put(domain, found.url if found else None)
+    if not found:
+        raise FeedNotFound(url)
+    return found
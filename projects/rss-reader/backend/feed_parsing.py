@@ -0,0 +1,78 @@
+"""
+Feed parsing for RSS Reader.
+
+feedparser, with the HTML sanitizing it does, and entry normalization
+(dates, truncated titles, excerpts) are CPU-bound pure Python. By default
+they run on the thread that downloaded the feed. With FEED_PARSE_WORKERS > 0
+the raw bytes are handed to a pool of worker processes instead, so parsing
+uses every core rather than contending for the GIL with downloads and
+database work. Only the compact NormalizedFeed comes back; deduplication
+and inserts stay in the app process.
+
+Workers are started with "spawn", never forked from the threaded app, and
+are created on first use. Each one is replaced after MAX_FEEDS_PER_WORKER
+feeds to keep parser memory in check.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import feedparser
+from config import Config
+from ingest import normalize_feed
+
+MAX_FEEDS_PER_WORKER = 500
+
+
+def parse_feed_body(url, body, content_type=''):
+    """Parse a downloaded feed; the content type lets feedparser detect the encoding"""
+    return feedparser.parse(body, response_headers={'content-type': content_type, 'content-location': url})
+
+
+def parse_and_normalize(url, body, content_type=''):
+    """NormalizedFeed of a downloaded feed; this is what runs in a worker process"""
+    return normalize_feed(parse_feed_body(url, body, content_type))
+
+
+class ParsePool:
+    """Parses feeds on the calling thread (workers=0) or in a pool of worker processes"""
+
+    def __init__(self, workers=0):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    max_tasks_per_child=MAX_FEEDS_PER_WORKER
+                )
+            return self._executor
+
+    def parse(self, url, body, content_type=''):
+        if self.workers <= 0:
+            return parse_and_normalize(url, body, content_type)
+
+        executor = self._get_executor()
+        try:
+            return executor.submit(parse_and_normalize, url, body, content_type).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next feeds
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+feed_parser = ParsePool(Config.FEED_PARSE_WORKERS)
@@ -0,0 +1,50 @@
+"""
+Adaptive per-feed refresh scheduling for RSS Reader.
+
+Each feed's polling interval is learned from the gaps between its recent
+articles, so busy feeds are polled often and quiet ones rarely. Feeds that
+keep failing back off exponentially instead of being retried every cycle.
+"""
+
+import random
+from datetime import timedelta
+from statistics import median
+
+
+def estimate_interval(published_dates, now, default_minutes, min_minutes, max_minutes):
+    """
+    Polling interval in minutes from a feed's recent publish dates.
+
+    Polls about twice per typical gap between posts. A feed that has been
+    silent for longer than its usual gap is polled less often until it posts.
+    """
+    dates = sorted((d for d in published_dates if d is not None), reverse=True)
+    if len(dates) < 2:
+        return default_minutes
+
+    gaps = [(newer - older).total_seconds() / 60 for newer, older in zip(dates, dates[1:])]
+    typical_gap = median(gap for gap in gaps if gap >= 0)
+
+    # Posts dated in the future (bad feed clocks) should not shrink the interval
+    silence = max(0, (now - dates[0]).total_seconds() / 60)
+
+    interval = max(typical_gap, silence) / 2
+    return int(min(max(interval, min_minutes), max_minutes))
+
+
+def backoff_interval(failures, base_minutes, max_minutes):
+    """Exponential backoff in minutes after `failures` consecutive failures"""
+    if failures <= 0:
+        return base_minutes
+    return int(min(base_minutes * (2 ** (failures - 1)), max_minutes))
+
+
+def next_fetch_time(now, interval_minutes, jitter=0.1):
+    """Schedule the next fetch, spreading feeds out by up to `jitter` of the interval"""
+    spread = interval_minutes * jitter * random.random() if jitter else 0
+    return now + timedelta(minutes=interval_minutes + spread)
+
+
+def should_log_failure(failures):
+    """Log the first failure and then only at powers of two to keep logs readable"""
+    return failures > 0 and (failures & (failures - 1)) == 0
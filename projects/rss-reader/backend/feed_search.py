@@ -0,0 +1,139 @@
+"""
+Feed search for RSS Reader (/api/feed-search).
+
+A query like "engadget" or "engadget.com" is expanded into a few candidate
+site URLs, and each candidate is looked up with a feed search service
+(feedsearch.dev by default). The lookups run concurrently and the first
+non-empty answer wins; lookups that have not started yet are cancelled.
+
+Answers are cached per normalized query, empty ones included, so repeated
+searches never reach the service. Empty answers are kept for a shorter
+time, and answers that are only empty because a lookup failed are not
+cached at all.
+
+The service sits behind FeedSearchBackend. FeedsearchDev talks to any
+server with the feedsearch.dev API at FEEDSEARCH_API_BASE, which is how
+tests and benchmarks point it at a local stub.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_client import http_session
+
+
+def normalize_query(query):
+    """Cache key of a query: case, surrounding space and a trailing slash do not matter"""
+    return query.strip().lower().rstrip('/')
+
+
+def candidate_urls(query):
+    """Site URLs to look up for a query, most likely first"""
+    query = query.strip()
+    if query.startswith('http'):
+        # Already a full URL
+        return [query]
+    if '.' in query:
+        # Has a domain extension (e.g. engadget.com)
+        return [f"https://{query}", query]
+    # Just a name (e.g. engadget): try common extensions
+    return [f"{query}.com", f"https://{query}.com", f"{query}.org", f"{query}.io"]
+
+
+class FeedSearchBackend(ABC):
+    """A feed search service. search() returns feed dicts, [] when the site has no feeds, and raises on failure."""
+
+    @abstractmethod
+    def search(self, url, timeout):
+        ...
+
+
+class FeedsearchDev(FeedSearchBackend):
+    """The feedsearch.dev API, or a server that speaks it"""
+
+    def __init__(self, api_base='https://feedsearch.dev/api/v1'):
+        self.api_base = api_base.rstrip('/')
+
+    def search(self, url, timeout):
+        response = http_session.get(f"{self.api_base}/search", params={'url': url}, timeout=timeout)
+        if 400 <= response.status_code < 500:
+            # The service could not find anything at that URL
+            return []
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, list):
+            return []
+        return [{
+            'title': feed.get('title', 'Unknown Feed'),
+            'url': feed['url'],
+            'website': feed.get('site_url', ''),
+            'description': feed.get('description', ''),
+            'favicon': feed.get('favicon', '')
+        } for feed in data if feed.get('url')]
+
+
+def search_feeds(query, backend, timeout, max_workers=4):
+    """
+    Look up every candidate URL of a query at once. Returns (feeds, complete):
+    the first non-empty answer to arrive, and whether an empty answer is
+    final, i.e. no lookup failed.
+    """
+    urls = candidate_urls(query)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))), thread_name_prefix='feed-search')
+    complete = True
+    try:
+        futures = [executor.submit(backend.search, url, timeout) for url in urls]
+        for future in as_completed(futures):
+            try:
+                feeds = future.result()
+            except Exception as e:
+                print(f"Feed search error: {e}")
+                complete = False
+                continue
+            if feeds:
+                return feeds, True
+        return [], complete
+    finally:
+        # Lookups already in flight finish in the background and are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SearchCache:
+    """Bounded LRU of search answers; empty answers expire after negative_ttl"""
+
+    def __init__(self, ttl, negative_ttl, max_entries=500, clock=time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(hit, feeds)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            feeds, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, feeds
+
+    def put(self, key, feeds):
+        ttl = self.ttl if feeds else self.negative_ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (feeds, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,257 @@
+"""
+Shared outbound HTTP for RSS Reader.
+
+Every request the app makes - feed downloads, feed discovery, feed search,
+article pages and the summary API - goes through one PoliteSession:
+
+- Keep-alive connections are pooled per host and reused across requests
+  and threads.
+- At most HTTP_MAX_PER_HOST requests run against a host at once; others
+  wait up to HTTP_HOST_WAIT_SECONDS for a slot.
+- A 429 (or a 503 with Retry-After) puts the host on a cool-down. Short
+  ones are waited out and the request retried once; during longer ones
+  requests to the host fail at once with HostCoolingDown instead of
+  hitting it again.
+- Bodies are streamed and max_bytes is enforced while reading, so an
+  oversized page is dropped after max_bytes instead of downloaded whole.
+- Latency and errors are counted per host (see /api/refresh-stats).
+
+Cookies are never kept between requests.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+USER_AGENT = 'Mozilla/5.0 (compatible; r33der/1.0; +https://r33der.dev)'
+
+DEFAULT_RETRY_AFTER = 60  # Cool-down after a 429 without Retry-After
+MAX_TRACKED_HOSTS = 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+
+class HostCoolingDown(requests.RequestException):
+    """The host asked us to slow down and its Retry-After has not passed yet"""
+
+    def __init__(self, host, retry_after):
+        super().__init__(f'{host} asked to retry in {retry_after:.0f}s')
+        self.host = host
+        self.retry_after = retry_after
+
+
+class HostBusy(requests.Timeout):
+    pass
+
+
+def host_key(url):
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    return f'{host}:{parts.port}' if parts.port else host
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date); None when unusable"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class HostState:
+    """Slots, cool-down and counters of one host; guarded by the session lock"""
+
+    __slots__ = ('slot_freed', 'active', 'waiting', 'cool_until',
+                 'requests', 'errors', 'throttled', 'too_large', 'total_ms', 'max_ms')
+
+    def __init__(self, lock):
+        self.slot_freed = threading.Condition(lock)
+        self.active = 0
+        self.waiting = 0
+        self.cool_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.too_large = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def to_dict(self, now):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'throttled': self.throttled,
+            'too_large': self.too_large,
+            'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else None,
+            'max_ms': round(self.max_ms, 1),
+            'in_flight': self.active,
+            'cooling_down_seconds': round(max(0.0, self.cool_until - now), 1)
+        }
+
+
+class PoliteSession(requests.Session):
+    """
+    requests.Session with per-host concurrency caps, Retry-After handling,
+    streamed byte caps (max_bytes=) and per-host stats. Thread-safe.
+    """
+
+    def __init__(self, max_per_host=4, host_wait=30, max_retry_wait=5, max_cooldown=3600,
+                 pool_hosts=64, clock=time.monotonic, sleep=time.sleep):
+        super().__init__()
+        self.max_per_host = max(1, max_per_host)
+        self.host_wait = host_wait
+        self.max_retry_wait = max_retry_wait
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts = OrderedDict()
+
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=self.max_per_host)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.headers['User-Agent'] = USER_AGENT
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def _state(self, host):
+        """HostState of a host, creating it; forgets the least recently used idle hosts. Lock held."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self._lock)
+            for old in list(self._hosts)[:max(0, len(self._hosts) - MAX_TRACKED_HOSTS)]:
+                if not (self._hosts[old].active or self._hosts[old].waiting):
+                    del self._hosts[old]
+        self._hosts.move_to_end(host)
+        return state
+
+    def _acquire(self, host):
+        """Take a request slot for host, after any short cool-down"""
+        while True:
+            with self._lock:
+                state = self._state(host)
+                cooling = state.cool_until - self._clock()
+                if cooling <= 0:
+                    deadline = self._clock() + self.host_wait
+                    state.waiting += 1
+                    try:
+                        while state.active >= self.max_per_host:
+                            remaining = deadline - self._clock()
+                            if remaining <= 0:
+                                raise HostBusy(f'No free connection slot for {host} after {self.host_wait}s')
+                            state.slot_freed.wait(remaining)
+                    finally:
+                        state.waiting -= 1
+                    state.active += 1
+                    return state
+            if cooling > self.max_retry_wait:
+                raise HostCoolingDown(host, cooling)
+            self._sleep(cooling)
+
+    def _release(self, state, elapsed_ms, error=False, throttled=False, too_large=False, cooldown=None):
+        with self._lock:
+            state.active -= 1
+            state.slot_freed.notify()
+            state.requests += 1
+            state.total_ms += elapsed_ms
+            state.max_ms = max(state.max_ms, elapsed_ms)
+            state.errors += error
+            state.throttled += throttled
+            state.too_large += too_large
+            if cooldown is not None:
+                state.cool_until = max(state.cool_until, self._clock() + min(cooldown, self.max_cooldown))
+
+    def request(self, method, url, *args, max_bytes=None, stream=False, **kwargs):
+        host = host_key(url)
+        for attempt in (1, 2):
+            response = self._send_polite(host, method, url, max_bytes, stream, args, kwargs)
+            cooldown = _throttle_delay(response)
+            if cooldown is None or attempt == 2 or cooldown > self.max_retry_wait:
+                return response
+            # Short Retry-After: wait it out (in _acquire) and try once more
+            response.close()
+        return response
+
+    def _send_polite(self, host, method, url, max_bytes, stream, args, kwargs):
+        state = self._acquire(host)
+        started = time.perf_counter()
+        outcome = {'error': True}
+        try:
+            response = super().request(method, url, *args, stream=True, **kwargs)
+            if not stream:
+                read_capped(response, max_bytes)
+            cooldown = _throttle_delay(response)
+            outcome = {
+                'error': response.status_code >= 500 or cooldown is not None,
+                'throttled': cooldown is not None,
+                'cooldown': cooldown
+            }
+            return response
+        except ResponseTooLarge:
+            outcome = {'too_large': True}
+            raise
+        finally:
+            self._release(state, (time.perf_counter() - started) * 1000, **outcome)
+
+    def host_stats(self, limit=20):
+        """Counters of the busiest hosts, most requests first"""
+        with self._lock:
+            now = self._clock()
+            busiest = sorted(self._hosts.items(), key=lambda item: item[1].requests, reverse=True)[:limit]
+            return {host: state.to_dict(now) for host, state in busiest}
+
+
+def _throttle_delay(response):
+    """Cool-down a response asks for: any 429, or a 503 with Retry-After; else None"""
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if response.status_code == 429:
+        return DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+    if response.status_code == 503:
+        return retry_after
+    return None
+
+
+def read_capped(response, max_bytes=None, chunk_size=64 * 1024):
+    """Read a streamed body into response.content, giving up as soon as it exceeds max_bytes"""
+    if max_bytes is not None:
+        length = response.headers.get('Content-Length', '')
+        if length.isdigit() and int(length) > max_bytes:
+            response.close()
+            raise ResponseTooLarge(f'{response.url} is {length} bytes (limit {max_bytes})')
+
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(chunk_size):
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise ResponseTooLarge(f'{response.url} is over {max_bytes} bytes')
+            chunks.append(chunk)
+    except BaseException:
+        response.close()
+        raise
+    response._content = b''.join(chunks)
+    return response.content
+
+
+http_session = PoliteSession(
+    max_per_host=Config.HTTP_MAX_PER_HOST,
+    host_wait=Config.HTTP_HOST_WAIT_SECONDS,
+    max_retry_wait=Config.HTTP_RETRY_AFTER_MAX_WAIT,
+    max_cooldown=Config.HTTP_MAX_COOLDOWN_SECONDS
+)
@@ -0,0 +1,146 @@
+"""
+Feed entry ingestion helpers for RSS Reader.
+
+Entries are normalized into plain dicts before touching the database, so a
+whole feed can be deduplicated with one query and stored with one bulk insert.
+A normalized feed keeps its entries as compact ENTRY_FIELDS tuples, cheap to
+send back from a parse worker process (see feed_parsing.py).
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from extraction import parse_document, UNWANTED_TAGS
+
+# Length of the plain-text preview shown in article lists
+EXCERPT_CHARS = 300
+
+# Order of the values in a normalized entry tuple
+ENTRY_FIELDS = ('link', 'title', 'description', 'excerpt', 'published_date', 'author')
+
+# Elements that end a run of text; a space is kept after them
+BLOCK_TAGS = ('p', 'div', 'br', 'li', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'td', 'img')
+
+
+def make_excerpt(description, max_chars=EXCERPT_CHARS):
+    """Plain text preview of an entry's HTML description, cut at a word boundary"""
+    document = parse_document(description)
+    if document is None:
+        return ''
+    for element in list(document.iter(*UNWANTED_TAGS)):
+        element.drop_tree()
+    for element in document.iter(*BLOCK_TAGS):
+        element.tail = ' ' + (element.tail or '')
+
+    text = ' '.join(document.text_content().split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 1]
+    space = cut.rfind(' ')
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip(' ,.;:-') + '…'
+
+
+def normalize_entry(entry):
+    """Turn a feedparser entry into a row for the article table"""
+    # Parse published date
+    published_date = None
+    if entry.get('published_parsed'):
+        published_date = datetime(*entry.published_parsed[:6])
+    elif entry.get('updated_parsed'):
+        published_date = datetime(*entry.updated_parsed[:6])
+
+    # Truncate article title if it's too long (database limit is 500 characters)
+    title = entry.get('title', 'No Title')
+    if len(title) > 500:
+        title = title[:497] + "..."
+
+    description = entry.get('summary', '')
+    return {
+        'title': title,
+        'link': entry.get('link', ''),
+        'description': description,
+        'excerpt': make_excerpt(description),
+        'published_date': published_date,
+        'author': entry.get('author', '')
+    }
+
+
+class NormalizedFeed:
+    """Entries of a parsed feed as ENTRY_FIELDS tuples, its own logo, and entries that could not be read"""
+
+    __slots__ = ('entries', 'logo_url', 'errors')
+
+    def __init__(self, entries, logo_url=None, errors=()):
+        self.entries = entries
+        self.logo_url = logo_url
+        self.errors = errors
+
+
+def feed_logo(parsed_feed):
+    """Logo URL a feedparser result advertises, if any"""
+    if hasattr(parsed_feed.feed, 'image'):
+        return parsed_feed.feed.image.get('href')
+    if hasattr(parsed_feed.feed, 'logo'):
+        return parsed_feed.feed.logo
+    return None
+
+
+def normalize_feed(parsed_feed):
+    """NormalizedFeed of a feedparser result; unreadable entries are skipped and reported"""
+    entries, errors = [], []
+    for i, entry in enumerate(parsed_feed.entries):
+        try:
+            row = normalize_entry(entry)
+        except Exception as e:
+            errors.append(f"entry {i}: {e}")
+            continue
+        entries.append(tuple(row[field] for field in ENTRY_FIELDS))
+    return NormalizedFeed(entries, feed_logo(parsed_feed), errors)
+
+
+class RecentLinkCache:
+    """
+    Bounded LRU of links known to be stored, per feed.
+
+    Hot feeds mostly re-serve entries we already have; when every candidate
+    link is in the cache the existence query can be skipped entirely.
+    """
+
+    def __init__(self, max_feeds=500, max_links_per_feed=200):
+        self.max_feeds = max_feeds
+        self.max_links_per_feed = max_links_per_feed
+        self._feeds = OrderedDict()
+        self._lock = threading.Lock()
+
+    def unseen(self, feed_id, links):
+        """Return the links that are not known to be stored for this feed"""
+        with self._lock:
+            known = self._feeds.get(feed_id)
+            if known is None:
+                return list(links)
+            self._feeds.move_to_end(feed_id)
+            return [link for link in links if link not in known]
+
+    def remember(self, feed_id, links):
+        with self._lock:
+            known = self._feeds.get(feed_id)
+            if known is None:
+                known = self._feeds[feed_id] = OrderedDict()
+            self._feeds.move_to_end(feed_id)
+
+            for link in links:
+                known[link] = True
+                known.move_to_end(link)
+            while len(known) > self.max_links_per_feed:
+                known.popitem(last=False)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+
+    def forget(self, feed_id=None):
+        with self._lock:
+            if feed_id is None:
+                self._feeds.clear()
+            else:
+                self._feeds.pop(feed_id, None)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for RSS Reader.
+
+db.create_all() creates missing tables but never alters existing ones, so
+columns and indexes added after a table was first created are shipped here.
+Applied versions are recorded in the schema_version table. Every step is
+idempotent, so a half-applied migration can simply be run again.
+
+Runs on startup from wsgi.py, or by hand:
+    python migrations.py            # apply pending migrations
+    python migrations.py --status   # list applied and pending versions
+
+On PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY so that
+writes to the article table are never blocked while they build.
+"""
+
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import inspect, text
+
+# Any constant works; it only has to be the same for every worker
+MIGRATION_LOCK_ID = 726_345_001
+# How often a waiting worker retries the migration lock
+MIGRATION_LOCK_POLL_SECONDS = 0.5
+
+_CREATE_VERSION_TABLE = text("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        applied_at TIMESTAMP NOT NULL
+    )
+""")
+
+
+def _datetime_type(dialect):
+    return 'TIMESTAMP WITHOUT TIME ZONE' if dialect == 'postgresql' else 'DATETIME'
+
+
+def add_missing_columns(engine, table, columns):
+    """ALTER TABLE ... ADD COLUMN for each (name, type) the table does not have yet"""
+    existing = {column['name'] for column in inspect(engine).get_columns(table)}
+    with engine.begin() as conn:
+        for name, column_type in columns:
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+                print(f"  ➕ {table}.{name}")
+
+
+def index_exists(engine, table, name):
+    inspector = inspect(engine)
+    names = {index['name'] for index in inspector.get_indexes(table)}
+    names.update(constraint['name'] for constraint in inspector.get_unique_constraints(table))
+    return name in names
+
+
+def drop_invalid_index(engine, name):
+    """Drop the invalid index a failed concurrent build leaves behind (PostgreSQL); True if there was one"""
+    if engine.dialect.name != 'postgresql':
+        return False
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        invalid = conn.execute(text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """), {'name': name}).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    return bool(invalid)
+
+
+def create_index(engine, name, table, columns, unique=False, where=None, postgresql_columns=None, using=None):
+    """Create an index if missing; concurrently (outside a transaction) on PostgreSQL"""
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        columns = postgresql_columns or columns
+        drop_invalid_index(engine, name)
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table}{f' USING {using}' if using else ''} ({columns}){f' WHERE {where}' if where else ''}"
+            ))
+        return
+
+    if index_exists(engine, table, name):
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+            f"ON {table} ({columns}){f' WHERE {where}' if where else ''}"
+        ))
+
+
+def add_feed_validator_columns(engine):
+    add_missing_columns(engine, 'feed', [
+        ('etag', 'VARCHAR(200)'),
+        ('last_modified', 'VARCHAR(100)'),
+        ('content_hash', 'VARCHAR(64)'),
+    ])
+
+
+def add_feed_schedule_columns(engine):
+    add_missing_columns(engine, 'feed', [
+        ('next_fetch_at', _datetime_type(engine.dialect.name)),
+        ('fetch_interval_minutes', 'INTEGER'),
+        ('consecutive_failures', 'INTEGER DEFAULT 0'),
+        ('last_error', 'VARCHAR(500)'),
+    ])
+
+
+def add_feed_lease_columns(engine):
+    add_missing_columns(engine, 'feed', [
+        ('lease_owner', 'VARCHAR(100)'),
+        ('lease_expires_at', _datetime_type(engine.dialect.name)),
+    ])
+
+
+def add_article_reading_time_columns(engine):
+    add_missing_columns(engine, 'article', [
+        ('word_count', 'INTEGER'),
+        ('reading_time_minutes', 'INTEGER'),
+        ('reading_time_estimated', 'BOOLEAN DEFAULT false'),
+    ])
+
+
+def deduplicate_articles(engine):
+    """Remove duplicate (feed_id, link) rows so the unique index can be built; keeps the oldest row"""
+    # An invalid index from a failed build does not mean the duplicates are gone
+    if index_exists(engine, 'article', 'uq_article_feed_link') and not drop_invalid_index(engine, 'uq_article_feed_link'):
+        return
+    with engine.begin() as conn:
+        # The kept row inherits a bookmark set on any of its duplicates
+        conn.execute(text("""
+            UPDATE article SET is_bookmarked = true
+            WHERE id IN (
+                SELECT MIN(id) FROM article GROUP BY feed_id, link
+                HAVING SUM(CASE WHEN is_bookmarked = true THEN 1 ELSE 0 END) > 0
+            )
+        """))
+        deleted = conn.execute(text("""
+            DELETE FROM article
+            WHERE id NOT IN (SELECT MIN(id) FROM article GROUP BY feed_id, link)
+        """)).rowcount
+        if deleted:
+            print(f"  🗑️ Removed {deleted} duplicate articles")
+    create_index(engine, 'uq_article_feed_link', 'article', 'feed_id, link', unique=True)
+
+
+def backfill_feed_counters(engine):
+    """Fill feed_counter for databases that had articles before the counters existed"""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO feed_counter (feed_id, total, unread, bookmarked)
+            SELECT f.id,
+                   COUNT(a.id),
+                   COALESCE(SUM(CASE WHEN a.is_read = false THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN a.is_bookmarked = true THEN 1 ELSE 0 END), 0)
+            FROM feed f LEFT JOIN article a ON a.feed_id = f.id
+            WHERE f.id NOT IN (SELECT feed_id FROM feed_counter)
+            GROUP BY f.id
+        """))
+
+
+def create_hot_path_indexes(engine):
+    # Partial index predicates must match the queries as SQLAlchemy renders them
+    true, false = ('true', 'false') if engine.dialect.name == 'postgresql' else ('1', '0')
+    # Article listings: ORDER BY published_date DESC NULLS LAST, id DESC (see pagination.py)
+    create_index(engine, 'ix_article_published', 'article', 'published_date, id',
+                 postgresql_columns='published_date DESC NULLS LAST, id DESC')
+    create_index(engine, 'ix_article_feed_published', 'article', 'feed_id, published_date, id',
+                 postgresql_columns='feed_id, published_date DESC NULLS LAST, id DESC')
+    create_index(engine, 'ix_article_unread_published', 'article', 'published_date, id',
+                 postgresql_columns='published_date DESC NULLS LAST, id DESC', where=f'is_read = {false}')
+    # Bookmarks view, sort=created and cleanup-database.py (DELETE ... WHERE created_at < ...)
+    create_index(engine, 'ix_article_created', 'article', 'created_at, id')
+    create_index(engine, 'ix_article_bookmarked_created', 'article', 'created_at, id', where=f'is_bookmarked = {true}')
+    # Due-feed claims (feed_leases.py)
+    create_index(engine, 'ix_feed_due', 'feed', 'next_fetch_at', where=f'is_active = {true}')
+
+
+def add_article_excerpts(engine, batch_size=500):
+    """Add the excerpt column and fill it in for articles stored before it existed"""
+    from ingest import make_excerpt, EXCERPT_CHARS
+
+    add_missing_columns(engine, 'article', [('excerpt', f'VARCHAR({EXCERPT_CHARS})')])
+    filled = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, description FROM article WHERE excerpt IS NULL ORDER BY id LIMIT :limit"
+            ), {'limit': batch_size}).fetchall()
+            if not rows:
+                break
+            conn.execute(text("UPDATE article SET excerpt = :excerpt WHERE id = :id"), [
+                {'id': article_id, 'excerpt': make_excerpt(description)} for article_id, description in rows
+            ])
+            filled += len(rows)
+    if filled:
+        print(f"  ✂️ Wrote excerpts for {filled} articles")
+
+
+def create_search_index(engine):
+    """Full-text search: tsvector column and GIN index on PostgreSQL, FTS5 table and triggers on SQLite"""
+    from search import POSTGRESQL_DDL, SQLITE_DDL
+
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        # Adding a stored generated column rewrites the article table once
+        with engine.begin() as conn:
+            for statement in POSTGRESQL_DDL:
+                conn.execute(text(statement))
+        create_index(engine, 'ix_article_search', 'article', 'search_vector', using='gin')
+    elif dialect == 'sqlite':
+        with engine.begin() as conn:
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+    else:
+        print(f"  ⚠️ No full-text search index for {dialect}")
+
+
+def add_change_sequence(engine, batch_size=5000):
+    """change_seq columns for /api/sync; rows stored before they existed count as changed at sequence 1"""
+    add_missing_columns(engine, 'feed', [('change_seq', 'BIGINT')])
+    add_missing_columns(engine, 'article', [('change_seq', 'BIGINT')])
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE feed SET change_seq = 1 WHERE change_seq IS NULL"))
+    # In batches, so the article table is never locked for long
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(text("""
+                UPDATE article SET change_seq = 1
+                WHERE id IN (SELECT id FROM article WHERE change_seq IS NULL LIMIT :limit)
+            """), {'limit': batch_size}).rowcount
+        if not updated:
+            break
+    create_index(engine, 'ix_article_change_seq', 'article', 'change_seq, id')
+
+
+# One migration per schema change, in the order the changes were made. A new
+# column or index on an existing table needs a new entry here; new tables are
+# created by db.create_all(). tests/test_migrations.py upgrades the original
+# schema and checks that it ends up matching the models.
+MIGRATIONS = [
+    (1, 'feed conditional GET validator columns', add_feed_validator_columns),
+    (2, 'unique (feed_id, link) article index', deduplicate_articles),
+    (3, 'feed adaptive scheduling columns', add_feed_schedule_columns),
+    (4, 'feed refresh lease columns', add_feed_lease_columns),
+    (5, 'article reading time columns', add_article_reading_time_columns),
+    (6, 'backfill feed counters', backfill_feed_counters),
+    (7, 'hot path article and feed indexes', create_hot_path_indexes),
+    (8, 'plain text article excerpts', add_article_excerpts),
+    (9, 'full-text article search index', create_search_index),
+    (10, 'change sequence for incremental sync', add_change_sequence),
+]
+
+
+def applied_versions(engine):
+    with engine.begin() as conn:
+        conn.execute(_CREATE_VERSION_TABLE)
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_version"))}
+
+
+def run_migrations(engine):
+    """Apply pending migrations in order. Returns the versions that were applied."""
+    lock = None
+    if engine.dialect.name == 'postgresql':
+        # Workers starting together wait for the first one instead of racing it.
+        # Poll rather than block in pg_advisory_lock: a waiting statement holds
+        # a snapshot, and CREATE INDEX CONCURRENTLY in the worker holding the
+        # lock would wait on it forever without PostgreSQL seeing a deadlock.
+        lock = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        while not lock.execute(text("SELECT pg_try_advisory_lock(:id)"), {'id': MIGRATION_LOCK_ID}).scalar():
+            time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+    try:
+        done = applied_versions(engine)
+        applied = []
+        for version, name, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            print(f"🛠️ Migration {version}: {name}")
+            migrate(engine)
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO schema_version (version, name, applied_at) VALUES (:version, :name, :now)"),
+                    {'version': version, 'name': name, 'now': datetime.utcnow()}
+                )
+            applied.append(version)
+        return applied
+    finally:
+        if lock is not None:
+            lock.execute(text("SELECT pg_advisory_unlock(:id)"), {'id': MIGRATION_LOCK_ID})
+            lock.close()
+
+
+def main():
+    from app import app, db
+
+    with app.app_context():
+        if '--status' in sys.argv:
+            done = applied_versions(db.engine)
+            for version, name, _ in MIGRATIONS:
+                print(f"{'✅' if version in done else '⏳'} {version}: {name}")
+            return
+
+        db.create_all()
+        applied = run_migrations(db.engine)
+        print(f"✅ Applied {len(applied)} migrations" if applied else "✅ Schema is up to date")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+OPML import and export for RSS Reader.
+
+An imported subscription list is checked concurrently (every URL fetched
+once, HTML pages searched for their feed, see feed_onboarding.py) with at
+most OPML_IMPORT_MAX_WORKERS downloads at a time. Then all new feeds are
+inserted with one bulk statement. Their articles are not fetched during
+the import: new feeds are due immediately, so the next scheduled refresh
+picks them up with the usual concurrency and leases.
+
+The export streams active feeds, grouped by category, without building
+the document in memory.
+
+    POST /api/feeds/import       OPML upload (file field or request body); checks run in a background
+                                 job, ?validate=false skips them and answers at once
+    GET  /api/feeds/import/<id>  Import job progress, then the per-feed report
+    GET  /api/feeds/export       OPML download
+
+Large lists can be imported from the command line instead:
+    python opml.py import subscriptions.opml [--no-validate]
+    python opml.py export > subscriptions.opml
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+from lxml import etree
+
+# Never resolve entities or fetch DTDs from uploaded documents
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+
+
+class OpmlError(ValueError):
+    pass
+
+
+class OpmlEntry:
+    """One feed outline of an OPML document"""
+
+    __slots__ = ('title', 'url', 'category')
+
+    def __init__(self, title, url, category=None):
+        self.title = title
+        self.url = url
+        self.category = category
+
+
+def _outline_category(outline):
+    """Category of a feed outline: its `category` attribute, else the folder outline around it"""
+    category = (outline.get('category') or '').split(',')[0].strip().strip('/')
+    if category:
+        return category
+    parent = outline.getparent()
+    if parent is not None and parent.tag == 'outline' and not parent.get('xmlUrl'):
+        return (parent.get('text') or parent.get('title') or '').strip() or None
+    return None
+
+
+def parse_opml(data):
+    """OpmlEntry for every feed outline, in document order, without repeated URLs"""
+    try:
+        root = etree.fromstring(data, _PARSER)
+    except (etree.XMLSyntaxError, ValueError) as e:
+        raise OpmlError(f'Invalid OPML: {e}') from e
+    body = root.find('body') if root.tag == 'opml' else None
+    if body is None:
+        raise OpmlError('Invalid OPML: no <opml><body>')
+
+    entries, seen = [], set()
+    for outline in body.iter('outline'):
+        url = (outline.get('xmlUrl') or '').strip()
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        title = (outline.get('title') or outline.get('text') or '').strip()
+        entries.append(OpmlEntry(title or url, url, _outline_category(outline)))
+    return entries
+
+
+def check_concurrently(check, entries, max_workers, on_checked=None):
+    """
+    check(entry) for every entry, at most max_workers at a time; results in
+    input order. on_checked(count) is called on the calling thread as results
+    come in.
+    """
+    if not entries:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(entries))), thread_name_prefix='opml') as executor:
+        futures = [executor.submit(check, entry) for entry in entries]
+        for count, _ in enumerate(as_completed(futures), 1):
+            if on_checked:
+                on_checked(count)
+        return [future.result() for future in futures]
+
+
+def opml_document(feeds, title='RSS Reader subscriptions'):
+    """
+    Yield an OPML document piece by piece. feeds are (name, url, category)
+    rows ordered by category; each category becomes a folder outline.
+    """
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0">\n'
+    yield f'  <head>\n    <title>{escape(title)}</title>\n'
+    yield f'    <dateCreated>{datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")}</dateCreated>\n  </head>\n'
+    yield '  <body>\n'
+    current = None
+    for name, url, category in feeds:
+        category = category or 'General'
+        if category != current:
+            if current is not None:
+                yield '    </outline>\n'
+            yield f'    <outline text={quoteattr(category)} title={quoteattr(category)}>\n'
+            current = category
+        yield (f'      <outline type="rss" text={quoteattr(name)} title={quoteattr(name)} '
+               f'xmlUrl={quoteattr(url)} category={quoteattr(category)}/>\n')
+    if current is not None:
+        yield '    </outline>\n'
+    yield '  </body>\n</opml>\n'
+
+
+def main():
+    from app import app, db, Feed, import_opml_feeds
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('import', 'export') or (sys.argv[1] == 'import' and len(sys.argv) < 3):
+        print("Usage: python opml.py import FILE [--no-validate] | python opml.py export")
+        sys.exit(1)
+
+    with app.app_context():
+        if sys.argv[1] == 'export':
+            rows = db.session.query(Feed.name, Feed.url, Feed.category).filter(
+                Feed.is_active == True
+            ).order_by(Feed.category, Feed.name)
+            for chunk in opml_document(rows):
+                sys.stdout.write(chunk)
+            return
+
+        with open(sys.argv[2], 'rb') as f:
+            entries = parse_opml(f.read())
+        print(f"📥 Importing {len(entries)} feeds from {sys.argv[2]}")
+        report = import_opml_feeds(entries, validate='--no-validate' not in sys.argv)
+        for item in report:
+            if item['status'] == 'failed':
+                print(f"  ❌ {item['url']}: {item['error']}")
+        counts = {status: sum(1 for item in report if item['status'] == status) for status in ('added', 'exists', 'failed')}
+        print(f"✅ Added {counts['added']}, already subscribed {counts['exists']}, failed {counts['failed']}")
+
+
+if __name__ == '__main__':
+    main()
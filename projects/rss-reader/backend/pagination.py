@@ -0,0 +1,76 @@
+"""
+Keyset (cursor) pagination for RSS Reader article listings.
+
+Pages are fetched with WHERE (sort_key, id) < (last_sort_key, last_id)
+instead of OFFSET, so every page costs the same as the first one. The
+position is handed to clients as an opaque cursor.
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import or_, and_, tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, row_id):
+    """Cursor for a position; sort_value is a datetime, a number (e.g. a search rank) or None"""
+    payload = [sort_value.isoformat() if isinstance(sort_value, datetime) else sort_value, row_id]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(sort_value, id) from a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_value is not None and not isinstance(sort_value, (int, float)):
+            raise TypeError('unexpected sort value')
+        return sort_value, int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def through_cursor(sort_column, id_column, cursor):
+    """Clause matching every row up to and including the cursor position, i.e. the pages already seen"""
+    sort_value, row_id = decode_cursor(cursor)
+    if sort_value is None:
+        return or_(sort_column.is_not(None), id_column >= row_id)
+    return tuple_(sort_column, id_column) >= (sort_value, row_id)
+
+
+def keyset_page(query, sort_column, id_column, cursor, limit, offset=0):
+    """
+    One page of `query` ordered by sort_column DESC NULLS LAST, id DESC.
+
+    `offset` only exists for clients that still send page numbers.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page. Rows
+    must be model objects carrying the sort and id columns as attributes.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            # Already into the undated rows at the end
+            query = query.filter(and_(sort_column.is_(None), id_column < row_id))
+        else:
+            query = query.filter(or_(
+                tuple_(sort_column, id_column) < (sort_value, row_id),
+                sort_column.is_(None)
+            ))
+
+    query = query.order_by(sort_column.desc().nulls_last(), id_column.desc())
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
@@ -0,0 +1,168 @@
+"""
+Concurrent feed refresh engine for RSS Reader.
+
+Feed downloads are network bound, so they run on a bounded pool of worker
+threads. Parsed results are handed back to a single writer - the thread that
+called run() - which is the only one allowed to touch the SQLAlchemy session.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+
+class FeedJob:
+    """Plain snapshot of a feed so worker threads never touch ORM objects"""
+
+    __slots__ = ('feed_id', 'name', 'url', 'etag', 'last_modified', 'content_hash')
+
+    def __init__(self, feed_id, name, url, etag=None, last_modified=None, content_hash=None):
+        self.feed_id = feed_id
+        self.name = name
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+
+
+class FeedTiming:
+    """Timing and outcome of one feed within a refresh cycle"""
+
+    __slots__ = ('feed_id', 'name', 'fetch_seconds', 'write_seconds', 'new_articles', 'error')
+
+    def __init__(self, feed_id, name):
+        self.feed_id = feed_id
+        self.name = name
+        self.fetch_seconds = 0.0
+        self.write_seconds = 0.0
+        self.new_articles = 0
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'feed_id': self.feed_id,
+            'name': self.name,
+            'fetch_seconds': round(self.fetch_seconds, 3),
+            'write_seconds': round(self.write_seconds, 3),
+            'new_articles': self.new_articles,
+            'error': self.error
+        }
+
+
+class RefreshReport:
+    """Per-cycle report: wall time plus per-feed timings"""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.started_at = datetime.utcnow()
+        self.wall_seconds = 0.0
+        self.timings = []
+
+    @property
+    def feeds_processed(self):
+        return sum(1 for t in self.timings if t.error is None)
+
+    @property
+    def feeds_failed(self):
+        return sum(1 for t in self.timings if t.error is not None)
+
+    @property
+    def new_articles(self):
+        return sum(t.new_articles for t in self.timings)
+
+    @property
+    def serial_seconds(self):
+        """Time the same cycle would have taken fetching one feed at a time"""
+        return sum(t.fetch_seconds + t.write_seconds for t in self.timings)
+
+    @property
+    def speedup(self):
+        if self.wall_seconds <= 0:
+            return 1.0
+        return self.serial_seconds / self.wall_seconds
+
+    def slowest(self, n=5):
+        return sorted(self.timings, key=lambda t: t.fetch_seconds, reverse=True)[:n]
+
+    def to_dict(self, include_feeds=True):
+        data = {
+            'started_at': self.started_at.isoformat(),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'serial_seconds': round(self.serial_seconds, 3),
+            'speedup': round(self.speedup, 2),
+            'max_workers': self.max_workers,
+            'feeds_processed': self.feeds_processed,
+            'feeds_failed': self.feeds_failed,
+            'new_articles': self.new_articles
+        }
+        if include_feeds:
+            data['feeds'] = [t.to_dict() for t in self.timings]
+        return data
+
+
+class RefreshEngine:
+    """
+    Runs fetch_func(job) for every job on a bounded thread pool and applies
+    each result with write_func(job, result) on the calling thread.
+
+    write_func returns the number of new articles stored for the feed.
+    At most max_workers * 2 results are held in memory at any time.
+    """
+
+    def __init__(self, fetch_func, write_func, max_workers=8):
+        self.fetch_func = fetch_func
+        self.write_func = write_func
+        self.max_workers = max(1, int(max_workers))
+
+    def _timed_fetch(self, job):
+        started = time.perf_counter()
+        try:
+            return self.fetch_func(job), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    def run(self, jobs, on_feed_done=None):
+        report = RefreshReport(self.max_workers)
+        cycle_started = time.perf_counter()
+        pending_jobs = iter(jobs)
+        in_flight = {}
+        window = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='feed-fetch') as executor:
+            def submit_next():
+                job = next(pending_jobs, None)
+                if job is not None:
+                    in_flight[executor.submit(self._timed_fetch, job)] = job
+                return job is not None
+
+            while len(in_flight) < window and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    result, error, fetch_seconds = future.result()
+
+                    timing = FeedTiming(job.feed_id, job.name)
+                    timing.fetch_seconds = fetch_seconds
+
+                    if error is not None:
+                        timing.error = str(error)
+                    else:
+                        # Single writer: only this thread touches the database
+                        write_started = time.perf_counter()
+                        try:
+                            timing.new_articles = self.write_func(job, result) or 0
+                        except Exception as e:
+                            timing.error = str(e)
+                        timing.write_seconds = time.perf_counter() - write_started
+
+                    report.timings.append(timing)
+                    if on_feed_done:
+                        on_feed_done(timing)
+
+                    submit_next()
+
+        report.wall_seconds = time.perf_counter() - cycle_started
+        return report
@@ -0,0 +1,193 @@
+"""
+Versioned response caching for RSS Reader read endpoints.
+
+A single data_version row is bumped after every commit that changes feeds,
+articles or their counters in a way clients can see; refresh bookkeeping
+(leases, schedule, validators) does not count. GET responses carry an ETag built from that
+version and the query parameters, so a client sending If-None-Match gets a
+304 while nothing has changed. Each worker keeps the version in memory for a
+few seconds, which means most revalidations never reach the database, and
+keeps recently built responses in a small LRU cache keyed by version.
+
+Other workers see a bump once their cached version expires, so their
+responses can be up to DATA_VERSION_TTL_SECONDS behind.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import inspect, text
+from sync import SYNCED_COLUMNS
+
+# Tables whose changes show up in the cached endpoints
+VERSIONED_TABLES = frozenset({'feed', 'article', 'feed_counter', 'sync_sequence', 'article_tombstone'})
+
+# For these tables only updates to the listed columns count. Leases, the
+# schedule, HTTP validators and last_fetched are written on every poll (even a
+# 304) and would otherwise invalidate every cached response each scheduler tick.
+VERSIONED_COLUMNS = {
+    'feed': frozenset(SYNCED_COLUMNS['feed']),
+    'article': frozenset(SYNCED_COLUMNS['article'] + ('word_count', 'reading_time_minutes', 'reading_time_estimated')),
+}
+
+_DML_TABLE = re.compile(r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)', re.IGNORECASE)
+_UPDATE_SET = re.compile(r'^\s*UPDATE\s+"?\w+"?\s+SET\b(.*)$', re.IGNORECASE | re.DOTALL)
+_SET_TOKENS = re.compile(r'[(),]|\b(?:WHERE|FROM|RETURNING)\b', re.IGNORECASE)
+_ASSIGNED_COLUMN = re.compile(r'^\s*"?(\w+)"?\s*=')
+
+# Versions start from the clock, so a recreated database never reissues
+# versions that clients may still be holding in ETags
+_ENSURE_ROW = text("INSERT INTO data_version (id, version) VALUES (1, :start) ON CONFLICT DO NOTHING")
+
+
+def assigned_columns(sql):
+    """Columns set by an UPDATE statement, or None when they cannot be told apart"""
+    match = _UPDATE_SET.match(sql)
+    if not match:
+        return None
+    clause = match.group(1)
+    assignments, depth, start = [], 0, 0
+    for token in _SET_TOKENS.finditer(clause):
+        if token.group() == '(':
+            depth += 1
+        elif token.group() == ')':
+            depth -= 1
+        elif depth == 0:
+            assignments.append(clause[start:token.start()])
+            if token.group() != ',':
+                break
+            start = token.end()
+    else:
+        assignments.append(clause[start:])
+    columns = set()
+    for assignment in assignments:
+        column = _ASSIGNED_COLUMN.match(assignment)
+        if not column:
+            return None
+        columns.add(column.group(1).lower())
+    return columns
+
+
+def statement_changes_data(statement, parameters=None):
+    """Whether an executed statement writes something clients see to one of VERSIONED_TABLES"""
+    if getattr(statement, 'is_dml', False):
+        table = statement.table.name
+        if not (statement.is_update and table in VERSIONED_COLUMNS):
+            return table in VERSIONED_TABLES
+        # Columns come from .values() or, for executemany updates, from the parameters
+        if isinstance(parameters, (list, tuple)):
+            parameters = parameters[0] if parameters else None
+        sql = str(statement.compile(column_keys=list(parameters) if parameters else None))
+    else:
+        sql = getattr(statement, 'text', '')
+        match = _DML_TABLE.match(sql)
+        table = match.group(1).lower() if match else None
+        if table not in VERSIONED_TABLES:
+            return False
+        if table not in VERSIONED_COLUMNS or not sql.lstrip()[:6].upper() == 'UPDATE':
+            return True
+    columns = assigned_columns(sql)
+    return columns is None or bool(columns & VERSIONED_COLUMNS[table])
+
+
+def object_changes_data(obj, is_new_or_deleted):
+    """Whether a flushed ORM object changes something clients see in one of VERSIONED_TABLES"""
+    table = obj.__table__.name
+    if table not in VERSIONED_TABLES:
+        return False
+    if is_new_or_deleted or table not in VERSIONED_COLUMNS:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in VERSIONED_COLUMNS[table])
+
+
+def _ensure_row(conn):
+    conn.execute(_ENSURE_ROW, {'start': int(time.time() * 1000)})
+
+
+def read_data_version(conn):
+    version = conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+    if version is None:
+        _ensure_row(conn)
+        version = conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+    return version
+
+
+def bump_data_version(conn):
+    """Increment the data version; returns the new value"""
+    _ensure_row(conn)
+    conn.execute(text("UPDATE data_version SET version = version + 1 WHERE id = 1"))
+    return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+
+
+class VersionCache:
+    """The data version per database, remembered for ttl seconds"""
+
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, load):
+        with self._lock:
+            cached = self._versions.get(key)
+        if cached and self._clock() - cached[1] < self.ttl:
+            return cached[0]
+        version = load()
+        self.set(key, version)
+        return version
+
+    def set(self, key, version):
+        with self._lock:
+            self._versions[key] = (version, self._clock())
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+
+class ResponseCache:
+    """Bounded LRU of built response bodies"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def make_etag(version, path, args):
+    """ETag value for a path and its query parameters at a data version; parameter order does not matter"""
+    params = '&'.join(f'{name}={value}' for name, value in sorted(args))
+    digest = hashlib.sha1(f'{path}?{params}'.encode()).hexdigest()[:16]
+    return f'v{version}-{digest}'
@@ -0,0 +1,105 @@
+"""
+JSON encoding and compression for RSS Reader API responses.
+
+Responses are serialized by a pluggable JSON provider: orjson when it is
+installed (several times faster than the stdlib encoder), otherwise the
+stdlib encoder. Both write datetimes as ISO 8601, so views can return
+datetime objects instead of calling .isoformat() per field.
+
+Bodies above a size threshold are compressed with brotli or gzip,
+whichever the client accepts; brotli is only offered when the brotli
+package is installed.
+"""
+
+import gzip
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib provider, but with ISO 8601 datetimes instead of HTTP dates"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """JSON provider backed by orjson; loads and anything orjson cannot encode fall back to the stdlib"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def _encode(self, obj):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=IsoJSONProvider.default, option=option)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
+
+
+def json_provider_class(name):
+    """The provider for JSON_ENCODER: 'orjson', 'stdlib', or 'auto' (orjson when installed)"""
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_ENCODER=orjson but orjson is not installed")
+    if name == 'orjson' or (name == 'auto' and orjson is not None):
+        return OrjsonProvider
+    return IsoJSONProvider
+
+
+def choose_encoding(accept_encodings):
+    """'br', 'gzip' or None for a request's Accept-Encoding header"""
+    if brotli is not None and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_body(body, encoding, level):
+    """level is the gzip compresslevel (1-9), and the brotli quality"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=level, mode=brotli.MODE_TEXT)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_response(response, accept_encodings, min_bytes, level):
+    """Compress a buffered response in place when it is worth it and the client accepts it"""
+    response.vary.add('Accept-Encoding')
+    if (
+        response.status_code < 200 or response.status_code in (204, 304)
+        or response.direct_passthrough or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compress_body(body, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,91 @@
+"""
+Full-text article search for RSS Reader.
+
+PostgreSQL: a generated tsvector column on article (title weighted above the
+description) with a GIN index, queried with websearch_to_tsquery and ranked
+with ts_rank_cd. SQLite: an external-content FTS5 table kept in step with
+article by triggers, ranked with bm25. Both indexes are created by
+migrations.py and maintained by the database itself, so bulk ingestion
+needs no extra work.
+
+Results are ordered by rank, then id, and paged with the same opaque
+cursors as the article lists.
+"""
+
+from sqlalchemy import Float, and_, func, literal_column, or_, table, column
+from pagination import decode_cursor, encode_cursor
+
+SEARCH_CONFIG = 'english'
+
+# bm25 weight of title matches on SQLite; on PostgreSQL the title is weight A, the description B
+TITLE_WEIGHT = 10.0
+
+MAX_QUERY_CHARS = 200
+
+POSTGRESQL_DDL = [
+    f"""ALTER TABLE article ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED""",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+    "title, description, content='article', content_rowid='id', tokenize='porter unicode61')",
+    f"INSERT INTO article_fts(article_fts, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, 1.0)')",
+    """CREATE TRIGGER IF NOT EXISTS article_fts_insert AFTER INSERT ON article BEGIN
+        INSERT INTO article_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fts_delete AFTER DELETE ON article BEGIN
+        INSERT INTO article_fts(article_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fts_update AFTER UPDATE OF title, description ON article BEGIN
+        INSERT INTO article_fts(article_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO article_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    # Index whatever was stored before the table existed
+    "INSERT INTO article_fts(article_fts) VALUES ('rebuild')",
+]
+
+_fts = table('article_fts', column('rowid'), column('rank'))
+
+
+def fts5_query(text):
+    """Quote every term so user input is matched literally (FTS5 has its own query syntax)"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def apply_search(query, article_id, dialect, text):
+    """Restrict an article query to matches of text. Returns (query, rank); a higher rank is a better match."""
+    text = text[:MAX_QUERY_CHARS]
+    if dialect == 'postgresql':
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+        vector = literal_column('article.search_vector')
+        # float4 ranks would not survive the round trip through a cursor exactly
+        return query.filter(vector.op('@@')(tsquery)), func.ts_rank_cd(vector, tsquery).cast(Float(precision=53))
+
+    query = query.join(_fts, _fts.c.rowid == article_id).filter(
+        literal_column('article_fts').op('MATCH')(fts5_query(text))
+    )
+    # bm25 is lower for better matches
+    return query, -_fts.c.rank
+
+
+def search_page(query, rank, article_id, cursor, limit):
+    """
+    One page of ranked matches, best first. Returns (articles, next_cursor);
+    next_cursor is None on the last page.
+    """
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor)
+        query = query.filter(or_(rank < last_rank, and_(rank == last_rank, article_id < last_id)))
+
+    rows = query.add_columns(rank).order_by(rank.desc(), article_id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_article, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_article.id)
+    return [article for article, _ in rows], next_cursor
@@ -1,9 +1,35 @@
 import pytest
 import tempfile
 import os
+import app as app_module
 from app import app, db
 from datetime import datetime
 
+def empty_database():
+    """Drop every table; the engine is created once per process, so a new database URL per test never takes effect"""
+    db.session.remove()
+    db.engine.dispose()
+    if db.engine.dialect.name == 'sqlite':
+        if db.engine.url.database and os.path.exists(db.engine.url.database):
+            os.unlink(db.engine.url.database)
+    else:
+        with db.engine.begin() as conn:
+            conn.execute(db.text('DROP SCHEMA public CASCADE'))
+            conn.execute(db.text('CREATE SCHEMA public'))
+
+@pytest.fixture(autouse=True)
+def reset_module_caches():
+    """Every test gets a fresh database that reuses feed and article ids; nothing cached may outlive a test."""
+    app_module.recent_links.forget()
+    app_module.prefetch_queue.clear()
+    app_module.summary_queue.clear()
+    app_module.discovery_cache.clear()
+    app_module.feed_search_cache.clear()
+    app_module.data_versions.clear()
+    app_module.response_cache.clear()
+    app_module.last_refresh_report = None
+    yield
+
 @pytest.fixture
 def client():
     """Create a test client for the Flask application."""
@@ -21,6 +47,7 @@ def client():
     
     with app.test_client() as client:
         with app.app_context():
+            empty_database()
             db.create_all()
             yield client
     
@@ -45,6 +72,7 @@ def app_context():
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
     with app.app_context():
+        empty_database()
         db.create_all()
         yield app
     
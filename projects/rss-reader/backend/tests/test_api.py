@@ -1,7 +1,9 @@
 import pytest
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from app import db, Feed, Article
+from feed_onboarding import Page
+from tests.test_refresh import SAMPLE_RSS
 
 class TestFeedAPI:
     """Test cases for feed-related API endpoints."""
@@ -27,13 +29,11 @@ class TestFeedAPI:
         assert data[0]['name'] == 'Test Feed'
         assert data[0]['url'] == 'https://example.com/rss.xml'
     
-    @patch('app.feedparser.parse')
-    def test_add_feed_success(self, mock_parse, client):
+    @patch('feed_onboarding.fetch_page')
+    def test_add_feed_success(self, mock_fetch, client):
         """Test successfully adding a new feed."""
-        # Mock feedparser to return valid RSS data
-        mock_feed = MagicMock()
-        mock_feed.entries = [MagicMock()]
-        mock_parse.return_value = mock_feed
+        # Serve valid RSS data instead of downloading it
+        mock_fetch.return_value = Page('https://example.com/rss.xml', SAMPLE_RSS.encode(), 'application/rss+xml')
         
         feed_data = {
             'name': 'Test Feed',
@@ -0,0 +1,93 @@
+import feedparser
+from sqlalchemy import event
+from app import db, Feed, Article, store_feed_articles
+from ingest import make_excerpt, EXCERPT_CHARS
+
+LONG_HTML = '<div><p>' + 'Lorem ipsum dolor sit amet. ' * 40 + '</p><img src="x.png"><script>track()</script></div>'
+
+FEED_WITH_HTML = f"""<?xml version="1.0"?>
+<rss version="2.0">
+  <channel>
+    <title>Html Feed</title>
+    <item>
+      <title>Rich Post</title>
+      <link>https://example.com/rich</link>
+      <description><![CDATA[{LONG_HTML}]]></description>
+    </item>
+  </channel>
+</rss>"""
+
+def add_feed_with_article():
+    feed = Feed(name='Html Feed', url='https://example.com/rss.xml', category='Technology')
+    db.session.add(feed)
+    db.session.commit()
+    store_feed_articles(feed, feedparser.parse(FEED_WITH_HTML))
+    return feed
+
+class TestExcerpts:
+    """Test cases for plain text excerpts."""
+
+    def test_excerpt_is_plain_bounded_text(self):
+        """Test that markup, scripts and entities are removed and long text is cut at a word."""
+        assert make_excerpt('<p>Fish &amp; <b>chips</b></p><p>Peas</p>') == 'Fish & chips Peas'
+        assert make_excerpt('') == ''
+
+        excerpt = make_excerpt(LONG_HTML)
+        assert len(excerpt) <= EXCERPT_CHARS
+        assert excerpt.endswith('…')
+        assert 'track' not in excerpt and '<' not in excerpt
+        assert excerpt[:-1].split()[-1] in ('Lorem', 'ipsum', 'dolor', 'sit', 'amet')
+
+    def test_excerpt_is_stored_at_ingestion(self, app_context):
+        """Test that new articles get their excerpt when they are stored."""
+        add_feed_with_article()
+        article = Article.query.one()
+        assert article.excerpt == make_excerpt(LONG_HTML)
+
+class TestFieldProjection:
+    """Test cases for ?fields= and the per-article endpoint."""
+
+    def test_lists_send_the_excerpt_not_the_description(self, client):
+        """Test the default list payload, and that the description column is not even selected."""
+        add_feed_with_article()
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            article = client.get('/api/articles').get_json()['articles'][0]
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert 'description' not in article
+        assert article['excerpt'].startswith('Lorem ipsum')
+        assert article['feed_name'] == 'Html Feed'
+        assert not any('article.description' in statement for statement in statements)
+
+    def test_fields_parameter(self, client):
+        """Test picking fields on both list endpoints, and rejecting unknown ones."""
+        add_feed_with_article()
+        Article.query.one().is_bookmarked = True
+        db.session.commit()
+
+        article = client.get('/api/articles?fields=title,is_read').get_json()['articles'][0]
+        assert set(article) == {'id', 'title', 'is_read'}
+
+        bookmark = client.get('/api/articles/bookmarked?fields=description').get_json()['articles'][0]
+        assert bookmark['description'].startswith('<div>')
+
+        response = client.get('/api/articles?fields=title,password')
+        assert response.status_code == 400
+        assert 'password' in response.get_json()['error']
+
+    def test_full_article(self, client):
+        """Test that one article can be fetched with its full description."""
+        add_feed_with_article()
+        article_id = Article.query.one().id
+
+        article = client.get(f'/api/articles/{article_id}').get_json()
+        assert article['description'] == Article.query.one().description
+        assert article['title'] == 'Rich Post'
+        assert client.get('/api/articles/999999').status_code == 404
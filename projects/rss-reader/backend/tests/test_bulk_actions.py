@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app import db, Feed, Article, FeedCounter
+
+def counts(feed):
+    counter = db.session.get(FeedCounter, feed.id)
+    db.session.refresh(counter)
+    return counter.total, counter.unread, counter.bookmarked
+
+def add_feed(name, category='General', count=4):
+    feed = Feed(name=name, url=f'https://example.com/{name}.xml', category=category)
+    db.session.add(feed)
+    db.session.commit()
+    start = datetime(2024, 1, 1)
+    db.session.add_all([
+        Article(feed_id=feed.id, title=f'{name} {i}', link=f'/{name}/{i}', published_date=start + timedelta(days=i))
+        for i in range(count)
+    ])
+    db.session.commit()
+    return feed
+
+def bulk(client, **data):
+    return client.post('/api/articles/bulk', json=data)
+
+class TestBulkActions:
+    """Test cases for bulk read and bookmark updates."""
+
+    def test_ids_in_one_update_with_counters(self, client):
+        """Test that a list of ids is updated by a single statement and counted once."""
+        feed = add_feed('tech')
+        ids = [a.id for a in Article.query.limit(3)]
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            if statement.startswith('UPDATE article'):
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            data = bulk(client, action='read', ids=ids).get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert data['updated'] == 3
+        assert data['feeds'] == {str(feed.id): 3}
+        assert len(statements) == 1
+        assert counts(feed) == (4, 1, 0)
+
+        # Already read articles are not counted twice
+        assert bulk(client, action='read', ids=ids).get_json()['updated'] == 0
+        assert counts(feed) == (4, 1, 0)
+
+    def test_feed_category_and_all_filters(self, client):
+        """Test marking a feed, a category, then everything."""
+        tech = add_feed('tech', 'Technology')
+        news = add_feed('news', 'News')
+        sport = add_feed('sport', 'News')
+
+        assert bulk(client, action='read', feed_id=tech.id).get_json()['updated'] == 4
+        assert bulk(client, action='read', category='News').get_json()['updated'] == 8
+        assert bulk(client, action='unread', all=True).get_json()['updated'] == 12
+        assert [counts(feed)[1] for feed in (tech, news, sport)] == [4, 4, 4]
+
+        stats = client.get('/api/stats').get_json()
+        assert stats['unread_articles'] == 12
+
+    def test_before_and_cursor_filters(self, client):
+        """Test marking everything older than a timestamp, and everything up to a list cursor."""
+        feed = add_feed('tech', count=6)
+
+        data = bulk(client, action='read', before='2024-01-03T00:00:00').get_json()
+        assert data['updated'] == 2
+
+        first_page = client.get('/api/articles?per_page=2').get_json()
+        data = bulk(client, action='read', cursor=first_page['next_cursor']).get_json()
+        assert data['updated'] == 2
+        assert counts(feed) == (6, 2, 0)
+        unread = sorted(a.title for a in Article.query.filter_by(is_read=False))
+        assert unread == ['tech 2', 'tech 3']
+
+    def test_before_with_a_utc_offset(self, client):
+        """Test that a timestamp with an offset is compared in UTC."""
+        feed = add_feed('tech', count=6)
+
+        # 01:00 on January 3 in UTC, 23:00 on January 2 if the offset were dropped
+        assert bulk(client, action='read', before='2024-01-02T23:00:00-02:00').get_json()['updated'] == 3
+        # 23:30 on January 3 in UTC, past the January 4 article if the offset were dropped
+        assert bulk(client, action='read', before='2024-01-04T00:30:00+01:00').get_json()['updated'] == 0
+        assert counts(feed) == (6, 3, 0)
+
+    def test_bookmark_and_unbookmark(self, client):
+        """Test that bookmark counts and the bookmarks listing follow bulk changes."""
+        feed = add_feed('tech')
+        ids = [a.id for a in Article.query]
+
+        assert bulk(client, action='bookmark', ids=ids[:3]).get_json()['updated'] == 3
+        assert bulk(client, action='unbookmark', ids=ids[:1]).get_json()['updated'] == 1
+        assert counts(feed) == (4, 4, 2)
+        assert client.get('/api/articles/bookmarked').get_json()['total'] == 2
+
+    def test_rejects_unfiltered_and_invalid_requests(self, client):
+        """Test that a bulk request must say what it applies to."""
+        add_feed('tech')
+
+        assert bulk(client, action='read').status_code == 400
+        assert bulk(client, action='delete', all=True).status_code == 400
+        assert bulk(client, action='read', before='yesterday').status_code == 400
+        assert bulk(client, action='read', cursor='not-a-cursor').status_code == 400
+        assert Article.query.filter_by(is_read=True).count() == 0
@@ -0,0 +1,131 @@
+import requests
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from app import db, Feed, Article, ArticleContent, prefetch_article_content, prefetch_queue
+from content_store import PrefetchQueue, compress_text, decompress_text, evict_article_content, OK, FAILED
+
+def add_articles(count, **kwargs):
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    articles = [Article(feed_id=feed.id, title=f'Article {i}', link=f'https://example.com/{i}', **kwargs)
+                for i in range(count)]
+    db.session.add_all(articles)
+    db.session.commit()
+    return articles
+
+def mock_openai_response():
+    response = MagicMock()
+    response.choices[0].message.content = 'A short summary.'
+    return response
+
+class TestContentStoreHelpers:
+    """Test cases for compression and the prefetch queue."""
+
+    def test_compression_round_trip(self):
+        """Test that text survives compression and shrinks."""
+        value = 'the quick brown fox ' * 500
+        compressed = compress_text(value)
+        assert len(compressed) < len(value) / 10
+        assert decompress_text(compressed) == value
+
+    def test_queue_deduplicates(self):
+        """Test that an article is queued once."""
+        queue = PrefetchQueue(max_size=3)
+        queue.push([1, 2, 1, 3, 4])
+        assert queue.pop_batch(10) == [2, 3, 4]
+
+class TestSharedContent:
+    """Test cases for summaries and reading times sharing one fetch."""
+
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    @patch('summaries.openai.ChatCompletion.create')
+    @patch('app.fetch_article_text', return_value='word ' * 1000)
+    def test_summary_after_reading_time_skips_network(self, mock_fetch, mock_openai, client):
+        """Test that the page fetched for the reading time is reused by the summary."""
+        mock_openai.return_value = mock_openai_response()
+        article = add_articles(1)[0]
+
+        reading = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+        summary = client.post(f'/api/articles/{article.id}/summarize').get_json()
+
+        assert reading['reading_time'] == '5 min read'
+        assert summary['summary'] == 'A short summary.'
+        assert mock_fetch.call_count == 1
+        prompt = mock_openai.call_args.kwargs['messages'][1]['content']
+        assert 'word word' in prompt
+
+    @patch('app.fetch_article_text', side_effect=requests.ConnectionError('blocked'))
+    def test_failed_pages_are_not_retried_immediately(self, mock_fetch, client):
+        """Test that a blocked page is remembered instead of fetched on every request."""
+        article = add_articles(1, description='word ' * 300)[0]
+
+        first = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+        db.session.query(Article).update({'reading_time_minutes': None})
+        db.session.commit()
+        second = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+
+        assert first['estimated'] and second['estimated']
+        assert mock_fetch.call_count == 1
+        assert db.session.get(ArticleContent, article.id).status == FAILED
+
+class TestPrefetch:
+    """Test cases for the background content prefetch."""
+
+    @patch('app.fetch_article_text', return_value='word ' * 400)
+    def test_prefetches_unread_articles(self, mock_fetch, app_context):
+        """Test that unread articles are stored and read ones are left alone."""
+        unread = add_articles(2)
+        read = Article(feed_id=unread[0].feed_id, title='Read', link='https://example.com/read', is_read=True)
+        db.session.add(read)
+        db.session.commit()
+
+        prefetch_article_content()
+
+        stored = {content.article_id: content for content in ArticleContent.query.all()}
+        assert set(stored) == {a.id for a in unread}
+        assert all(content.status == OK for content in stored.values())
+        assert [a.reading_time_minutes for a in Article.query.filter_by(is_read=False)] == [2, 2]
+        assert mock_fetch.call_count == 2
+
+        # Everything is cached now, so a second pass downloads nothing
+        prefetch_article_content()
+        assert mock_fetch.call_count == 2
+
+    @patch('app.fetch_article_text')
+    def test_queued_articles_in_store_get_reading_times(self, mock_fetch, app_context):
+        """Test that stored text is reused instead of downloaded again."""
+        article = add_articles(1, is_read=True)[0]
+        compressed = compress_text('word ' * 800)
+        db.session.add(ArticleContent(article_id=article.id, status=OK, text_compressed=compressed,
+                                      size_bytes=len(compressed)))
+        db.session.commit()
+
+        prefetch_queue.push([article.id])
+        prefetch_article_content()
+
+        db.session.refresh(article)
+        assert article.reading_time_minutes == 4
+        mock_fetch.assert_not_called()
+
+class TestEviction:
+    """Test cases for the content store size cap and expiry."""
+
+    def test_evicts_expired_then_least_recently_used(self, app_context):
+        """Test that old entries go first and the store shrinks below its cap."""
+        articles = add_articles(5)
+        now = datetime.utcnow()
+        for i, article in enumerate(articles):
+            db.session.add(ArticleContent(
+                article_id=article.id, status=OK, text_compressed=b'x' * 100, size_bytes=100,
+                fetched_at=now - timedelta(days=40 if i == 0 else 1),
+                last_accessed_at=now - timedelta(hours=10 - i)
+            ))
+        db.session.commit()
+
+        evicted = evict_article_content(db.session, now, max_bytes=300, max_age_days=30)
+
+        remaining = sorted(content.article_id for content in ArticleContent.query.all())
+        # The expired entry, then least recently used ones until 90% of the cap (270 bytes) is met
+        assert evicted == 3
+        assert remaining == [articles[3].id, articles[4].id]
@@ -0,0 +1,127 @@
+import feedparser
+from app import db, Feed, Article, FeedCounter, store_feed_articles, repair_feed_counters
+from sqlalchemy import event
+from counters import uncount_articles, recompute_counters
+from tests.test_refresh import SAMPLE_RSS
+
+def counts(feed):
+    counter = db.session.get(FeedCounter, feed.id)
+    db.session.refresh(counter)
+    return counter.total, counter.unread, counter.bookmarked
+
+def add_feed_with_articles(name='Feed', category='General', read=0, unread=0):
+    feed = Feed(name=name, url=f'https://example.com/{name}.xml', category=category)
+    db.session.add(feed)
+    db.session.commit()
+    db.session.add_all(
+        [Article(feed_id=feed.id, title=f'Read {i}', link=f'/{name}/read/{i}', is_read=True) for i in range(read)]
+        + [Article(feed_id=feed.id, title=f'Unread {i}', link=f'/{name}/unread/{i}') for i in range(unread)]
+    )
+    db.session.commit()
+    return feed
+
+class TestIncrementalCounters:
+    """Test cases for counters kept in step with article writes."""
+
+    def test_orm_and_bulk_inserts_are_counted(self, app_context):
+        """Test that both ORM adds and bulk ingestion update the counters."""
+        feed = add_feed_with_articles(read=1, unread=2)
+        assert counts(feed) == (3, 2, 0)
+
+        store_feed_articles(feed, feedparser.parse(SAMPLE_RSS))
+        assert counts(feed) == (5, 4, 0)
+
+    def test_read_unread_and_bookmark_endpoints(self, client):
+        """Test that flag changes move counts, and repeated requests do not double count."""
+        feed = add_feed_with_articles(unread=2)
+        article_id = Article.query.first().id
+
+        client.put(f'/api/articles/{article_id}/read')
+        client.put(f'/api/articles/{article_id}/read')
+        assert counts(feed) == (2, 1, 0)
+
+        client.put(f'/api/articles/{article_id}/bookmark')
+        client.put(f'/api/articles/{article_id}/unread')
+        assert counts(feed) == (2, 2, 1)
+
+        article = db.session.get(Article, article_id)
+        db.session.delete(article)
+        db.session.commit()
+        assert counts(feed) == (1, 1, 0)
+
+    def test_cleanup_uncounts_deleted_articles(self, app_context):
+        """Test that the cleanup script's bulk deletes are subtracted."""
+        feed = add_feed_with_articles(read=2, unread=1)
+        where = "is_read = :read"
+
+        uncount_articles(db.session, where, {'read': True})
+        db.session.execute(db.text(f"DELETE FROM article WHERE {where}"), {'read': True})
+        db.session.commit()
+
+        assert counts(feed) == (1, 1, 0)
+
+class TestCounterEndpoints:
+    """Test cases for /api/feeds and /api/stats served from counters."""
+
+    def test_feeds_and_stats_rollups(self, client):
+        """Test per-feed counts and category/global rollups, including deactivated feeds."""
+        add_feed_with_articles('tech', 'Technology', read=2, unread=1)
+        add_feed_with_articles('news', 'News', unread=3)
+        gone = add_feed_with_articles('gone', 'News', unread=4)
+        Article.query.filter_by(feed_id=gone.id).first().is_bookmarked = True
+        db.session.commit()
+        client.delete(f'/api/feeds/{gone.id}')
+
+        feeds = {f['name']: f for f in client.get('/api/feeds').get_json()}
+        assert set(feeds) == {'tech', 'news'}
+        assert (feeds['tech']['article_count'], feeds['tech']['unread_count']) == (3, 1)
+
+        stats = client.get('/api/stats').get_json()
+        assert stats['total_feeds'] == 2
+        assert stats['total_articles'] == 6
+        assert stats['unread_articles'] == 4
+        assert stats['read_articles'] == 2
+        # Bookmarks stay visible after their feed is removed
+        assert stats['bookmarked_articles'] == 1
+        assert stats['categories']['Technology'] == {'feeds': 1, 'total': 3, 'unread': 1, 'bookmarked': 0}
+        assert stats['categories']['News']['total'] == 3
+
+class TestCounterRepair:
+    """Test cases for the counter repair job."""
+
+    def test_repair_fixes_drift_and_fills_missing_rows(self, app_context):
+        """Test that counters are recomputed from the article table."""
+        feed = add_feed_with_articles(read=1, unread=1)
+        db.session.execute(db.text("UPDATE feed_counter SET total = 99, unread = 0"))
+        db.session.commit()
+
+        repair_feed_counters()
+        assert counts(feed) == (2, 1, 0)
+
+        db.session.execute(db.text("DELETE FROM feed_counter"))
+        db.session.commit()
+        repair_feed_counters()
+        assert counts(feed) == (2, 1, 0)
+
+    def test_repair_recounts_inside_one_update(self, app_context):
+        """Test that counts are not read first and written back later, where they could overwrite an increment."""
+        drifted = add_feed_with_articles(name='drifted', read=1, unread=2)
+        correct = add_feed_with_articles(name='correct', unread=1)
+        db.session.execute(db.text("UPDATE feed_counter SET unread = 0 WHERE feed_id = :id"), {'id': drifted.id})
+        db.session.commit()
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(' '.join(statement.split()))
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            fixed = recompute_counters(db.session, FeedCounter.__table__, [drifted.id, correct.id])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert fixed == 1
+        assert counts(drifted) == (3, 2, 0)
+        assert counts(correct) == (1, 1, 0)
+        assert not any(s.startswith('SELECT') and 'FROM article' in s for s in statements)
+        assert len([s for s in statements if s.startswith('UPDATE feed_counter')]) == 1
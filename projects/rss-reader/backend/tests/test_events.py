@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+import feedparser
+from unittest.mock import patch
+from app import app, db, Feed, Article, store_feed_articles
+from events import parse_event_id, HoldSlots
+from config import Config
+from tests.test_refresh import SAMPLE_RSS
+
+def parse_stream(body):
+    """[(event, data)] and the last id from an SSE body"""
+    events, last_id = [], None
+    for message in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n') if line)
+        if 'id' in fields:
+            last_id = fields['id']
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events, last_id
+
+def connect(client, last_event_id=None):
+    headers = {'Last-Event-ID': last_event_id} if last_event_id else {}
+    response = client.get('/api/events', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    return response.get_data(as_text=True)
+
+def add_feed():
+    feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    return feed
+
+class TestArticleEvents:
+    """Test cases for the /api/events stream."""
+
+    def test_new_articles_are_announced_once(self, client):
+        """Test ready, then an articles event after ingestion, then nothing until the next change."""
+        feed = add_feed()
+        events, ready_id = parse_stream(connect(client))
+        assert [event for event, _ in events] == ['ready']
+
+        store_feed_articles(feed, feedparser.parse(SAMPLE_RSS))
+
+        body = connect(client, ready_id)
+        events, next_id = parse_stream(body)
+        assert 'retry: ' in body
+        assert events[0] == ('articles', {'count': 2, 'feeds': {str(feed.id): 2}, 'max_id': Article.query.count()})
+        assert events[1][0] == 'counters'
+        assert parse_event_id(next_id)[1] == events[0][1]['max_id']
+
+        assert parse_stream(connect(client, next_id)) == ([], None)
+
+    def test_clients_fetch_only_the_delta(self, client):
+        """Test that since_id returns just the articles newer than the client's last one."""
+        feed = add_feed()
+        _, ready_id = parse_stream(connect(client))
+        store_feed_articles(feed, feedparser.parse(SAMPLE_RSS))
+
+        articles = client.get(f'/api/articles?since_id={parse_event_id(ready_id)[1]}').get_json()['articles']
+        assert sorted(a['title'] for a in articles) == ['First Post', 'Second Post']
+        newest = max(a['id'] for a in articles)
+        assert client.get(f'/api/articles?since_id={newest}').get_json()['articles'] == []
+
+    @patch.object(Config, 'EVENTS_HOLD_SECONDS', 10)
+    def test_held_request_wakes_on_commit(self, client):
+        """Test that a held request answers as soon as this worker commits a change."""
+        feed = add_feed()
+        _, ready_id = parse_stream(connect(client))
+
+        def ingest_later():
+            time.sleep(0.5)
+            with app.app_context():
+                store_feed_articles(db.session.get(Feed, feed.id), feedparser.parse(SAMPLE_RSS))
+
+        writer = threading.Thread(target=ingest_later)
+        started = time.monotonic()
+        writer.start()
+        events, _ = parse_stream(connect(client, ready_id))
+        writer.join()
+
+        assert time.monotonic() - started < 8
+        assert events[0][0] == 'articles'
+
+    @patch.object(Config, 'EVENTS_HOLD_SECONDS', 10)
+    def test_requests_beyond_the_hold_limit_answer_immediately(self, client):
+        """Test that when every hold slot is taken, requests do not wait."""
+        add_feed()
+        _, ready_id = parse_stream(connect(client))
+
+        with patch('app.event_hold_slots', HoldSlots(0)):
+            started = time.monotonic()
+            assert parse_stream(connect(client, ready_id)) == ([], None)
+            assert time.monotonic() - started < 5
+
+    def test_malformed_event_id_starts_over(self, client):
+        """Test that a bad Last-Event-ID is treated as a new connection."""
+        events, _ = parse_stream(connect(client, 'garbage'))
+        assert [event for event, _ in events] == ['ready']
@@ -0,0 +1,53 @@
+from extraction import extract_main_text, MAX_CONTENT_CHARS
+
+ARTICLE_BODY = ''.join(
+    f'<p>Paragraph {i} of the story, with enough words, commas, and detail to count as prose.</p>'
+    for i in range(20)
+)
+
+NEWS_PAGE = f"""<html><head><title>News</title><script>var tracking = 'x';</script></head>
+<body>
+  <header><h1>Daily Example</h1></header>
+  <nav><ul><li><a href="/">Home</a></li><li><a href="/world">World</a></li></ul></nav>
+  <div class="layout">
+    <div class="sidebar">
+      <p>Sign up for our newsletter, offers, deals, and much more every single day.</p>
+      <ul><li><a href="/a">A related link with a long enough title to score</a></li></ul>
+    </div>
+    <div id="story-body" class="article-content">{ARTICLE_BODY}</div>
+    <div class="comments"><p>First comment, this is great, thanks for writing it.</p></div>
+  </div>
+  <footer><p>Copyright Example Media, all rights reserved, since 1999.</p></footer>
+</body></html>"""
+
+class TestExtraction:
+    """Test cases for the lxml main-content extraction."""
+
+    def test_picks_article_body_over_boilerplate(self):
+        """Test that the story is extracted and navigation, sidebars and comments are not."""
+        text = extract_main_text(NEWS_PAGE.encode('utf-8'))
+
+        assert text.startswith('Paragraph 0 of the story')
+        assert 'Paragraph 19' in text
+        for boilerplate in ('Home', 'newsletter', 'First comment', 'Copyright', 'tracking'):
+            assert boilerplate not in text
+
+    def test_link_heavy_blocks_lose(self):
+        """Test that a list of links does not beat a shorter block of prose."""
+        links = ''.join(f'<li><a href="/{i}">Another headline that is long enough to count</a></li>' for i in range(30))
+        page = f'<html><body><ul class="list">{links}</ul><div>{ARTICLE_BODY[:600]}</div></body></html>'
+
+        assert extract_main_text(page).startswith('Paragraph 0')
+
+    def test_pages_without_paragraphs_fall_back_to_article(self):
+        """Test the fallback for pages that do not use paragraph tags."""
+        page = '<html><body><div>menu</div><article>' + 'word ' * 50 + '</article></body></html>'
+        assert extract_main_text(page) == ' '.join(['word'] * 50)
+
+    def test_empty_and_oversized_pages(self):
+        """Test that empty input is handled and output is capped."""
+        assert extract_main_text(b'') == ''
+        assert extract_main_text('<html><body>   </body></html>') == ''
+
+        huge = '<html><body><article>' + 'word ' * 20000 + '</article></body></html>'
+        assert len(extract_main_text(huge)) <= MAX_CONTENT_CHARS
@@ -0,0 +1,87 @@
+import pytest
+import hashlib
+from unittest.mock import patch, MagicMock
+from app import db, Feed, Article, fetch_feed_articles
+from feed_fetcher import conditional_fetch, fetch_counters, PARSED, NOT_MODIFIED, UNCHANGED
+from tests.test_refresh import SAMPLE_RSS
+
+def make_response(status_code=200, body=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = body
+    response.headers = headers or {}
+    return response
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    fetch_counters.reset()
+
+class TestConditionalFetch:
+    """Test cases for conditional feed downloads."""
+
+    @patch('feed_fetcher.http_session.get')
+    def test_sends_validators(self, mock_get):
+        """Test that stored validators are sent as conditional headers."""
+        mock_get.return_value = make_response(304)
+
+        download = conditional_fetch('https://example.com/rss.xml', etag='"abc"',
+                                     last_modified='Mon, 02 Oct 2023 10:00:00 GMT')
+
+        headers = mock_get.call_args.kwargs['headers']
+        assert headers['If-None-Match'] == '"abc"'
+        assert headers['If-Modified-Since'] == 'Mon, 02 Oct 2023 10:00:00 GMT'
+        assert download.status == NOT_MODIFIED
+        assert download.parsed_feed is None
+        assert download.etag == '"abc"'
+
+    @patch('feed_parsing.feedparser.parse')
+    @patch('feed_fetcher.http_session.get')
+    def test_identical_body_skips_parsing(self, mock_get, mock_parse):
+        """Test that a body matching the stored hash is never parsed."""
+        body = SAMPLE_RSS.encode()
+        mock_get.return_value = make_response(200, body)
+
+        download = conditional_fetch('https://example.com/rss.xml',
+                                     content_hash=hashlib.sha256(body).hexdigest())
+
+        assert download.status == UNCHANGED
+        mock_parse.assert_not_called()
+
+    @patch('feed_fetcher.http_session.get')
+    def test_changed_body_is_parsed_and_counted(self, mock_get):
+        """Test that new content is parsed and the counters track the outcomes."""
+        mock_get.return_value = make_response(200, SAMPLE_RSS.encode(), {'ETag': '"v2"'})
+        download = conditional_fetch('https://example.com/rss.xml', content_hash='stale')
+
+        mock_get.return_value = make_response(304)
+        conditional_fetch('https://example.com/rss.xml', etag='"v2"')
+
+        assert download.status == PARSED
+        assert len(download.parsed_feed.entries) == 2
+        assert download.etag == '"v2"'
+        assert fetch_counters.to_dict() == {
+            'parsed': 1, 'skipped': 1, 'not_modified': 1, 'unchanged': 0, 'errors': 0
+        }
+
+class TestFetchFeedArticles:
+    """Test cases for storing conditional downloads."""
+
+    @patch('feed_fetcher.http_session.get')
+    def test_not_modified_feed_skips_entry_work(self, mock_get, app_context):
+        """Test that a 304 only touches the feed's fetch metadata."""
+        mock_get.return_value = make_response(200, SAMPLE_RSS.encode(), {'ETag': '"v1"'})
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+
+        assert fetch_feed_articles(feed.id) == 2
+        assert feed.etag == '"v1"'
+        assert feed.content_hash is not None
+
+        mock_get.return_value = make_response(304)
+        with patch('app.store_feed_articles') as mock_store:
+            assert fetch_feed_articles(feed.id) == 0
+            mock_store.assert_not_called()
+
+        assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+        assert Article.query.filter_by(feed_id=feed.id).count() == 2
@@ -0,0 +1,80 @@
+import feedparser
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app import db, Feed, refresh_all_feeds
+from feed_fetcher import FeedDownload, PARSED
+from feed_leases import claim_due_feeds, WORKER_ID
+from tests.test_refresh import SAMPLE_RSS
+
+def add_feeds(count):
+    feeds = [Feed(name=f'Feed {i}', url=f'https://example.com/{i}.xml') for i in range(count)]
+    db.session.add_all(feeds)
+    db.session.commit()
+    return feeds
+
+def claim(worker_id, now, limit=2):
+    return claim_due_feeds(db.session, now=now, due_before=now, lease_seconds=300,
+                           limit=limit, worker_id=worker_id)
+
+class TestFeedLeases:
+    """Test cases for per-feed refresh leases."""
+
+    def test_workers_claim_disjoint_batches(self, app_context):
+        """Test that concurrent workers split the due feeds between them."""
+        add_feeds(5)
+        now = datetime.utcnow()
+
+        first = claim('node-a:1', now)
+        second = claim('node-b:1', now)
+        third = claim('node-a:1', now)
+        leftover = claim('node-b:1', now)
+
+        claimed = [row.id for row in first + second + third]
+        assert len(first) == 2 and len(second) == 2 and len(third) == 1
+        assert len(set(claimed)) == 5
+        assert leftover == []
+
+    def test_expired_lease_can_be_reclaimed(self, app_context):
+        """Test that a feed leased by a dead worker is picked up after expiry."""
+        add_feeds(1)
+        now = datetime.utcnow()
+        assert len(claim('crashed:1', now)) == 1
+
+        assert claim('node-b:1', now + timedelta(seconds=60)) == []
+        assert len(claim('node-b:1', now + timedelta(seconds=301))) == 1
+
+    def test_feeds_not_due_are_not_claimed(self, app_context):
+        """Test that leases only cover due feeds."""
+        feed, = add_feeds(1)
+        feed.next_fetch_at = datetime.utcnow() + timedelta(hours=1)
+        db.session.commit()
+
+        assert claim('node-a:1', datetime.utcnow()) == []
+
+class TestLeasedRefresh:
+    """Test cases for refresh cycles running on leases."""
+
+    @patch('app.download_feed')
+    def test_cycle_refreshes_each_feed_once_and_releases(self, mock_download, app_context):
+        """Test that a cycle fetches every feed exactly once and frees the leases."""
+        mock_download.side_effect = lambda job: FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS))
+        feeds = add_feeds(20)
+
+        report = refresh_all_feeds()
+
+        assert sorted(t.feed_id for t in report.timings) == sorted(f.id for f in feeds)
+        assert Feed.query.filter(Feed.lease_owner.isnot(None)).count() == 0
+
+    @patch('app.download_feed')
+    def test_feeds_leased_elsewhere_are_skipped(self, mock_download, app_context):
+        """Test that a feed held by another worker is left alone."""
+        mock_download.side_effect = lambda job: FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS))
+        mine, theirs = add_feeds(2)
+        theirs.lease_owner = 'node-b:1'
+        theirs.lease_expires_at = datetime.utcnow() + timedelta(minutes=5)
+        db.session.commit()
+
+        report = refresh_all_feeds(due_only=True)
+
+        assert [t.feed_id for t in report.timings] == [mine.id]
+        assert WORKER_ID != 'node-b:1'
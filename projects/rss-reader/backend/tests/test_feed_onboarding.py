@@ -0,0 +1,164 @@
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import patch
+from app import db, Feed, Article
+from feed_onboarding import Page, DiscoveryCache, FeedNotFound, onboard_feed, probe_candidates
+from tests.test_refresh import SAMPLE_RSS
+
+HTML_WITH_LINK = b"""<html><head>
+<link rel="alternate" type="application/rss+xml" href="/blog/rss.xml">
+</head><body><p>Blog</p></body></html>"""
+
+HTML_WITHOUT_LINK = b"<html><head><title>Blog</title></head><body><p>Blog</p></body></html>"
+
+def not_found(url):
+    response = requests.Response()
+    response.status_code = 404
+    response.url = url
+    return requests.HTTPError(f'404 {url}', response=response)
+
+class FakeWeb:
+    """Serves pages by URL and records every fetch; unknown URLs raise like a 404, down URLs time out"""
+
+    def __init__(self, pages, delays=None, down=()):
+        self.pages = pages
+        self.delays = delays or {}
+        self.down = set(down)
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url, timeout):
+        with self._lock:
+            self.fetched.append(url)
+        time.sleep(self.delays.get(url, 0))
+        if url in self.down:
+            raise requests.Timeout(f'timed out {url}')
+        if url not in self.pages:
+            raise not_found(url)
+        body, content_type = self.pages[url]
+        return Page(url, body, content_type, etag='"e1"')
+
+def rss(url):
+    return {url: (SAMPLE_RSS.encode(), 'application/rss+xml')}
+
+class TestOnboardFeed:
+    """Test cases for resolving a URL to a feed."""
+
+    def test_feed_url_is_fetched_once(self):
+        """Test that a feed URL is downloaded once and its document kept for ingestion."""
+        web = FakeWeb(rss('https://example.com/rss.xml'))
+
+        onboarded = onboard_feed('https://example.com/rss.xml', fetch=web)
+
+        assert web.fetched == ['https://example.com/rss.xml']
+        assert (onboarded.url, onboarded.discovered) == ('https://example.com/rss.xml', False)
+        assert len(onboarded.download.parsed_feed.entries) == 2
+        assert onboarded.download.etag == '"e1"'
+        assert onboarded.download.content_hash
+
+    def test_advertised_feed_link(self):
+        """Test that a page's <link rel="alternate"> feed is used without probing common paths."""
+        web = FakeWeb(dict(rss('https://example.com/blog/rss.xml'), **{
+            'https://example.com/blog/': (HTML_WITH_LINK, 'text/html; charset=utf-8')
+        }))
+
+        onboarded = onboard_feed('https://example.com/blog/', fetch=web)
+
+        assert (onboarded.url, onboarded.discovered) == ('https://example.com/blog/rss.xml', True)
+        assert web.fetched == ['https://example.com/blog/', 'https://example.com/blog/rss.xml']
+
+    def test_common_paths_are_probed_concurrently(self):
+        """Test that slow common path probes overlap and the earliest path in order wins."""
+        delays = {url: 0.3 for url in (
+            'https://example.com/feed', 'https://example.com/feed.xml', 'https://example.com/rss',
+            'https://example.com/rss.xml', 'https://example.com/atom.xml',
+            'https://example.com/feeds/posts/default', 'https://example.com/feed/atom'
+        )}
+        delays['https://example.com/rss'] = 0.5
+        pages = {'https://example.com/': (HTML_WITHOUT_LINK, 'text/html')}
+        pages.update(rss('https://example.com/rss'))
+        pages.update(rss('https://example.com/atom.xml'))
+        web = FakeWeb(pages, delays)
+
+        started = time.monotonic()
+        onboarded = onboard_feed('https://example.com/', fetch=web, max_workers=8)
+
+        assert onboarded.url == 'https://example.com/rss'
+        assert time.monotonic() - started < 1.5
+
+    def test_domain_results_are_cached(self):
+        """Test that a second page of the same site reuses the common path result, positive or negative."""
+        cache = DiscoveryCache(ttl=60)
+        pages = {
+            'https://example.com/a': (HTML_WITHOUT_LINK, 'text/html'),
+            'https://example.com/b': (HTML_WITHOUT_LINK, 'text/html'),
+            'https://other.example/a': (HTML_WITHOUT_LINK, 'text/html'),
+            'https://other.example/b': (HTML_WITHOUT_LINK, 'text/html'),
+        }
+        pages.update(rss('https://example.com/atom.xml'))
+        web = FakeWeb(pages)
+
+        assert onboard_feed('https://example.com/a', cache=cache, fetch=web).url == 'https://example.com/atom.xml'
+        web.fetched.clear()
+        assert onboard_feed('https://example.com/b', cache=cache, fetch=web).url == 'https://example.com/atom.xml'
+        assert web.fetched == ['https://example.com/b', 'https://example.com/atom.xml']
+
+        with pytest.raises(FeedNotFound):
+            onboard_feed('https://other.example/a', cache=cache, fetch=web)
+        web.fetched.clear()
+        with pytest.raises(FeedNotFound):
+            onboard_feed('https://other.example/b', cache=cache, fetch=web)
+        assert web.fetched == ['https://other.example/b']
+
+    def test_failed_probes_are_not_cached_as_no_feed(self):
+        """Test that a timeout on one common path keeps "no feed here" out of the cache."""
+        cache = DiscoveryCache(ttl=60)
+        pages = {
+            'https://example.com/a': (HTML_WITHOUT_LINK, 'text/html'),
+            'https://example.com/b': (HTML_WITHOUT_LINK, 'text/html'),
+        }
+        web = FakeWeb(pages, down=['https://example.com/rss.xml'])
+
+        with pytest.raises(FeedNotFound):
+            onboard_feed('https://example.com/a', cache=cache, fetch=web)
+        assert cache.get('example.com') == (False, None)
+
+        web.down.clear()
+        web.pages.update(rss('https://example.com/rss.xml'))
+        assert onboard_feed('https://example.com/b', cache=cache, fetch=web).url == 'https://example.com/rss.xml'
+
+    def test_no_candidates(self):
+        assert probe_candidates([], FakeWeb({}), timeout=1, max_workers=4) == (None, True)
+
+class TestAddFeed:
+    """Test cases for POST /api/feeds with the onboarding pipeline."""
+
+    def test_add_feed_stores_articles_from_the_first_download(self, client):
+        """Test that the page is fetched once and its entries and validators are stored."""
+        web = FakeWeb(dict(rss('https://example.com/blog/rss.xml'), **{
+            'https://example.com/blog/': (HTML_WITH_LINK, 'text/html')
+        }))
+
+        with patch('feed_onboarding.fetch_page', web):
+            response = client.post('/api/feeds', json={'name': 'Blog', 'url': 'https://example.com/blog/'})
+
+        assert response.status_code == 201
+        assert response.get_json()['url'] == 'https://example.com/blog/rss.xml'
+        assert web.fetched == ['https://example.com/blog/', 'https://example.com/blog/rss.xml']
+        feed = Feed.query.one()
+        assert (feed.etag, feed.next_fetch_at is not None) == ('"e1"', True)
+        assert Article.query.filter_by(feed_id=feed.id).count() == 2
+
+    def test_known_url_is_rejected_before_fetching(self, client):
+        """Test that adding a URL that is already subscribed needs no download."""
+        db.session.add(Feed(name='Blog', url='https://example.com/rss.xml'))
+        db.session.commit()
+        web = FakeWeb({})
+
+        with patch('feed_onboarding.fetch_page', web):
+            response = client.post('/api/feeds', json={'name': 'Blog', 'url': 'https://example.com/rss.xml'})
+
+        assert response.status_code == 400
+        assert web.fetched == []
@@ -0,0 +1,50 @@
+import feedparser
+import pytest
+from unittest.mock import patch
+from app import db, Feed, Article, fetch_feed_articles
+from feed_parsing import ParsePool, parse_and_normalize
+from ingest import ENTRY_FIELDS, normalize_feed
+from tests.test_feed_fetcher import make_response
+from tests.test_refresh import SAMPLE_RSS
+
+@pytest.fixture(scope='module')
+def worker_pool():
+    pool = ParsePool(workers=2)
+    yield pool
+    pool.shutdown()
+
+class TestParsePool:
+    """Test cases for parsing feeds in worker processes."""
+
+    def test_workers_return_the_same_compact_entries(self, worker_pool):
+        """Test that a worker process normalizes entries exactly like the calling thread does."""
+        inline = parse_and_normalize('https://example.com/rss.xml', SAMPLE_RSS.encode(), 'application/rss+xml')
+        pooled = worker_pool.parse('https://example.com/rss.xml', SAMPLE_RSS.encode(), 'application/rss+xml')
+
+        assert pooled.entries == inline.entries
+        assert len(pooled.entries) == 2
+        assert all(isinstance(entry, tuple) and len(entry) == len(ENTRY_FIELDS) for entry in pooled.entries)
+        assert dict(zip(ENTRY_FIELDS, pooled.entries[0]))['link'] == 'https://example.com/first'
+
+    def test_refresh_stores_entries_parsed_by_workers(self, app_context, worker_pool):
+        """Test that downloads parsed in worker processes are deduplicated and stored by the app."""
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+
+        with patch('feed_fetcher.feed_parser', worker_pool), \
+                patch('feed_fetcher.http_session.get', return_value=make_response(200, SAMPLE_RSS.encode())):
+            assert fetch_feed_articles(feed.id) == 2
+            feed.content_hash = None
+            assert fetch_feed_articles(feed.id) == 0
+
+        assert Article.query.filter_by(feed_id=feed.id).count() == 2
+
+def test_unreadable_entries_are_skipped_and_reported():
+    parsed = feedparser.parse(SAMPLE_RSS)
+    parsed.entries[0]['published_parsed'] = 'not a date'
+
+    normalized = normalize_feed(parsed)
+
+    assert len(normalized.entries) == 1
+    assert normalized.errors[0].startswith('entry 0:')
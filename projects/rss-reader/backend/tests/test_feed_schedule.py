@@ -0,0 +1,77 @@
+import feedparser
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app import db, Feed, refresh_all_feeds
+from config import Config
+from feed_fetcher import FeedDownload, PARSED
+from feed_schedule import estimate_interval, backoff_interval, should_log_failure
+from tests.test_refresh import SAMPLE_RSS
+
+NOW = datetime(2024, 1, 10, 12, 0)
+
+class TestIntervalEstimation:
+    """Test cases for learning a feed's publishing cadence."""
+
+    def test_busy_feed_is_polled_often(self):
+        """Test that a feed posting every 20 minutes gets the minimum interval."""
+        dates = [NOW - timedelta(minutes=20 * i) for i in range(10)]
+        assert estimate_interval(dates, NOW, 30, 10, 720) == 10
+
+    def test_quiet_feed_is_polled_rarely(self):
+        """Test that a feed posting twice a month is capped at the maximum interval."""
+        dates = [NOW - timedelta(days=15 * i) for i in range(4)]
+        assert estimate_interval(dates, NOW, 30, 10, 720) == 720
+
+    def test_hourly_feed(self):
+        """Test that an hourly feed is polled about twice an hour."""
+        dates = [NOW - timedelta(hours=i) for i in range(10)]
+        assert estimate_interval(dates, NOW, 30, 10, 720) == 30
+
+    def test_not_enough_history_uses_default(self):
+        """Test that new feeds start at the default interval."""
+        assert estimate_interval([NOW], NOW, 30, 10, 720) == 30
+
+    def test_backoff(self):
+        """Test exponential backoff capped at the maximum."""
+        assert [backoff_interval(n, 30, 1440) for n in range(1, 8)] == [30, 60, 120, 240, 480, 960, 1440]
+        assert [n for n in range(1, 10) if should_log_failure(n)] == [1, 2, 4, 8]
+
+class TestDueFeeds:
+    """Test cases for polling only feeds that are due."""
+
+    @patch('app.download_feed')
+    def test_only_due_feeds_are_polled(self, mock_download, app_context):
+        """Test that feeds scheduled in the future are skipped."""
+        mock_download.side_effect = lambda job: FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS))
+        due = Feed(name='Due', url='https://example.com/due.xml')
+        later = Feed(name='Later', url='https://example.com/later.xml',
+                     next_fetch_at=datetime.utcnow() + timedelta(hours=1))
+        db.session.add_all([due, later])
+        db.session.commit()
+
+        report = refresh_all_feeds(due_only=True)
+
+        assert [t.name for t in report.timings] == ['Due']
+        db.session.refresh(due)
+        assert due.next_fetch_at > datetime.utcnow()
+        assert due.fetch_interval_minutes == Config.FEED_MAX_INTERVAL_MINUTES  # sample posts are from 2023
+
+    @patch('app.download_feed')
+    def test_failing_feed_backs_off(self, mock_download, app_context):
+        """Test that each failure pushes the next attempt further out."""
+        mock_download.side_effect = IOError('timed out')
+        feed = Feed(name='Broken', url='https://example.com/broken.xml', fetch_interval_minutes=30)
+        db.session.add(feed)
+        db.session.commit()
+
+        delays = []
+        for _ in range(3):
+            feed.next_fetch_at = None
+            db.session.commit()
+            refresh_all_feeds(due_only=True)
+            db.session.refresh(feed)
+            delays.append((feed.next_fetch_at - datetime.utcnow()).total_seconds() / 60)
+
+        assert feed.consecutive_failures == 3
+        assert 'timed out' in feed.last_error
+        assert 25 < delays[0] < 35 and 55 < delays[1] < 70 and 115 < delays[2] < 135
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from unittest.mock import patch
+import pytest
+from config import Config
+from feed_search import FeedSearchBackend, FeedsearchDev, SearchCache, candidate_urls, normalize_query, search_feeds
+
+class StubFeedsearchHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the feedsearch.dev API: url -> (status, feeds), with a delay per url"""
+    answers = {}
+    delays = {}
+    calls = []
+
+    def do_GET(self):
+        url = parse_qs(urlparse(self.path).query)['url'][0]
+        StubFeedsearchHandler.calls.append(url)
+        time.sleep(StubFeedsearchHandler.delays.get(url, 0))
+        status, feeds = StubFeedsearchHandler.answers.get(url, (200, []))
+        payload = json.dumps(feeds).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def feedsearch_api():
+    """Serve the stub feed search API locally and point the app at it"""
+    StubFeedsearchHandler.answers = {}
+    StubFeedsearchHandler.delays = {}
+    StubFeedsearchHandler.calls = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubFeedsearchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f'http://127.0.0.1:{server.server_address[1]}/api/v1'
+    with patch.object(Config, 'FEEDSEARCH_API_BASE', api_base), patch.object(Config, 'FEEDSEARCH_TIMEOUT', 5):
+        yield StubFeedsearchHandler
+    server.shutdown()
+
+def feed(url, title='Engadget'):
+    return {'url': url, 'title': title, 'site_url': 'https://engadget.com', 'description': '', 'favicon': ''}
+
+class TestSearchFeeds:
+    """Test cases for concurrent candidate lookups."""
+
+    def test_candidates(self):
+        assert candidate_urls('engadget') == ['engadget.com', 'https://engadget.com', 'engadget.org', 'engadget.io']
+        assert candidate_urls(' engadget.com ') == ['https://engadget.com', 'engadget.com']
+        assert candidate_urls('https://engadget.com/rss') == ['https://engadget.com/rss']
+        assert normalize_query(' Engadget.com/ ') == 'engadget.com'
+
+    def test_first_answer_wins_without_waiting_for_slow_lookups(self, feedsearch_api):
+        """Test that lookups overlap and the first non-empty answer is returned at once."""
+        feedsearch_api.delays = {'engadget.com': 2, 'https://engadget.com': 2, 'engadget.org': 0.2}
+        feedsearch_api.answers = {'engadget.org': (200, [feed('https://engadget.org/rss')])}
+
+        started = time.monotonic()
+        feeds, complete = search_feeds('engadget', FeedsearchDev(Config.FEEDSEARCH_API_BASE), timeout=5)
+
+        assert time.monotonic() - started < 1.5
+        assert [f['url'] for f in feeds] == ['https://engadget.org/rss']
+        assert complete is True
+        assert sorted(feedsearch_api.calls) == sorted(candidate_urls('engadget'))
+
+    def test_failed_lookups_make_an_empty_answer_incomplete(self, feedsearch_api):
+        """Test that a server error is not mistaken for "no feeds"."""
+        feedsearch_api.answers = {'https://example.com': (500, []), 'example.com': (400, [])}
+
+        assert search_feeds('example.com', FeedsearchDev(Config.FEEDSEARCH_API_BASE), timeout=5) == ([], False)
+
+    def test_backend_must_implement_search(self):
+        """Test that a backend without search() fails when it is created, not on the first query."""
+        class Incomplete(FeedSearchBackend):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+class TestSearchCache:
+    """Test cases for the search answer cache."""
+
+    def test_positive_and_negative_expiry(self):
+        now = [0]
+        cache = SearchCache(ttl=100, negative_ttl=10, clock=lambda: now[0])
+        cache.put('engadget', [feed('https://engadget.com/rss')])
+        cache.put('nothing', [])
+
+        now[0] = 20
+        assert cache.get('engadget')[0] is True
+        assert cache.get('nothing') == (False, None)
+
+    def test_bounded(self):
+        cache = SearchCache(ttl=100, negative_ttl=10, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, [])
+        assert cache.get('a') == (False, None)
+        assert cache.get('c') == (True, [])
+
+class TestFeedSearchEndpoint:
+    """Test cases for /api/feed-search."""
+
+    def test_repeated_searches_are_served_from_the_cache(self, client, feedsearch_api):
+        """Test that the same query, however it is typed, reaches the service once; empty answers too."""
+        feedsearch_api.answers = {'https://engadget.com': (200, [feed('https://engadget.com/rss')])}
+
+        first = client.get('/api/feed-search?q=engadget.com').get_json()
+        calls = len(feedsearch_api.calls)
+        second = client.get('/api/feed-search?q=Engadget.com/').get_json()
+
+        assert first == second
+        assert [f['url'] for f in first['feeds']] == ['https://engadget.com/rss']
+        assert len(feedsearch_api.calls) == calls
+
+        assert client.get('/api/feed-search?q=nothing-here.example').get_json() == {'feeds': []}
+        calls = len(feedsearch_api.calls)
+        assert client.get('/api/feed-search?q=nothing-here.example').get_json() == {'feeds': []}
+        assert len(feedsearch_api.calls) == calls
+
+    def test_missing_query(self, client):
+        assert client.get('/api/feed-search?q=%20').status_code == 400
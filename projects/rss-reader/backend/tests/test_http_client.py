@@ -0,0 +1,144 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from http_client import PoliteSession, HostCoolingDown, ResponseTooLarge, host_key, parse_retry_after
+
+class StubSiteHandler(BaseHTTPRequestHandler):
+    """Serves scripted answers: path -> list of (status, headers, body), the last one repeated"""
+    answers = {}
+    delay = 0
+    hits = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = StubSiteHandler
+        with cls.lock:
+            cls.hits.append(self.path)
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            script = cls.answers.get(self.path, [(200, {}, b'ok')])
+            status, headers, body = script.pop(0) if len(script) > 1 else script[0]
+        try:
+            time.sleep(cls.delay)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if callable(body):
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for chunk in body():
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.write(b'0\r\n\r\n')
+            else:
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site():
+    StubSiteHandler.answers = {}
+    StubSiteHandler.delay = 0
+    StubSiteHandler.hits = []
+    StubSiteHandler.active = StubSiteHandler.peak = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSiteHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield StubSiteHandler, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+class TestPoliteSession:
+    """Test cases for the shared outbound HTTP session."""
+
+    def test_concurrency_is_capped_per_host(self, site):
+        """Test that requests to one host beyond the cap wait for a slot, and are counted."""
+        handler, base = site
+        handler.delay = 0.3
+        session = PoliteSession(max_per_host=2)
+
+        threads = [threading.Thread(target=session.get, args=(f'{base}/page',), kwargs={'timeout': 5}) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert handler.peak == 2
+        stats = session.host_stats()[host_key(base)]
+        assert (stats['requests'], stats['errors'], stats['in_flight']) == (6, 0, 0)
+        assert stats['avg_ms'] >= 300
+
+    def test_short_retry_after_is_waited_out(self, site):
+        """Test that a 429 with a short Retry-After is retried once after the wait."""
+        handler, base = site
+        handler.answers = {'/feed': [(429, {'Retry-After': '1'}, b''), (200, {}, b'<rss/>')]}
+        session = PoliteSession(max_retry_wait=5)
+
+        started = time.monotonic()
+        response = session.get(f'{base}/feed', timeout=5)
+
+        assert response.status_code == 200
+        assert response.content == b'<rss/>'
+        assert time.monotonic() - started >= 1
+        assert session.host_stats()[host_key(base)]['throttled'] == 1
+
+    def test_long_retry_after_cools_the_host_down(self, site):
+        """Test that during a long cool-down the host is not contacted at all."""
+        handler, base = site
+        handler.answers = {'/feed': [(429, {'Retry-After': '120'}, b'')]}
+        session = PoliteSession(max_retry_wait=5)
+
+        assert session.get(f'{base}/feed', timeout=5).status_code == 429
+        with pytest.raises(HostCoolingDown) as excinfo:
+            session.get(f'{base}/other', timeout=5)
+
+        assert excinfo.value.retry_after > 100
+        assert handler.hits == ['/feed']
+        assert session.host_stats()[host_key(base)]['cooling_down_seconds'] > 100
+
+    def test_byte_cap_is_enforced_while_streaming(self, site):
+        """Test that oversized bodies are refused from Content-Length or after max_bytes are read."""
+        handler, base = site
+
+        def endless():
+            # 100 MB: only returns in time if the client stops reading
+            for _ in range(100_000):
+                yield b'x' * 1024
+
+        handler.answers = {'/big': [(200, {}, b'x' * 5000)], '/stream': [(200, {}, endless)]}
+        session = PoliteSession()
+
+        with pytest.raises(ResponseTooLarge):
+            session.get(f'{base}/big', timeout=5, max_bytes=4096)
+        with pytest.raises(ResponseTooLarge):
+            session.get(f'{base}/stream', timeout=5, max_bytes=4096)
+        assert session.get(f'{base}/big', timeout=5, max_bytes=8192).content == b'x' * 5000
+
+        assert session.host_stats()[host_key(base)]['too_large'] == 2
+
+    def test_cookies_are_not_kept(self, site):
+        handler, base = site
+        handler.answers = {'/login': [(200, {'Set-Cookie': 'session=abc; Path=/'}, b'')]}
+        session = PoliteSession()
+
+        session.get(f'{base}/login', timeout=5)
+
+        assert len(session.cookies) == 0
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert parse_retry_after('30') == 30
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=90), usegmt=True), now=now) == 90
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,91 @@
+import feedparser
+from sqlalchemy import event
+from app import db, Feed, Article, store_feed_articles, recent_links
+from ingest import normalize_entry, RecentLinkCache
+from tests.test_refresh import SAMPLE_RSS
+
+class CountSelects:
+    """Count SELECT statements issued against the article table."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM article' in statement:
+            self.count += 1
+
+class TestStoreFeedArticles:
+    """Test cases for set-based article ingestion."""
+
+    def test_bulk_insert_and_dedup(self, app_context):
+        """Test that a feed is stored once and re-ingesting it adds nothing."""
+        recent_links.forget()
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+        parsed = feedparser.parse(SAMPLE_RSS)
+
+        with CountSelects(db.engine) as selects:
+            assert store_feed_articles(feed, parsed) == 2
+        assert selects.count == 1
+
+        # Another worker already stored the entries; the cache does not know yet
+        recent_links.forget(feed.id)
+        assert store_feed_articles(feed, parsed) == 0
+        assert Article.query.filter_by(feed_id=feed.id).count() == 2
+
+    def test_recent_links_skip_existence_query(self, app_context):
+        """Test that a hot feed with only known links issues no article SELECT."""
+        recent_links.forget()
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+        parsed = feedparser.parse(SAMPLE_RSS)
+        store_feed_articles(feed, parsed)
+
+        with CountSelects(db.engine) as selects:
+            assert store_feed_articles(feed, parsed) == 0
+        assert selects.count == 0
+
+    def test_duplicate_links_within_document(self, app_context):
+        """Test that repeated links inside one document are inserted once."""
+        recent_links.forget()
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+        parsed = feedparser.parse(SAMPLE_RSS)
+        parsed.entries.append(parsed.entries[0])
+
+        assert store_feed_articles(feed, parsed) == 2
+
+class TestIngestHelpers:
+    """Test cases for entry normalization and the recent link cache."""
+
+    def test_normalize_entry(self):
+        """Test date parsing and title truncation."""
+        entry = feedparser.parse(SAMPLE_RSS).entries[0]
+        entry['title'] = 'A' * 600
+
+        row = normalize_entry(entry)
+        assert len(row['title']) == 500
+        assert row['link'] == 'https://example.com/first'
+        assert row['published_date'].year == 2023
+
+    def test_recent_link_cache_is_bounded(self):
+        """Test that the cache evicts the least recently used links and feeds."""
+        cache = RecentLinkCache(max_feeds=2, max_links_per_feed=2)
+        cache.remember(1, ['a', 'b', 'c'])
+        assert cache.unseen(1, ['a', 'b', 'c']) == ['a']
+
+        cache.remember(2, ['x'])
+        cache.remember(3, ['y'])
+        assert cache.unseen(1, ['b']) == ['b']
+        assert cache.unseen(3, ['y']) == []
@@ -0,0 +1,212 @@
+import pytest
+import feedparser
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from sqlalchemy import event, inspect, UniqueConstraint
+from app import db, Feed, Article, FeedCounter, store_feed_articles
+from migrations import MIGRATIONS, run_migrations, applied_versions, index_exists, deduplicate_articles
+from tests.test_refresh import SAMPLE_RSS
+
+def add_articles(count=30):
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    start = datetime(2024, 1, 1)
+    db.session.add_all([
+        Article(feed_id=feed.id, title=f'Article {i}', link=f'/a/{i}', published_date=start + timedelta(hours=i),
+                is_read=i % 2 == 0, is_bookmarked=i % 5 == 0)
+        for i in range(count)
+    ])
+    db.session.commit()
+    return feed
+
+def captured_statements(call):
+    """(statement, parameters) for every query issued while running call()"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'DELETE')):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return statements
+
+def query_plan(statement, parameters):
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+def plan_for(statements, fragment):
+    """Query plan of the first captured statement containing fragment"""
+    for statement, parameters in statements:
+        if fragment in statement:
+            return query_plan(statement, parameters)
+    raise AssertionError(f'no statement containing {fragment!r}')
+
+def create_old_article_table():
+    """The article table as it was before the new columns and the unique (feed_id, link) index"""
+    db.session.execute(db.text("DROP TABLE IF EXISTS article"))
+    db.session.execute(db.text("""
+        CREATE TABLE article (
+            id INTEGER PRIMARY KEY, feed_id INTEGER NOT NULL, title VARCHAR(500) NOT NULL,
+            link VARCHAR(500) NOT NULL, description TEXT, published_date DATETIME, author VARCHAR(200),
+            is_read BOOLEAN, is_bookmarked BOOLEAN, created_at DATETIME
+        )
+    """))
+
+def create_original_feed_table():
+    """The feed table of the first release, before any migration"""
+    db.session.execute(db.text("""
+        CREATE TABLE feed (
+            id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, url VARCHAR(500) NOT NULL UNIQUE,
+            category VARCHAR(50), logo_url VARCHAR(500), last_fetched DATETIME, is_active BOOLEAN,
+            created_at DATETIME
+        )
+    """))
+
+@pytest.fixture
+def sqlite_only():
+    if db.engine.dialect.name != 'sqlite':
+        pytest.skip('query plans are checked on SQLite')
+
+class TestRunMigrations:
+    """Test cases for applying the versioned migrations."""
+
+    def test_applies_every_version_once(self, app_context):
+        """Test that migrations are recorded and a second run is a no-op."""
+        assert run_migrations(db.engine) == [version for version, _, _ in MIGRATIONS]
+        assert run_migrations(db.engine) == []
+        assert applied_versions(db.engine) == {version for version, _, _ in MIGRATIONS}
+        assert index_exists(db.engine, 'article', 'ix_article_published')
+
+    def test_original_schema_is_migrated_to_the_models(self, app_context):
+        """Test that every column, index and unique constraint the models declare exists after migrating."""
+        db.drop_all()
+        create_original_feed_table()
+        create_old_article_table()
+        db.session.commit()
+        db.create_all()
+
+        run_migrations(db.engine)
+
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            assert {column.name for column in table.columns} <= columns, table.name
+            named = [index.name for index in table.indexes]
+            named += [constraint.name for constraint in table.constraints
+                      if isinstance(constraint, UniqueConstraint) and constraint.name]
+            for name in named:
+                assert index_exists(db.engine, table.name, name), name
+
+    def test_upgrades_a_database_from_before_the_new_columns(self, app_context):
+        """Test that an old article table gets its columns, counters and a deduplicated unique index."""
+        feed = Feed(name='Old Feed', url='https://example.com/old.xml')
+        db.session.add(feed)
+        db.session.commit()
+        create_old_article_table()
+        db.session.execute(db.text("""
+            INSERT INTO article (feed_id, title, link, description, is_read, is_bookmarked) VALUES
+            (:feed, 'One', '/one', NULL, false, false), (:feed, 'One again', '/one', NULL, false, true),
+            (:feed, 'Two', '/two', '<p>Second &amp; <b>last</b></p>', true, false)
+        """), {'feed': feed.id})
+        db.session.execute(db.text("DELETE FROM feed_counter"))
+        db.session.commit()
+
+        run_migrations(db.engine)
+
+        columns = {column['name'] for column in inspect(db.engine).get_columns('article')}
+        assert {'word_count', 'reading_time_minutes', 'reading_time_estimated', 'excerpt', 'change_seq'} <= columns
+        assert db.session.execute(db.text("SELECT DISTINCT change_seq FROM article")).scalars().all() == [1]
+        rows = db.session.execute(db.text("SELECT link, is_bookmarked, excerpt FROM article ORDER BY id")).fetchall()
+        assert [(link, bool(bookmarked), excerpt) for link, bookmarked, excerpt in rows] == [
+            ('/one', True, ''), ('/two', False, 'Second & last')
+        ]
+        counter = db.session.get(FeedCounter, feed.id)
+        assert (counter.total, counter.unread, counter.bookmarked) == (2, 1, 1)
+
+    def test_dedup_runs_again_after_a_failed_index_build(self, app_context):
+        """Test that an invalid uq_article_feed_link left by a failed concurrent build is not taken as done."""
+        feed = Feed(name='Old Feed', url='https://example.com/old.xml')
+        db.session.add(feed)
+        db.session.commit()
+        create_old_article_table()
+        db.session.execute(db.text("""
+            INSERT INTO article (feed_id, title, link, is_read, is_bookmarked) VALUES
+            (:feed, 'One', '/one', false, false), (:feed, 'One again', '/one', false, false),
+            (:feed, 'Two', '/two', false, false)
+        """), {'feed': feed.id})
+        # Stands in for the invalid index PostgreSQL keeps after CREATE UNIQUE INDEX CONCURRENTLY fails
+        db.session.execute(db.text("CREATE INDEX uq_article_feed_link ON article (feed_id, link)"))
+        db.session.commit()
+
+        def drop_invalid_index(engine, name):
+            with engine.begin() as conn:
+                conn.execute(db.text(f"DROP INDEX {name}"))
+            return True
+
+        with patch('migrations.drop_invalid_index', side_effect=drop_invalid_index):
+            deduplicate_articles(db.engine)
+
+        links = db.session.execute(db.text("SELECT link FROM article ORDER BY id")).scalars().all()
+        assert links == ['/one', '/two']
+        unique = {index['name']: index['unique'] for index in inspect(db.engine).get_indexes('article')}
+        assert unique['uq_article_feed_link']
+
+class TestHotPathQueryPlans:
+    """Test cases proving the listing, stats and dedup queries are served by indexes."""
+
+    def test_article_list_pages_walk_the_published_index(self, client, sqlite_only):
+        """Test that the article list needs neither a table scan nor a sort."""
+        run_migrations(db.engine)
+        add_articles()
+        first = client.get('/api/articles?per_page=5').get_json()
+
+        statements = captured_statements(
+            lambda: client.get(f"/api/articles?per_page=5&cursor={first['next_cursor']}")
+        )
+        plan = plan_for(statements, 'FROM article JOIN feed')
+
+        assert 'ix_article_published' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_unread_and_per_feed_lists(self, client, sqlite_only):
+        """Test that the unread filter uses the partial index and the feed filter its composite."""
+        run_migrations(db.engine)
+        feed = add_articles()
+
+        unread = plan_for(captured_statements(lambda: client.get('/api/articles?unread_only=true')), 'FROM article')
+        by_feed = plan_for(captured_statements(lambda: client.get(f'/api/articles?feed_id={feed.id}')), 'FROM article')
+
+        assert 'ix_article_unread_published' in unread
+        assert 'ix_article_feed_published' in by_feed
+        assert 'TEMP B-TREE' not in unread + by_feed
+
+    def test_bookmarks_list_and_cleanup_delete(self, client, sqlite_only):
+        """Test the bookmarked list and the cleanup script's delete by age."""
+        run_migrations(db.engine)
+        add_articles()
+
+        bookmarks = plan_for(captured_statements(lambda: client.get('/api/articles/bookmarked')), 'FROM article')
+        cleanup = query_plan(
+            "SELECT id FROM article WHERE created_at < ? AND is_bookmarked = 0", (datetime.utcnow().isoformat(),)
+        )
+
+        assert 'ix_article_bookmarked_created' in bookmarks
+        assert 'TEMP B-TREE' not in bookmarks
+        assert 'ix_article_created' in cleanup
+
+    def test_stats_and_ingestion_dedup(self, client, sqlite_only):
+        """Test that stats never scan articles and the existing-link check uses the unique index."""
+        run_migrations(db.engine)
+        feed = add_articles()
+
+        stats = captured_statements(lambda: client.get('/api/stats'))
+        dedup = captured_statements(lambda: store_feed_articles(feed, feedparser.parse(SAMPLE_RSS)))
+
+        assert not any('FROM article' in statement for statement, _ in stats)
+        assert '(feed_id=? AND link=?)' in plan_for(dedup, 'article.link IN')
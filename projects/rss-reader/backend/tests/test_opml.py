@@ -0,0 +1,185 @@
+import io
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from lxml import etree
+from app import db, Feed, Article, ImportJob, run_import_job
+from config import Config
+from opml import OpmlError, parse_opml, opml_document
+from tests.test_feed_onboarding import FakeWeb, rss, HTML_WITH_LINK
+
+SUBSCRIPTIONS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>My feeds</title></head>
+  <body>
+    <outline text="Technology">
+      <outline type="rss" text="Tech One" xmlUrl="https://one.example/rss.xml"/>
+      <outline type="rss" text="Tech Blog" xmlUrl="https://blog.example/"/>
+    </outline>
+    <outline type="rss" text="Loose" title="Loose Feed" xmlUrl="https://loose.example/feed" category="/News"/>
+    <outline type="rss" text="Broken" xmlUrl="https://broken.example/rss"/>
+    <outline type="rss" text="Tech One again" xmlUrl="https://one.example/rss.xml"/>
+  </body>
+</opml>"""
+
+def fake_web(delay=0):
+    pages = {'https://blog.example/': (HTML_WITH_LINK, 'text/html')}
+    for url in ('https://one.example/rss.xml', 'https://blog.example/blog/rss.xml', 'https://loose.example/feed'):
+        pages.update(rss(url))
+    urls = list(pages) + ['https://broken.example/rss']
+    return FakeWeb(pages, {url: delay for url in urls})
+
+def import_opml(client, **kwargs):
+    """Post an OPML upload, run its import job inline and return the finished job"""
+    with patch('app.start_import_job_thread', side_effect=run_import_job):
+        response = client.post('/api/feeds/import', **kwargs)
+    assert response.status_code == 202
+    assert response.get_json()['status'] == 'queued'
+    return client.get(response.get_json()['status_url']).get_json()
+
+class TestParseOpml:
+    """Test cases for reading OPML documents."""
+
+    def test_entries_with_categories(self):
+        """Test titles, folder and attribute categories, and repeated URLs."""
+        entries = parse_opml(SUBSCRIPTIONS)
+        assert [(e.title, e.url, e.category) for e in entries] == [
+            ('Tech One', 'https://one.example/rss.xml', 'Technology'),
+            ('Tech Blog', 'https://blog.example/', 'Technology'),
+            ('Loose Feed', 'https://loose.example/feed', 'News'),
+            ('Broken', 'https://broken.example/rss', None),
+        ]
+
+    def test_rejects_other_documents_and_entities(self):
+        """Test that non-OPML XML is refused and external entities are never resolved."""
+        with pytest.raises(OpmlError):
+            parse_opml(b'<rss><channel/></rss>')
+        with pytest.raises(OpmlError):
+            parse_opml(b'not xml')
+        evil = b"""<?xml version="1.0"?><!DOCTYPE opml [<!ENTITY x SYSTEM "file:///etc/passwd">]>
+        <opml><body><outline text="&x;" xmlUrl="https://a.example/rss"/></body></opml>"""
+        with pytest.raises(OpmlError):
+            parse_opml(evil)
+
+    def test_export_round_trips(self):
+        rows = [('A & B', 'https://a.example/rss?x=1&y=2', 'News'), ('C', 'https://c.example/rss', 'Tech')]
+        document = ''.join(opml_document(rows)).encode()
+        etree.fromstring(document)
+        assert [(e.title, e.url, e.category) for e in parse_opml(document)] == rows
+
+class TestOpmlImport:
+    """Test cases for /api/feeds/import and /api/feeds/export."""
+
+    def test_import_report_and_bulk_insert(self, client):
+        """Test that feeds are checked, discovered, inserted without fetching articles, and reported."""
+        db.session.add(Feed(name='Already', url='https://loose.example/feed'))
+        db.session.commit()
+        web = fake_web()
+
+        with patch('feed_onboarding.fetch_page', web):
+            data = import_opml(client, data={'file': (io.BytesIO(SUBSCRIPTIONS), 'feeds.opml')})
+
+        assert data['status'] == 'completed'
+        assert (data['feeds_total'], data['feeds_checked']) == (4, 4)
+        assert (data['added'], data['existing'], data['failed']) == (2, 1, 1)
+        statuses = {item['url']: item['status'] for item in data['feeds']}
+        assert statuses == {
+            'https://one.example/rss.xml': 'added', 'https://blog.example/': 'added',
+            'https://loose.example/feed': 'exists', 'https://broken.example/rss': 'failed'
+        }
+        assert 'https://loose.example/feed' not in web.fetched
+
+        feeds = {feed.url: feed for feed in Feed.query.filter(Feed.name != 'Already')}
+        assert set(feeds) == {'https://one.example/rss.xml', 'https://blog.example/blog/rss.xml'}
+        assert feeds['https://blog.example/blog/rss.xml'].category == 'Technology'
+        assert all(feed.next_fetch_at is None and feed.etag is None and feed.is_active for feed in feeds.values())
+        assert Article.query.count() == 0
+
+    def test_checks_run_concurrently_and_bounded(self, client):
+        """Test that slow feed checks overlap, at most OPML_IMPORT_MAX_WORKERS at a time."""
+        web = fake_web(delay=0.5)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def counting_fetch(url, timeout):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                return web(url, timeout)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        with patch('feed_onboarding.fetch_page', counting_fetch), patch.object(Config, 'OPML_IMPORT_MAX_WORKERS', 2):
+            started = time.monotonic()
+            import_opml(client, data=SUBSCRIPTIONS, content_type='text/x-opml')
+            elapsed = time.monotonic() - started
+
+        assert peak[0] == 2
+        assert elapsed < 5 * 0.5
+
+    def test_import_without_validation_and_export(self, client):
+        """Test that validate=false imports without fetching and the export lists active feeds."""
+        web = fake_web()
+        with patch('feed_onboarding.fetch_page', web):
+            data = client.post('/api/feeds/import?validate=false', data=SUBSCRIPTIONS).get_json()
+        assert (data['added'], web.fetched) == (4, [])
+
+        client.delete(f"/api/feeds/{Feed.query.filter_by(url='https://broken.example/rss').one().id}")
+        response = client.get('/api/feeds/export')
+
+        assert response.mimetype == 'text/x-opml'
+        assert 'attachment' in response.headers['Content-Disposition']
+        exported = parse_opml(response.get_data())
+        assert sorted((e.url, e.category) for e in exported) == [
+            ('https://blog.example/', 'Technology'), ('https://loose.example/feed', 'News'),
+            ('https://one.example/rss.xml', 'Technology')
+        ]
+
+    def test_import_rejects_urls_longer_than_the_column(self, client):
+        """Test that an over-long xmlUrl is reported as failed instead of breaking the batch."""
+        long_url = 'https://long.example/' + 'a' * 500
+        document = SUBSCRIPTIONS.replace(
+            b'</body>', f'<outline type="rss" text="Long" xmlUrl="{long_url}"/></body>'.encode()
+        )
+
+        data = client.post('/api/feeds/import?validate=false', data=document).get_json()
+
+        assert (data['added'], data['failed']) == (4, 1)
+        assert [item['error'] for item in data['feeds'] if item['status'] == 'failed'] == ['URL too long']
+        assert Feed.query.count() == 4
+
+    def test_validated_import_answers_before_checking(self, client):
+        """Test that the upload request only queues the job, so slow checks cannot hit the worker timeout."""
+        web = fake_web()
+        with patch('feed_onboarding.fetch_page', web), patch('app.start_import_job_thread') as mock_start:
+            response = client.post('/api/feeds/import', data=SUBSCRIPTIONS)
+
+        data = response.get_json()
+        assert response.status_code == 202
+        assert data['status_url'] == f"/api/feeds/import/{data['job_id']}"
+        assert data['feeds_total'] == 4
+        assert mock_start.call_args.args[0] == data['job_id']
+        assert web.fetched == []
+        assert Feed.query.count() == 0
+
+    def test_import_job_whose_worker_died(self, client):
+        """Test that an import job without heartbeats is reported failed when polled."""
+        with patch('app.start_import_job_thread'):
+            job_id = client.post('/api/feeds/import', data=SUBSCRIPTIONS).get_json()['job_id']
+        job = db.session.get(ImportJob, job_id)
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        data = client.get(f'/api/feeds/import/{job_id}').get_json()
+
+        assert (data['status'], data['error']) == ('failed', 'Worker stopped responding')
+        assert client.get('/api/feeds/import/missing').status_code == 404
+
+    def test_bad_uploads(self, client):
+        assert client.post('/api/feeds/import', data=b'').status_code == 400
+        assert client.post('/api/feeds/import', data=b'<rss/>').status_code == 400
+        with patch.object(Config, 'OPML_IMPORT_MAX_FEEDS', 2):
+            assert client.post('/api/feeds/import', data=SUBSCRIPTIONS).status_code == 400
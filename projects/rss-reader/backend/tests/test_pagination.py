@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app import db, Feed, Article
+from pagination import encode_cursor, decode_cursor
+
+def add_articles(count, undated=0, same_date=0):
+    """Articles with distinct dates, some sharing one date, and some without a date"""
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    start = datetime(2024, 1, 1)
+    articles = [Article(feed_id=feed.id, title=f'Dated {i}', link=f'/dated/{i}',
+                        published_date=start + timedelta(hours=i)) for i in range(count)]
+    articles += [Article(feed_id=feed.id, title=f'Tied {i}', link=f'/tied/{i}',
+                         published_date=start + timedelta(hours=5)) for i in range(same_date)]
+    articles += [Article(feed_id=feed.id, title=f'Undated {i}', link=f'/undated/{i}') for i in range(undated)]
+    db.session.add_all(articles)
+    db.session.commit()
+    return feed
+
+def walk(client, url, per_page):
+    """Follow next_cursor to the end, returning article ids in order"""
+    ids, cursor = [], None
+    while True:
+        params = f'&cursor={cursor}' if cursor else ''
+        data = client.get(f'{url}?per_page={per_page}{params}').get_json()
+        ids += [a['id'] for a in data['articles']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids, data
+
+class TestCursor:
+    """Test cases for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that cursors decode to what was encoded."""
+        value = datetime(2024, 5, 1, 12, 30)
+        assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+        assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+class TestKeysetPagination:
+    """Test cases for cursor pagination of article listings."""
+
+    def test_walks_every_article_once_in_order(self, client):
+        """Test ties on the sort key and undated articles across page boundaries."""
+        add_articles(10, undated=4, same_date=3)
+
+        ids, last = walk(client, '/api/articles', per_page=3)
+        expected = [a.id for a in Article.query.order_by(
+            Article.published_date.desc().nulls_last(), Article.id.desc()
+        )]
+
+        assert ids == expected
+        assert len(ids) == 17
+        assert last['total'] == 17
+        assert last['pages'] == 6
+
+    def test_feed_is_loaded_in_the_same_query(self, client):
+        """Test that a page costs a fixed number of queries, not one per article."""
+        add_articles(20)
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            data = client.get('/api/articles?per_page=20').get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        assert data['articles'][0]['feed_name'] == 'Test Feed'
+        assert not any('COUNT(*)' in statement for statement in statements)
+        assert len(statements) <= 2
+
+    def test_legacy_page_numbers_still_work(self, client):
+        """Test that clients sending page numbers get the same pages."""
+        add_articles(5)
+
+        first = client.get('/api/articles?per_page=2').get_json()
+        second = client.get('/api/articles?per_page=2&page=2').get_json()
+        by_cursor = client.get(f"/api/articles?per_page=2&cursor={first['next_cursor']}").get_json()
+
+        assert [a['id'] for a in second['articles']] == [a['id'] for a in by_cursor['articles']]
+
+    def test_bookmarked_articles_by_cursor(self, client):
+        """Test cursor pagination of bookmarks, newest bookmark first."""
+        feed = add_articles(5)
+        for article in Article.query.filter_by(feed_id=feed.id):
+            article.is_bookmarked = True
+        db.session.commit()
+
+        ids, last = walk(client, '/api/articles/bookmarked', per_page=2)
+
+        assert sorted(ids) == sorted(a.id for a in Article.query)
+        assert len(set(ids)) == 5
+        assert last['total'] == 5
+
+    def test_invalid_cursor(self, client):
+        """Test that a tampered cursor is rejected."""
+        assert client.get('/api/articles?cursor=not-a-cursor').status_code == 400
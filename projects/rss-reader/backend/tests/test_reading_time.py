@@ -0,0 +1,95 @@
+import requests
+import feedparser
+from unittest.mock import patch
+from app import db, Feed, Article, store_feed_articles, prefetch_article_content, prefetch_queue
+from reading_time import count_words, format_reading_time
+from extraction import extract_main_text
+from tests.test_refresh import SAMPLE_RSS
+
+ARTICLE_HTML = '<html><body><nav>menu items</nav><article>' + 'word ' * 1000 + '</article></body></html>'
+
+def add_article(**kwargs):
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    article = Article(feed_id=feed.id, title='Test Article', link='https://example.com/article1', **kwargs)
+    db.session.add(article)
+    db.session.commit()
+    return article
+
+class TestReadingTimeHelpers:
+    """Test cases for word counting and formatting."""
+
+    def test_count_words_in_main_content(self):
+        """Test that navigation is ignored and the article body is counted."""
+        assert count_words(extract_main_text(ARTICLE_HTML)) == 1000
+
+    def test_format_reading_time(self):
+        """Test minute and hour formatting."""
+        assert format_reading_time(5) == '5 min read'
+        assert format_reading_time(90) == '1h 30m read'
+        assert format_reading_time(3, estimated=True) == '3 min read (estimated)'
+
+class TestReadingTimeAPI:
+    """Test cases for stored and batched reading times."""
+
+    @patch('app.fetch_article_text', return_value='word ' * 1000)
+    def test_page_is_fetched_once(self, mock_fetch, client):
+        """Test that the single-article endpoint stores its result."""
+        article = add_article()
+
+        first = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+        second = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+
+        assert first['reading_time'] == second['reading_time'] == '5 min read'
+        assert mock_fetch.call_count == 1
+
+    @patch('app.fetch_article_text', side_effect=requests.ConnectionError('blocked'))
+    def test_unreachable_page_falls_back_to_estimate(self, mock_fetch, client):
+        """Test the description based estimate when the site blocks us."""
+        article = add_article(description=' '.join(['word'] * 300))
+
+        data = client.get(f'/api/articles/{article.id}/reading-time').get_json()
+
+        assert data['reading_time'] == '3 min read (estimated)'
+        assert 'note' in data
+
+    @patch('app.fetch_article_text', return_value='word ' * 1000)
+    def test_batch_endpoint_never_fetches(self, mock_fetch, client):
+        """Test that the batch endpoint answers from stored data and queues the rest."""
+        article = add_article(description='short description')
+        computed = Article(feed_id=article.feed_id, title='Done', link='https://example.com/done',
+                           word_count=400, reading_time_minutes=2)
+        db.session.add(computed)
+        db.session.commit()
+
+        response = client.get(f'/api/articles/reading-times?ids={article.id},{computed.id},999')
+        data = response.get_json()['reading_times']
+
+        assert data[str(computed.id)]['reading_time'] == '2 min read'
+        assert data[str(article.id)]['pending'] is True
+        assert '999' not in data
+        mock_fetch.assert_not_called()
+        assert article.id in prefetch_queue.pop_batch(100)
+
+    def test_batch_endpoint_rejects_bad_ids(self, client):
+        """Test input validation of the batch endpoint."""
+        assert client.get('/api/articles/reading-times?ids=1,abc').status_code == 400
+
+class TestBackgroundReadingTimes:
+    """Test cases for the post-ingestion reading time pass."""
+
+    @patch('app.fetch_article_text', return_value='word ' * 600)
+    def test_ingested_articles_get_reading_times(self, mock_fetch, app_context):
+        """Test that new articles are queued at ingestion and computed in the background."""
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+        store_feed_articles(feed, feedparser.parse(SAMPLE_RSS))
+
+        prefetch_article_content()
+
+        articles = Article.query.filter_by(feed_id=feed.id).all()
+        assert [a.reading_time_minutes for a in articles] == [3, 3]
+        assert mock_fetch.call_count == 2
+        assert len(prefetch_queue) == 0
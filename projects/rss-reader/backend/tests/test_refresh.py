@@ -0,0 +1,103 @@
+import time
+import threading
+import feedparser
+from unittest.mock import patch
+from app import db, Feed, Article, refresh_all_feeds
+from refresh_engine import RefreshEngine, FeedJob
+from feed_fetcher import FeedDownload, PARSED
+
+SAMPLE_RSS = """<?xml version="1.0"?>
+<rss version="2.0">
+  <channel>
+    <title>Sample Feed</title>
+    <link>https://example.com</link>
+    <item>
+      <title>First Post</title>
+      <link>https://example.com/first</link>
+      <description>First description</description>
+      <pubDate>Mon, 02 Oct 2023 10:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Second Post</title>
+      <link>https://example.com/second</link>
+      <description>Second description</description>
+      <pubDate>Tue, 03 Oct 2023 10:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>"""
+
+class TestRefreshEngine:
+    """Test cases for the concurrent refresh engine."""
+
+    def test_fetches_run_concurrently(self):
+        """Test that slow fetches overlap instead of running back to back."""
+        jobs = [FeedJob(i, f'Feed {i}', f'https://example.com/{i}.xml') for i in range(8)]
+
+        def slow_fetch(job):
+            time.sleep(0.2)
+            return job.feed_id
+
+        engine = RefreshEngine(slow_fetch, lambda job, result: 1, max_workers=8)
+        report = engine.run(jobs)
+
+        assert report.feeds_processed == 8
+        assert report.new_articles == 8
+        assert report.wall_seconds < 0.2 * 8 / 2
+        assert report.speedup > 2
+
+    def test_writer_runs_on_calling_thread(self):
+        """Test that all writes happen on the thread that owns the session."""
+        writer_threads = set()
+
+        def write(job, result):
+            writer_threads.add(threading.get_ident())
+            return 0
+
+        jobs = [FeedJob(i, f'Feed {i}', '') for i in range(5)]
+        RefreshEngine(lambda job: None, write, max_workers=3).run(jobs)
+
+        assert writer_threads == {threading.get_ident()}
+
+    def test_fetch_errors_are_reported_per_feed(self):
+        """Test that one failing feed does not stop the cycle."""
+        def fetch(job):
+            if job.feed_id == 2:
+                raise IOError('connection reset')
+            return job.feed_id
+
+        jobs = [FeedJob(i, f'Feed {i}', '') for i in range(1, 4)]
+        report = RefreshEngine(fetch, lambda job, result: 2, max_workers=2).run(jobs)
+
+        assert report.feeds_processed == 2
+        assert report.feeds_failed == 1
+        failed = [t for t in report.timings if t.error]
+        assert failed[0].feed_id == 2
+        assert 'connection reset' in failed[0].error
+
+class TestRefreshAllFeeds:
+    """Test cases for the scheduled refresh of all feeds."""
+
+    @patch('app.download_feed')
+    def test_refresh_stores_articles_and_reports(self, mock_download, client):
+        """Test a full refresh cycle through the engine and the stats endpoint."""
+        mock_download.side_effect = lambda job: FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS), etag='"v1"')
+
+        feed = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        inactive = Feed(name='Old Feed', url='https://example.com/old.xml', is_active=False)
+        db.session.add_all([feed, inactive])
+        db.session.commit()
+
+        report = refresh_all_feeds()
+
+        assert report.feeds_processed == 1
+        assert report.new_articles == 2
+        assert Article.query.filter_by(feed_id=feed.id).count() == 2
+        db.session.refresh(feed)
+        assert feed.etag == '"v1"'
+
+        response = client.get('/api/refresh-stats')
+        assert response.status_code == 200
+        assert 'hosts' in response.get_json()
+        data = response.get_json()['last_refresh']
+        assert data['new_articles'] == 2
+        assert data['feeds'][0]['name'] == 'Sample Feed'
@@ -0,0 +1,118 @@
+import feedparser
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app import db, Feed, RefreshJob, run_refresh_job
+from feed_fetcher import FeedDownload, PARSED
+from tests.test_refresh import SAMPLE_RSS
+
+class TestRefreshJobs:
+    """Test cases for asynchronous manual refresh jobs."""
+
+    @patch('app.start_refresh_job_thread')
+    def test_enqueue_returns_job_immediately(self, mock_start, client):
+        """Test that a refresh request returns a job id without refreshing inline."""
+        response = client.post('/api/refresh-feeds')
+
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data['status'] == 'queued'
+        assert data['merged'] is False
+        mock_start.assert_called_once_with(data['job_id'])
+
+    @patch('app.start_refresh_job_thread')
+    def test_concurrent_requests_merge(self, mock_start, client):
+        """Test that a second request joins the job that is already active."""
+        first = client.post('/api/refresh-feeds').get_json()
+        second = client.post('/api/refresh-feeds').get_json()
+
+        assert second['job_id'] == first['job_id']
+        assert second['merged'] is True
+        assert mock_start.call_count == 1
+
+    @patch('app.start_refresh_job_thread')
+    def test_stale_job_does_not_block_new_refreshes(self, mock_start, client):
+        """Test that a job abandoned by a dead worker is replaced."""
+        first = client.post('/api/refresh-feeds').get_json()
+        stale = RefreshJob.query.get(first['job_id'])
+        stale.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        second = client.post('/api/refresh-feeds').get_json()
+
+        assert second['job_id'] != first['job_id']
+        assert client.get(f"/api/refresh-feeds/{first['job_id']}").get_json()['status'] == 'failed'
+
+    @patch('app.download_feed')
+    @patch('app.start_refresh_job_thread')
+    def test_job_reports_progress(self, mock_start, mock_download, client):
+        """Test that a finished job reports feeds done, failed and new articles."""
+        def download(job):
+            if job.name == 'Broken':
+                raise IOError('timed out')
+            return FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS))
+        mock_download.side_effect = download
+
+        db.session.add_all([
+            Feed(name='Working', url='https://example.com/rss.xml'),
+            Feed(name='Broken', url='https://example.com/broken.xml')
+        ])
+        db.session.commit()
+
+        job_id = client.post('/api/refresh-feeds').get_json()['job_id']
+        run_refresh_job(job_id)
+
+        data = client.get(f'/api/refresh-feeds/{job_id}').get_json()
+        assert data['status'] == 'completed'
+        assert data['feeds_total'] == 2
+        assert data['feeds_done'] == 2
+        assert data['feeds_failed'] == 1
+        assert data['new_articles'] == 2
+
+        # The finished job no longer absorbs new requests
+        assert client.post('/api/refresh-feeds').get_json()['job_id'] != job_id
+
+    @patch('app.start_refresh_job_thread')
+    def test_polling_a_job_whose_worker_died(self, mock_start, client):
+        """Test that a running job without heartbeats is reported failed when polled, not running forever."""
+        job_id = client.post('/api/refresh-feeds').get_json()['job_id']
+        job = RefreshJob.query.get(job_id)
+        job.status = 'running'
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        data = client.get(f'/api/refresh-feeds/{job_id}').get_json()
+
+        assert data['status'] == 'failed'
+        assert data['error'] == 'Worker stopped responding'
+        assert data['finished_at'] is not None
+        # Its slot is free for the next refresh
+        assert client.post('/api/refresh-feeds').get_json()['merged'] is False
+
+    @patch('app.start_refresh_job_thread')
+    def test_polling_a_live_job_leaves_it_running(self, mock_start, client):
+        """Test that a job with a recent heartbeat is not expired."""
+        job_id = client.post('/api/refresh-feeds').get_json()['job_id']
+
+        assert client.get(f'/api/refresh-feeds/{job_id}').get_json()['status'] == 'queued'
+        assert client.post('/api/refresh-feeds').get_json()['job_id'] == job_id
+
+    @patch('app.download_feed')
+    @patch('app.start_refresh_job_thread')
+    def test_total_counts_only_feeds_this_job_claimed(self, mock_start, mock_download, client):
+        """Test that feeds leased by another worker are not counted as part of the job."""
+        mock_download.return_value = FeedDownload(PARSED, feedparser.parse(SAMPLE_RSS))
+        leased = Feed(name='Leased', url='https://example.com/leased.xml', lease_owner='other:1',
+                      lease_expires_at=datetime.utcnow() + timedelta(minutes=5))
+        db.session.add_all([Feed(name='Free', url='https://example.com/rss.xml'), leased])
+        db.session.commit()
+
+        job_id = client.post('/api/refresh-feeds').get_json()['job_id']
+        run_refresh_job(job_id)
+
+        data = client.get(f'/api/refresh-feeds/{job_id}').get_json()
+        assert data['status'] == 'completed'
+        assert (data['feeds_total'], data['feeds_done']) == (1, 1)
+
+    def test_unknown_job(self, client):
+        """Test polling a job that does not exist."""
+        assert client.get('/api/refresh-feeds/missing').status_code == 404
@@ -0,0 +1,143 @@
+from unittest.mock import patch
+from sqlalchemy import event, text
+from app import app, db, Feed, Article, data_versions, refresh_all_feeds
+from response_cache import ResponseCache, statement_changes_data, bump_data_version, make_etag
+from tests.test_feed_fetcher import make_response
+
+def add_feed():
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml', category='Technology')
+    db.session.add(feed)
+    db.session.commit()
+    db.session.add_all([Article(feed_id=feed.id, title=f'Article {i}', link=f'/a/{i}') for i in range(3)])
+    db.session.commit()
+    return feed
+
+def statements_during(call):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        result = call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return result, statements
+
+class TestResponseCacheUnits:
+    """Test cases for the cache building blocks."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert (cache.get('a'), cache.get('c')) == (1, 3)
+        assert len(cache) == 2
+
+    def test_statement_detection_and_etags(self):
+        """Test which raw statements count as data changes, and that parameter order does not matter."""
+        assert statement_changes_data(text("UPDATE feed_counter SET total = 1"))
+        assert statement_changes_data(text("INSERT OR IGNORE INTO article (id) VALUES (1)"))
+        assert not statement_changes_data(text("UPDATE article_content SET status = 'ok'"))
+        assert not statement_changes_data(text("SELECT * FROM article"))
+
+        assert make_etag(3, '/api/articles', [('a', '1'), ('b', '2')]) == make_etag(3, '/api/articles', [('b', '2'), ('a', '1')])
+        assert make_etag(3, '/api/articles', [('a', '1')]) != make_etag(4, '/api/articles', [('a', '1')])
+
+    def test_feed_bookkeeping_columns_do_not_count(self):
+        """Test that only updates to feed and article columns clients see count as data changes."""
+        assert not statement_changes_data(text("UPDATE feed SET lease_owner = :owner, lease_expires_at = :expires WHERE id = 1"))
+        assert not statement_changes_data(text("UPDATE feed SET next_fetch_at = :now WHERE is_active = :active"))
+        assert not statement_changes_data(db.update(Feed).values(etag='"x"', last_fetched=None, consecutive_failures=0))
+        assert not statement_changes_data(db.update(Feed), [{'id': 1, 'next_fetch_at': None}])
+
+        assert statement_changes_data(text("UPDATE feed SET next_fetch_at = COALESCE(:a, :b), name = :name"))
+        assert statement_changes_data(db.update(Article).values(is_read=True, change_seq=3))
+        assert statement_changes_data(db.update(Article), [{'id': 1, 'word_count': 300}])
+        assert statement_changes_data(text("INSERT INTO feed (name, url) VALUES ('a', 'b')"))
+        assert statement_changes_data(text("DELETE FROM feed WHERE id = 1"))
+
+class TestVersionedResponses:
+    """Test cases for ETag revalidation of the read endpoints."""
+
+    @patch.object(data_versions, 'ttl', 60)
+    def test_not_modified_without_touching_the_database(self, client):
+        """Test that a matching If-None-Match gets a 304 with no queries, and cached bodies need none either."""
+        add_feed()
+        for url in ('/api/feeds', '/api/categories', '/api/stats', '/api/articles?per_page=2'):
+            first = client.get(url)
+            etag = first.headers['ETag']
+            assert first.status_code == 200
+
+            revalidated, statements = statements_during(lambda: client.get(url, headers={'If-None-Match': etag}))
+            assert revalidated.status_code == 304
+            assert revalidated.headers['ETag'] == etag
+            assert statements == []
+
+            cached, statements = statements_during(lambda: client.get(url))
+            assert cached.get_data() == first.get_data()
+            assert statements == []
+
+    @patch.object(data_versions, 'ttl', 60)
+    def test_mutations_change_the_etag(self, client):
+        """Test that ORM writes and bulk statements both invalidate earlier ETags and cached bodies."""
+        add_feed()
+        article_id = Article.query.first().id
+        etag = client.get('/api/stats').headers['ETag']
+
+        client.put(f'/api/articles/{article_id}/read')
+        after_read = client.get('/api/stats', headers={'If-None-Match': etag})
+        assert after_read.status_code == 200
+        assert after_read.get_json()['unread_articles'] == 2
+
+        client.post('/api/articles/bulk', json={'action': 'read', 'all': True})
+        after_bulk = client.get('/api/stats', headers={'If-None-Match': after_read.headers['ETag']})
+        assert after_bulk.status_code == 200
+        assert after_bulk.get_json()['unread_articles'] == 0
+
+    def test_query_parameters_are_part_of_the_etag(self, client):
+        """Test that different queries get different ETags."""
+        add_feed()
+        all_articles = client.get('/api/articles?per_page=2&unread_only=false').headers['ETag']
+        reordered = client.get('/api/articles?unread_only=false&per_page=2').headers['ETag']
+        unread = client.get('/api/articles?per_page=2&unread_only=true')
+
+        assert all_articles == reordered
+        assert unread.headers['ETag'] != all_articles
+        assert client.get('/api/articles', headers={'If-None-Match': all_articles}).status_code == 200
+
+    def test_other_workers_bumps_are_seen_after_the_ttl(self, client):
+        """Test that a version bumped elsewhere is picked up once the cached version expires."""
+        add_feed()
+        etag = client.get('/api/feeds').headers['ETag']
+
+        with db.engine.begin() as conn:
+            bump_data_version(conn)
+
+        with patch.object(data_versions, 'ttl', 60):
+            assert client.get('/api/feeds', headers={'If-None-Match': etag}).status_code == 304
+        with patch.object(data_versions, 'ttl', 0):
+            assert client.get('/api/feeds', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_unchanged_feeds_keep_the_version(self, client):
+        """Test that leasing, polling (a 304) and rescheduling feeds leaves cached responses valid."""
+        feed = add_feed()
+        feed.etag = '"v1"'
+        db.session.commit()
+        etag = client.get('/api/feeds').headers['ETag']
+
+        with patch('feed_fetcher.http_session.get', return_value=make_response(304)):
+            refresh_all_feeds()
+        db.session.refresh(feed)
+        assert feed.next_fetch_at is not None and feed.lease_owner is None
+
+        with patch.object(data_versions, 'ttl', 0):
+            assert client.get('/api/feeds', headers={'If-None-Match': etag}).status_code == 304
+            client.put(f"/api/articles/{Article.query.first().id}/read")
+            assert client.get('/api/feeds', headers={'If-None-Match': etag}).status_code == 200
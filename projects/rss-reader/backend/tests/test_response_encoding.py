@@ -0,0 +1,76 @@
+import gzip
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+import response_encoding
+from app import app, db, Feed, Article
+from response_encoding import IsoJSONProvider, OrjsonProvider, json_provider_class
+
+PAYLOAD = {
+    'articles': [{'id': 2, 'published_date': datetime(2024, 5, 1, 12, 30, 5, 120), 'title': 'Ünïcode “quotes”'}],
+    'feeds': {1: 3},
+    'next_cursor': None,
+}
+
+def add_articles(count=40):
+    feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+    db.session.add(feed)
+    db.session.commit()
+    db.session.add_all([
+        Article(feed_id=feed.id, title=f'Article {i}', link=f'/a/{i}', excerpt='Lorem ipsum dolor sit amet ' * 8,
+                published_date=datetime(2024, 1, 1, i % 24))
+        for i in range(count)
+    ])
+    db.session.commit()
+
+class TestJSONProviders:
+    """Test cases for the pluggable JSON encoders."""
+
+    def test_stdlib_provider_writes_iso_datetimes(self):
+        """Test that datetimes come out as ISO 8601, not HTTP dates."""
+        data = json.loads(IsoJSONProvider(app).dumps(PAYLOAD))
+        assert data['articles'][0]['published_date'] == '2024-05-01T12:30:05.000120'
+
+    def test_orjson_matches_stdlib(self):
+        """Test that switching encoders does not change what clients receive."""
+        pytest.importorskip('orjson')
+        assert json.loads(OrjsonProvider(app).dumps(PAYLOAD)) == json.loads(IsoJSONProvider(app).dumps(PAYLOAD))
+        assert json_provider_class('auto') is OrjsonProvider
+        assert json_provider_class('stdlib') is IsoJSONProvider
+
+class TestCompression:
+    """Test cases for negotiated response compression."""
+
+    def test_large_responses_are_gzipped(self, client):
+        """Test that a list page is compressed when the client accepts gzip."""
+        add_articles()
+        plain = client.get('/api/articles?per_page=40')
+        compressed = client.get('/api/articles?per_page=40', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert 'Content-Encoding' not in plain.headers
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert len(compressed.get_data()) < len(plain.get_data()) / 3
+        assert json.loads(gzip.decompress(compressed.get_data())) == plain.get_json()
+        assert plain.get_json()['articles'][0]['published_date'].startswith('2024-01-01T')
+
+    def test_small_and_not_modified_responses_are_left_alone(self, client):
+        """Test the size threshold and that 304s carry no encoding."""
+        add_articles(2)
+        health = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in health.headers
+
+        etag = client.get('/api/stats').headers['ETag']
+        not_modified = client.get('/api/stats', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert not_modified.status_code == 304
+        assert 'Content-Encoding' not in not_modified.headers
+
+    def test_brotli_only_when_installed(self, client):
+        """Test that br is only chosen when the brotli package is available."""
+        add_articles()
+        with patch.object(response_encoding, 'brotli', None):
+            response = client.get('/api/articles?per_page=40', headers={'Accept-Encoding': 'br, gzip'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            response = client.get('/api/articles?per_page=40', headers={'Accept-Encoding': 'br'})
+            assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,91 @@
+import feedparser
+from app import db, Feed, Article, store_feed_articles
+from migrations import run_migrations
+
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0">
+  <channel>
+    <title>Search Feed</title>
+    {items}
+  </channel>
+</rss>"""
+
+ITEM = "<item><title>{title}</title><link>https://example.com/{slug}</link><description>{description}</description></item>"
+
+def add_feed(name, category, items):
+    feed = Feed(name=name, url=f'https://example.com/{name}.xml', category=category)
+    db.session.add(feed)
+    db.session.commit()
+    xml = FEED_XML.format(items=''.join(
+        ITEM.format(title=title, slug=f'{name}-{i}', description=description) for i, (title, description) in enumerate(items)
+    ))
+    store_feed_articles(feed, feedparser.parse(xml))
+    return feed
+
+def search(client, query, **params):
+    params = ''.join(f'&{name}={value}' for name, value in params.items())
+    response = client.get(f'/api/articles/search?q={query}{params}')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+class TestArticleSearch:
+    """Test cases for full-text article search."""
+
+    def test_ranked_matches_from_ingested_articles(self, client):
+        """Test that ingestion feeds the index and title matches rank first."""
+        run_migrations(db.engine)
+        add_feed('tech', 'Technology', [
+            ('Weekly roundup', 'A short note about the new Python release'),
+            ('Python 3.13 released', 'The Python release brings a faster interpreter'),
+            ('Rust news', 'Nothing about snakes here'),
+        ])
+
+        titles = [a['title'] for a in search(client, 'python release')['articles']]
+        assert titles == ['Python 3.13 released', 'Weekly roundup']
+        # Stemming: "releases" finds "release" and "released"
+        assert len(search(client, 'releases')['articles']) == 2
+
+    def test_filters_and_cursor_pagination(self, client):
+        """Test the list filters, and walking every match by cursor without duplicates."""
+        run_migrations(db.engine)
+        tech = add_feed('tech', 'Technology', [(f'Database tip {i}', 'Indexes matter') for i in range(7)])
+        add_feed('news', 'News', [('Database outage', 'A database went down')])
+        Article.query.filter_by(title='Database tip 0').one().is_read = True
+        db.session.commit()
+
+        assert len(search(client, 'database', feed_id=tech.id, per_page=20)['articles']) == 7
+        assert [a['title'] for a in search(client, 'database', category='News')['articles']] == ['Database outage']
+        assert len(search(client, 'database', unread_only='true', per_page=20)['articles']) == 7
+
+        ids, cursor = [], None
+        while True:
+            page = search(client, 'database', per_page=3, **({'cursor': cursor} if cursor else {}))
+            ids += [a['id'] for a in page['articles']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert len(ids) == len(set(ids)) == 8
+
+    def test_index_follows_updates_and_deletes(self, client):
+        """Test that edits and deletions reach the index."""
+        run_migrations(db.engine)
+        add_feed('tech', 'Technology', [('Kernel update', 'Linux news')])
+        article = Article.query.one()
+
+        article.title = 'Compiler update'
+        db.session.commit()
+        assert search(client, 'kernel')['articles'] == []
+        assert len(search(client, 'compiler')['articles']) == 1
+
+        db.session.delete(article)
+        db.session.commit()
+        assert search(client, 'compiler')['articles'] == []
+
+    def test_query_syntax_is_not_interpreted(self, client):
+        """Test that operators and quotes in user input are matched literally, and q is required."""
+        run_migrations(db.engine)
+        add_feed('tech', 'Technology', [('C++ "tips" AND tricks', 'NEAR(the) OR nothing')])
+
+        assert len(search(client, 'tips" AND (tricks')['articles']) == 1
+        assert client.get('/api/articles/search').status_code == 400
+        assert client.get('/api/articles/search?q=x&cursor=bogus').status_code == 400
@@ -0,0 +1,193 @@
+import json
+from datetime import datetime
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from app import app, db, Feed, Article, ArticleContent, ArticleSummary, SummaryClaim, presummarize_articles
+from config import Config
+from content_store import compress_text, OK
+from summaries import SingleFlight, RateLimiter
+
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the chat completion API"""
+    calls = []
+    delay = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        StubCompletionHandler.calls.append(body)
+        time.sleep(StubCompletionHandler.delay)
+        payload = json.dumps({
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': f"Summary #{len(StubCompletionHandler.calls)}"},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def completion_api():
+    """Serve the stub completion API locally and point the app at it"""
+    StubCompletionHandler.calls = []
+    StubCompletionHandler.delay = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubCompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f'http://127.0.0.1:{server.server_address[1]}/v1'
+    with patch.object(Config, 'OPENAI_API_BASE', api_base), \
+            patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        yield StubCompletionHandler
+    server.shutdown()
+
+def add_article(text='word ' * 300, link='https://example.com/article1', **kwargs):
+    feed = Feed.query.first()
+    if feed is None:
+        feed = Feed(name='Test Feed', url='https://example.com/rss.xml')
+        db.session.add(feed)
+        db.session.commit()
+    article = Article(feed_id=feed.id, title='Test Article', link=link, **kwargs)
+    db.session.add(article)
+    db.session.commit()
+    compressed = compress_text(text)
+    db.session.add(ArticleContent(article_id=article.id, status=OK, text_compressed=compressed,
+                                  size_bytes=len(compressed)))
+    db.session.commit()
+    return article
+
+class TestSummaryHelpers:
+    """Test cases for single-flight calls and rate limiting."""
+
+    def test_single_flight_shares_one_call(self):
+        """Test that concurrent callers for one key get the leader's result."""
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'result'
+
+        flights = SingleFlight()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flights.do('key', slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['result'] * 5
+        assert len(calls) == 1
+
+    def test_rate_limiter_spaces_calls(self):
+        """Test that calls are spaced by 60 / per_minute seconds."""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(per_minute=30, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.wait()
+
+        assert sleeps == [2.0, 2.0]
+
+class TestSummaryCache:
+    """Test cases for stored summaries against a local completion API stub."""
+
+    def test_summary_is_generated_once(self, completion_api, client):
+        """Test that a second request is served from the database."""
+        article = add_article()
+
+        first = client.post(f'/api/articles/{article.id}/summarize').get_json()
+        second = client.post(f'/api/articles/{article.id}/summarize').get_json()
+
+        assert first['summary'] == second['summary'] == 'Summary #1'
+        assert (first['cached'], second['cached']) == (False, True)
+        assert len(completion_api.calls) == 1
+        assert completion_api.calls[0]['model'] == Config.OPENAI_SUMMARY_MODEL
+
+    def test_concurrent_requests_share_one_call(self, completion_api, client):
+        """Test that simultaneous clicks produce a single paid call."""
+        completion_api.delay = 0.3
+        url = f'/api/articles/{add_article().id}/summarize'
+        results = []
+
+        def summarize():
+            results.append(app.test_client().post(url).get_json())
+
+        threads = [threading.Thread(target=summarize) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [r['summary'] for r in results] == ['Summary #1'] * 4
+        assert len(completion_api.calls) == 1
+        assert ArticleSummary.query.count() == 1
+
+    def test_changed_model_generates_new_summary(self, completion_api, client):
+        """Test that summaries are keyed by model as well as content."""
+        article = add_article()
+        client.post(f'/api/articles/{article.id}/summarize')
+
+        with patch.object(Config, 'OPENAI_SUMMARY_MODEL', 'gpt-4o-mini'):
+            data = client.post(f'/api/articles/{article.id}/summarize').get_json()
+
+        assert data['cached'] is False
+        assert len(completion_api.calls) == 2
+
+class TestBackgroundSummaries:
+    """Test cases for the background pre-summarizer."""
+
+    def test_bookmarked_articles_are_summarized(self, completion_api, app_context):
+        """Test that only articles in scope are summarized ahead of time."""
+        bookmarked = add_article(is_bookmarked=True)
+        add_article(text='other ' * 300, link='https://example.com/article2')
+
+        with patch.object(Config, 'SUMMARY_PREFETCH', 'bookmarked'):
+            presummarize_articles()
+            presummarize_articles()
+
+        summaries = ArticleSummary.query.all()
+        assert [s.article_id for s in summaries] == [bookmarked.id]
+        assert len(completion_api.calls) == 1
+
+    def test_articles_claimed_by_another_worker_are_skipped(self, completion_api, app_context):
+        """Test that a live claim from another worker stops a duplicate paid call until it expires."""
+        article = add_article(is_bookmarked=True)
+        db.session.add(SummaryClaim(article_id=article.id, model=Config.OPENAI_SUMMARY_MODEL,
+                                    claimed_by='other-host:1', claimed_at=datetime.utcnow()))
+        db.session.commit()
+
+        with patch.object(Config, 'SUMMARY_PREFETCH', 'bookmarked'):
+            presummarize_articles()
+            assert completion_api.calls == []
+
+            with patch.object(Config, 'SUMMARY_CLAIM_SECONDS', -1):
+                presummarize_articles()
+
+        assert len(completion_api.calls) == 1
+        assert SummaryClaim.query.count() == 0
+
+    def test_disabled_by_default(self, completion_api, app_context):
+        """Test that no paid calls are made unless enabled."""
+        add_article(is_bookmarked=True)
+
+        presummarize_articles()
+
+        assert completion_api.calls == []
@@ -0,0 +1,125 @@
+import feedparser
+from datetime import datetime, timedelta
+from app import db, Feed, Article, ArticleTombstone, store_feed_articles
+from sync import batch_end, next_change_seq, record_deleted_articles, prune_tombstones
+from tests.test_refresh import SAMPLE_RSS
+
+def add_feed(name='tech', count=3):
+    feed = Feed(name=name, url=f'https://example.com/{name}.xml', category='Technology')
+    db.session.add(feed)
+    db.session.commit()
+    db.session.add_all([Article(feed_id=feed.id, title=f'{name} {i}', link=f'/{name}/{i}') for i in range(count)])
+    db.session.commit()
+    return feed
+
+def sync(client, since, **params):
+    response = client.get('/api/sync', query_string=dict(params, since=since))
+    assert response.status_code == 200
+    return response.get_json()
+
+def sync_all(client, since, **params):
+    """Follow has_more to the end; returns the batches"""
+    batches = [sync(client, since, **params)]
+    while batches[-1]['has_more']:
+        batches.append(sync(client, batches[-1]['seq'], **params))
+    return batches
+
+class TestSync:
+    """Test cases for /api/sync."""
+
+    def test_first_sync_then_nothing(self, client):
+        """Test that since=0 returns everything and the returned seq returns nothing new."""
+        feed = add_feed()
+        first = sync(client, 0)
+
+        assert [f['name'] for f in first['feeds']] == ['tech']
+        assert sorted(a['title'] for a in first['articles']) == ['tech 0', 'tech 1', 'tech 2']
+        assert first['articles'][0]['feed_id'] == feed.id
+        assert 'description' not in first['articles'][0]
+        assert (first['has_more'], first['reset'], first['deleted_articles']) == (False, False, [])
+
+        again = sync(client, first['seq'])
+        assert (again['seq'], again['feeds'], again['articles']) == (first['seq'], [], [])
+
+    def test_flips_new_articles_and_deactivated_feeds(self, client):
+        """Test that read/bookmark flips, ingestion and delete_feed each show up once."""
+        feed = add_feed()
+        seq = sync(client, 0)['seq']
+        article_id = Article.query.first().id
+
+        client.put(f'/api/articles/{article_id}/read')
+        client.put(f'/api/articles/{article_id}/bookmark')
+        changes = sync(client, seq)
+        assert [(a['id'], a['is_read'], a['is_bookmarked']) for a in changes['articles']] == [(article_id, True, True)]
+        assert changes['feeds'] == []
+        seq = changes['seq']
+
+        other = Feed(name='Sample Feed', url='https://example.com/rss.xml')
+        db.session.add(other)
+        db.session.commit()
+        store_feed_articles(other, feedparser.parse(SAMPLE_RSS))
+        client.delete(f'/api/feeds/{feed.id}')
+        changes = sync(client, seq)
+        assert sorted(a['title'] for a in changes['articles']) == ['First Post', 'Second Post']
+        assert {f['name']: f['is_active'] for f in changes['feeds']} == {'Sample Feed': True, 'tech': False}
+
+    def test_bookkeeping_writes_take_no_sequence_number(self, client):
+        """Test that fetch scheduling and reading times are not reported as changes."""
+        feed = add_feed()
+        seq = sync(client, 0)['seq']
+
+        feed.next_fetch_at = datetime.utcnow() + timedelta(hours=1)
+        Article.query.first().reading_time_minutes = 4
+        db.session.commit()
+
+        changes = sync(client, seq)
+        assert (changes['seq'], changes['feeds'], changes['articles']) == (seq, [], [])
+
+    def test_batches_end_on_whole_transactions(self, client):
+        """Test that batches follow has_more and a bulk update is never split."""
+        feed = add_feed(count=5)
+        seq = sync(client, 0)['seq']
+        ids = [a.id for a in Article.query.order_by(Article.id)]
+
+        client.put(f'/api/articles/{ids[0]}/read')
+        client.post('/api/articles/bulk', json={'action': 'bookmark', 'ids': ids[1:4]})
+        client.put(f'/api/articles/{ids[4]}/read')
+
+        batches = sync_all(client, seq, limit=2)
+        assert [[a['id'] for a in batch['articles']] for batch in batches] == [[ids[0]], ids[1:4], [ids[4]]]
+        assert batches[-1]['has_more'] is False
+
+    def test_deleted_articles_and_reset(self, client):
+        """Test tombstones for ORM and cleanup deletes, and a reset once they are pruned."""
+        add_feed(count=4)
+        seq = sync(client, 0)['seq']
+        articles = Article.query.order_by(Article.id).all()
+        ids = [a.id for a in articles]
+
+        db.session.delete(articles[0])
+        db.session.commit()
+        record_deleted_articles(db.session, 'id = :id', {'id': ids[1]}, next_change_seq(db.session))
+        db.session.execute(db.text("DELETE FROM article WHERE id = :id"), {'id': ids[1]})
+        db.session.commit()
+
+        changes = sync(client, seq)
+        assert changes['deleted_articles'] == ids[:2]
+        assert changes['articles'] == []
+
+        ArticleTombstone.query.update({'deleted_at': datetime.utcnow() - timedelta(days=40)})
+        assert prune_tombstones(db.session, keep_days=30) == 2
+        db.session.commit()
+
+        stale = sync(client, seq)
+        assert stale['reset'] is True
+        assert sorted(a['id'] for a in stale['articles']) == ids[2:]
+        assert sync(client, changes['seq'])['reset'] is False
+
+class TestBatchEnd:
+    """Test cases for where a sync batch stops."""
+
+    def test_batch_end(self):
+        assert batch_end([5, 6], 3, 9) == (9, 2)
+        assert batch_end([5, 6, 6, 7], 3, 9) == (6, 3)
+        assert batch_end([5, 6, 6, 6], 3, 9) == (5, 1)
+        assert batch_end([5, 5, 5, 5], 3, 9) == (5, None)
@@ -1,13 +1,16 @@
 import os
 import gc
 from app import app, db
+from migrations import run_migrations
 
 # Memory optimization settings
 gc.set_threshold(700, 10, 10)  # More aggressive garbage collection
 
-# Initialize database tables on startup (only creates if they don't exist)
+# Initialize database tables on startup (only creates if they don't exist),
+# then bring existing tables up to date with the versioned migrations
 with app.app_context():
     db.create_all()
+    run_migrations(db.engine)
     print("✅ Database tables initialized")
 
 # Set environment variables for production
@@ -0,0 +1,23 @@
+/**
+ * Polling for background jobs (refreshes, OPML imports)
+ */
+
+import api from '../config/axios'
+
+const POLL_INTERVAL_MS = 2000
+// Past this the job may still finish on the server, but we stop waiting for it
+const MAX_WAIT_MS = 10 * 60 * 1000
+
+// Poll a job status URL until the job completes or fails, or give up after maxWaitMs
+export async function waitForJob(statusUrl, { interval = POLL_INTERVAL_MS, maxWaitMs = MAX_WAIT_MS } = {}) {
+  const deadline = Date.now() + maxWaitMs
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, interval))
+    const response = await api.get(statusUrl)
+    const job = response.data
+    if (job.status === 'completed' || job.status === 'failed') {
+      return job
+    }
+  }
+  throw new Error(`Gave up waiting for ${statusUrl} after ${Math.round(maxWaitMs / 1000)}s`)
+}